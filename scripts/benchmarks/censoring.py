@@ -0,0 +1,50 @@
+"""
+Compare per-record coercion of analysis results with the vectorized
+`parse_results` pass, on one page of analyses.
+
+Run with `python -m scripts.benchmarks.censoring`.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from hubeau_py.censoring import parse_results
+from hubeau_py.jsonlib import get_backend
+from scripts.benchmarks.json_backends import best_of
+from scripts.benchmarks.payloads import load_page
+
+
+def _per_record(records: List[Dict[str, Any]]) -> List[Tuple[Optional[float], bool]]:
+    parsed = []
+    for record in records:
+        try:
+            value: Optional[float] = float(record.get("resultat"))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            value = None
+        parsed.append((value, record.get("code_remarque") in ("2", "7", "10")))
+    return parsed
+
+
+def main() -> None:
+    records = get_backend("json").loads(load_page("analyse_pc"))["data"]
+    columns = {
+        name: np.array([record.get(name) for record in records], dtype=object)
+        for name in ("resultat", "code_remarque")
+    }
+    rows = [
+        ("float() per record", best_of(lambda: _per_record(records))),
+        (
+            "parse_results column",
+            best_of(
+                lambda: parse_results(columns["resultat"], columns["code_remarque"])
+            ),
+        ),
+    ]
+    print(f"{'path':<24}{'ms':>10}{'us/record':>12}")
+    for path, ms in rows:
+        print(f"{path:<24}{ms:>10.2f}{ms * 1000 / len(records):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
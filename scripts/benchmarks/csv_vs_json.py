@@ -0,0 +1,56 @@
+"""
+Compare the JSON and CSV paths on one Hub'eau page: JSON decoding followed by
+model validation (get_* / iter_*), against JSON decoding into columns
+(get_*_table(format="json")) and CSV parsing into columns (get_*_table).
+
+Run with `python -m scripts.benchmarks.csv_vs_json`.
+"""
+
+import io
+from typing import Dict, Type
+
+from pydantic import BaseModel
+
+from hubeau_py.columnar import read_csv, read_records
+from hubeau_py.jsonlib import get_backend
+from hubeau_py.models.hydrometrie import ObservationTr
+from hubeau_py.models.qualite_rivieres import AnalysePc
+from scripts.benchmarks.json_backends import best_of
+from scripts.benchmarks.payloads import load_page
+
+MODELS: Dict[str, Type[BaseModel]] = {
+    "analyse_pc": AnalysePc,
+    "observations_tr": ObservationTr,
+}
+
+
+def main() -> None:
+    json = get_backend("auto")
+    print(f"{'payload':<16}{'path':<22}{'MB':>6}{'ms':>10}")
+    for endpoint, model in MODELS.items():
+        body = load_page(endpoint)
+        csv_body = load_page(endpoint, "csv")
+
+        def models() -> object:
+            return [model.model_validate(item) for item in json.loads(body)["data"]]
+
+        rows = [
+            (f"{json.name} + models", len(body), best_of(models)),
+            (f"{json.name} only", len(body), best_of(lambda: json.loads(body))),
+            (
+                f"{json.name} columns",
+                len(body),
+                best_of(lambda: read_records(json.loads(body)["data"], model)),
+            ),
+            (
+                "csv columns",
+                len(csv_body),
+                best_of(lambda: read_csv(io.BytesIO(csv_body), model)),
+            ),
+        ]
+        for path, size, ms in rows:
+            print(f"{endpoint:<16}{path:<22}{size / 1e6:>6.1f}{ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Compare ways of parsing the sampling dates of one page of analyses: one
+`strptime` per record, the memoized `parse_datetime` per record, and one
+vectorized `parse_datetimes` call for the whole column.
+
+Run with `python -m scripts.benchmarks.dates`.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from hubeau_py.dates import _parse, parse_datetime, parse_datetimes
+from hubeau_py.jsonlib import get_backend
+from scripts.benchmarks.json_backends import best_of
+from scripts.benchmarks.payloads import load_page
+
+
+def main() -> None:
+    records = get_backend("json").loads(load_page("analyse_pc"))["data"]
+    dates = [r.get("date_prelevement") for r in records]
+    times = [r.get("heure_prelevement") for r in records]
+    column = np.array(dates, dtype=object)
+    time_column = np.array(times, dtype=object)
+
+    def strptime() -> object:
+        return [
+            datetime.strptime(f"{d}T{t}", "%Y-%m-%dT%H:%M:%S") if d and t else None
+            for d, t in zip(dates, times)
+        ]
+
+    def memoized() -> object:
+        _parse.cache_clear()
+        return [parse_datetime(d, t) for d, t in zip(dates, times)]
+
+    rows = [
+        ("strptime per record", best_of(strptime)),
+        ("parse_datetime per record", best_of(memoized)),
+        (
+            "parse_datetimes column",
+            best_of(lambda: parse_datetimes(column, time_column)),
+        ),
+    ]
+    print(f"{'path':<28}{'ms':>10}{'us/record':>12}")
+    for path, ms in rows:
+        print(f"{path:<28}{ms:>10.2f}{ms * 1000 / len(records):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
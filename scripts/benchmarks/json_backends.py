@@ -0,0 +1,63 @@
+"""
+Compare JSON backends on Hub'eau pages: decoding (whole page, and incremental
+for the stdlib) and encoding, as done by the JSON writers of the scripts.
+
+Run with `python -m scripts.benchmarks.json_backends`.
+"""
+
+import time
+from typing import Callable, List
+
+from hubeau_py.jsonlib import FAST_BACKENDS, JsonBackend, get_backend
+from hubeau_py.streaming import EnvelopeDecoder
+from scripts.benchmarks.payloads import load_page
+
+ENDPOINTS = ["analyse_pc", "observations_tr"]
+REPEAT = 5
+CHUNK_SIZE = 64 * 1024
+
+
+def best_of(func: Callable[[], object], repeat: int = REPEAT) -> float:
+    """Best wall-clock time of `repeat` runs, in milliseconds."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def decode_incrementally(body: bytes) -> object:
+    decoder = EnvelopeDecoder()
+    items = []
+    for start in range(0, len(body), CHUNK_SIZE):
+        items += decoder.feed(body[start : start + CHUNK_SIZE])
+    return items + decoder.close()
+
+
+def backends() -> List[JsonBackend]:
+    found = [get_backend("json")]
+    for name in FAST_BACKENDS:
+        try:
+            found.append(get_backend(name))
+        except ValueError:
+            print(f"({name} not installed, skipped)")
+    return found
+
+
+def main() -> None:
+    print(f"{'payload':<16}{'backend':<20}{'decode ms':>10}{'encode ms':>10}")
+    for endpoint in ENDPOINTS:
+        body = load_page(endpoint)
+        records = get_backend("json").loads(body)["data"]
+        for backend in backends():
+            decode = best_of(lambda: backend.loads(body))
+            encode = best_of(lambda: [backend.dumps(r) for r in records])
+            print(f"{endpoint:<16}{backend.name:<20}{decode:>10.1f}{encode:>10.1f}")
+        incremental = best_of(lambda: decode_incrementally(body))
+        print(f"{endpoint:<16}{'json (incremental)':<20}{incremental:>10.1f}")
+        print(f"  {len(records)} records, {len(body) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
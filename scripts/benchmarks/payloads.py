@@ -0,0 +1,165 @@
+"""
+Benchmark payloads: recorded Hub'eau pages when available, synthetic otherwise.
+
+Record real pages once with `python -m scripts.benchmarks.payloads`; later
+benchmark runs pick them up from PAYLOAD_DIR and work offline.
+"""
+
+import csv
+import io
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+PAYLOAD_DIR = Path("data/benchmarks")
+
+SOURCES = {
+    "analyse_pc": (
+        "https://hubeau.eaufrance.fr/api/v2/qualite_rivieres/analyse_pc",
+        {"code_station": "04143000", "size": 5000},
+    ),
+    "observations_tr": (
+        "https://hubeau.eaufrance.fr/api/v2/hydrometrie/observations_tr",
+        {"code_entite": "K437311001", "size": 5000},
+    ),
+}
+
+PARAMETERS = [
+    ("1301", "Température de l'Eau", "27", "°C"),
+    ("1302", "Potentiel en Hydrogène (pH)", "264", "unité pH"),
+    ("1311", "Oxygène dissous", "175", "mg(O2)/L"),
+    ("1340", "Nitrates", "162", "mg(NO3)/L"),
+    ("1433", "Phosphates", "165", "mg(PO4)/L"),
+]
+
+
+def _analyse(rng: random.Random, i: int) -> Dict[str, Any]:
+    code, libelle, unite, symbole = rng.choice(PARAMETERS)
+    censored = rng.random() < 0.2
+    return {
+        "code_station": "04143000",
+        "libelle_station": "LOIRE A ORLEANS",
+        "uri_station": "https://id.eaufrance.fr/StaEsu/04143000",
+        "code_support": "3",
+        "libelle_support": "Eau",
+        "code_fraction": "23",
+        "libelle_fraction": "Eau brute",
+        "date_prelevement": f"{2000 + i % 24}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        "heure_prelevement": f"{8 + i % 10:02d}:30:00",
+        "date_maj_analyse": "2023-06-12",
+        "code_parametre": code,
+        "libelle_parametre": libelle,
+        "uri_parametre": f"https://id.eaufrance.fr/par/{code}",
+        "code_groupe_parametre": ["46", "48"],
+        "libelle_groupe_parametre": ["Physico-chimie", "Paramètres chimiques"],
+        "resultat": 0.5 if censored else round(rng.uniform(0, 40), 3),
+        "code_unite": unite,
+        "symbole_unite": symbole,
+        "code_remarque": "10" if censored else "1",
+        "mnemo_remarque": (
+            "< seuil de quantification" if censored else "Résultat > seuil"
+        ),
+        "code_insitu": "2",
+        "libelle_insitu": "Laboratoire",
+        "limite_detection": 0.1,
+        "limite_quantification": 0.5,
+        "code_methode": "398",
+        "nom_methode": "Méthode inconnue",
+        "code_laboratoire": "19450001900018",
+        "nom_laboratoire": "LABORATOIRE DEPARTEMENTAL",
+        "code_producteur": "18450001900026",
+        "nom_producteur": "AGENCE DE L'EAU LOIRE-BRETAGNE",
+        "code_reseau": ["0400000110"],
+        "nom_reseau": ["RCS Loire-Bretagne"],
+        "longitude": 1.9086,
+        "latitude": 47.8957,
+        "code_operation": f"{i // 20:08d}",
+        "code_prelevement": f"{i // 20:08d}",
+        "geometry": {"type": "Point", "coordinates": [1.9086, 47.8957]},
+    }
+
+
+def _observation(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "code_site": "K4373110",
+        "code_station": "K437311001",
+        "grandeur_hydro": "Q",
+        "date_debut_serie": "2024-05-01T00:00:00Z",
+        "date_fin_serie": "2024-05-31T23:55:00Z",
+        "statut_serie": 4,
+        "code_systeme_alti_serie": 31,
+        "date_obs": f"2024-05-{1 + i // 288 % 28:02d}T"
+        f"{i // 12 % 24:02d}:{i % 12 * 5:02d}:00Z",
+        "resultat_obs": round(rng.uniform(100000, 900000), 1),
+        "code_methode_obs": 12,
+        "libelle_methode_obs": "Interpolation",
+        "code_qualification_obs": 16,
+        "libelle_qualification_obs": "Non qualifiée",
+        "continuite_obs_hydro": True,
+        "longitude": 1.9086,
+        "latitude": 47.8957,
+    }
+
+
+def synthetic_page(endpoint: str, size: int = 5000, seed: int = 0) -> bytes:
+    """A page of `size` records shaped like the given endpoint's."""
+    rng = random.Random(seed)
+    make = _analyse if endpoint == "analyse_pc" else _observation
+    data: List[Dict[str, Any]] = [make(rng, i) for i in range(size)]
+    envelope = {
+        "count": size,
+        "first": None,
+        "prev": None,
+        "next": None,
+        "api_version": "1.0",
+        "data": data,
+    }
+    return json.dumps(envelope, ensure_ascii=False).encode()
+
+
+def synthetic_csv_page(endpoint: str, size: int = 5000, seed: int = 0) -> bytes:
+    """The records of `synthetic_page` in Hub'eau CSV form (no geometry)."""
+    data = json.loads(synthetic_page(endpoint, size, seed))["data"]
+    rows = [
+        {
+            key: ",".join(value) if isinstance(value, list) else value
+            for key, value in item.items()
+            if key != "geometry"
+        }
+        for item in data
+    ]
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]), delimiter=";")
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue().encode()
+
+
+def load_page(endpoint: str, fmt: str = "json") -> bytes:
+    """The recorded `fmt` page for `endpoint` if any, else a synthetic one."""
+    path = PAYLOAD_DIR / f"{endpoint}.{fmt}"
+    if path.exists():
+        return path.read_bytes()
+    if fmt == "csv":
+        return synthetic_csv_page(endpoint)
+    return synthetic_page(endpoint)
+
+
+def record() -> None:
+    PAYLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    for endpoint, (url, params) in SOURCES.items():
+        resp = httpx.get(url, params=params, timeout=120)
+        resp.raise_for_status()
+        (PAYLOAD_DIR / f"{endpoint}.json").write_bytes(resp.content)
+        print(f"Recorded {endpoint}: {len(resp.content) / 1e6:.1f} MB")
+        resp = httpx.get(f"{url}.csv", params=params, timeout=120)
+        resp.raise_for_status()
+        (PAYLOAD_DIR / f"{endpoint}.csv").write_bytes(resp.content)
+        print(f"Recorded {endpoint}.csv: {len(resp.content) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    record()
@@ -0,0 +1,79 @@
+"""
+Compare the memory held by one Hub'eau page once decoded: as models (get_*,
+with and without label interning), as decoded dicts, as columns
+(get_*_table(format="json")), as dictionary-encoded columns and, for
+observations, as station series (get_*_series) or, for analyses, as facts and
+dimensions (get_analyses_normalized).
+
+Run with `python -m scripts.benchmarks.result_memory`.
+"""
+
+import tracemalloc
+from typing import Callable, Dict, Type
+
+from pydantic import BaseModel
+
+from hubeau_py.columnar import read_records
+from hubeau_py.jsonlib import get_backend
+from hubeau_py.models.hydrometrie import ObservationTr
+from hubeau_py.models.qualite_rivieres import AnalysePc
+from hubeau_py.normalize import normalize_analyses
+from hubeau_py.series import OBSERVATIONS_TR_SERIES, SeriesLayout, station_series
+from hubeau_py.validation import Validation
+from scripts.benchmarks.payloads import load_page
+
+MODELS: Dict[str, Type[BaseModel]] = {
+    "analyse_pc": AnalysePc,
+    "observations_tr": ObservationTr,
+}
+SERIES: Dict[str, SeriesLayout] = {"observations_tr": OBSERVATIONS_TR_SERIES}
+
+
+def held(build: Callable[[], object]) -> int:
+    """Bytes still allocated once `build()` returned, while its result lives."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    json = get_backend("json")
+    print(f"{'payload':<16}{'result':<22}{'rows':>8}{'MB':>8}{'B/row':>8}")
+    for endpoint, model in MODELS.items():
+        body = load_page(endpoint)
+        rows = len(json.loads(body)["data"])
+        results = {
+            "models": lambda: list(
+                map(Validation().factory(model), json.loads(body)["data"])
+            ),
+            "models, interned": lambda: list(
+                map(Validation(intern=True).factory(model), json.loads(body)["data"])
+            ),
+            "dicts": lambda: json.loads(body)["data"],
+            "columns": lambda: read_records(json.loads(body)["data"], model),
+            "encoded columns": lambda: read_records(
+                json.loads(body)["data"], model
+            ).dictionary_encode(),
+        }
+        if endpoint == "analyse_pc":
+            results["facts and dimensions"] = lambda: normalize_analyses(
+                read_records(json.loads(body)["data"], model)
+            )
+        layout = SERIES.get(endpoint)
+        if layout is not None:
+            results["station series"] = lambda: station_series(
+                read_records(json.loads(body)["data"], model), layout
+            )
+        for name, build in results.items():
+            size = held(build)
+            print(
+                f"{endpoint:<16}{name:<22}{rows:>8}{size / 1e6:>8.1f}"
+                f"{size / rows:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
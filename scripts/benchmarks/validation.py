@@ -0,0 +1,44 @@
+"""
+Compare the record validation policies (full, trusted, sampled, lazy) on one
+page of each endpoint, building the records then reading 3 fields of each.
+
+Run with `python -m scripts.benchmarks.validation`.
+"""
+
+from operator import attrgetter
+from typing import Dict, Tuple, Type
+
+from pydantic import BaseModel
+
+from hubeau_py.jsonlib import get_backend
+from hubeau_py.models.hydrometrie import ObservationTr
+from hubeau_py.models.qualite_rivieres import AnalysePc
+from hubeau_py.validation import MODES, Validation
+from scripts.benchmarks.json_backends import best_of
+from scripts.benchmarks.payloads import load_page
+
+MODELS: Dict[str, Tuple[Type[BaseModel], Tuple[str, ...]]] = {
+    "analyse_pc": (AnalysePc, ("code_station", "date_prelevement", "resultat")),
+    "observations_tr": (ObservationTr, ("code_station", "date_obs", "resultat_obs")),
+}
+
+
+def main() -> None:
+    header = f"{'payload':<16}{'validation':<12}{'ms':>10}{'us/record':>12}"
+    print(f"{header}{'3 fields ms':>14}")
+    for endpoint, (model, fields) in MODELS.items():
+        records = get_backend("json").loads(load_page(endpoint))["data"]
+        read = attrgetter(*fields)
+        for mode in MODES:
+            make = Validation(mode).factory(model)
+            ms = best_of(lambda: [make(item) for item in records])
+            per_record = ms * 1000 / len(records)
+            read_ms = best_of(lambda: [read(make(item)) for item in records])
+            print(
+                f"{endpoint:<16}{mode:<12}{ms:>10.1f}{per_record:>12.1f}"
+                f"{read_ms:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,85 +1,55 @@
 import logging
+from itertools import islice
 from typing import Iterator, List, Optional
 
-import httpx
-
+from hubeau_py.client import HubeauClient
 from hubeau_py.models.qualite_rivieres import AnalysePc, StationPc
+from hubeau_py.ratelimit import AdaptiveRateLimiter
 
 logger = logging.getLogger(__name__)
 
-ENDPOINTS = {
-    "station_pc": "https://hubeau.eaufrance.fr/api/v2/qualite_rivieres/station_pc",
-    "analyse_pc": "https://hubeau.eaufrance.fr/api/v2/qualite_rivieres/analyse_pc",
-}
 
+def open_client() -> HubeauClient:
+    """Client shared by every helper of a script run.
+
+    Its adaptive limiter makes the request rate follow the API's throttling
+    instead of fixed sleeps, and failed requests are retried with backoff by
+    the client's default retry policy. Responses are decoded with the fastest
+    JSON library installed. Use it in a `with` block so its connections are
+    closed when the script is done:
+
+        with open_client() as client:
+            stations = fetch_stations(client)
+    """
+    return HubeauClient(rate_limiter=AdaptiveRateLimiter(), json_backend="auto")
 
-def fetch_stations(size: int = 10) -> List[StationPc]:
+
+def fetch_stations(client: HubeauClient, size: int = 10) -> List[StationPc]:
     """Fetch a sample of stations."""
-    url = ENDPOINTS["station_pc"]
-    resp = httpx.get(url, params={"size": size}, timeout=60)
-    resp.raise_for_status()
-    data = resp.json().get("data", [])
-    return [StationPc(**station) for station in data]
+    return client.qualite_rivieres.get_stations(size=size)
 
 
 def fetch_analyses(
-    station_code: str, batch_size: int = 1000, debug_limit: Optional[int] = None
+    client: HubeauClient,
+    station_code: str,
+    batch_size: int = 1000,
+    debug_limit: Optional[int] = None,
+    prefetch: int = 0,
 ) -> Iterator[AnalysePc]:
     """Fetch analyses for a station one at a time using an iterator.
 
-    This function yields individual AnalysePc objects instead of accumulating them in memory.
-    Each analysis is yielded as soon as it's fetched and processed.
+    Thin wrapper around `QualiteRivieresAPI.iter_analyses`, which follows the
+    envelope `next` link and keeps a single page in memory. A page that keeps
+    failing raises PaginationError instead of silently truncating the history.
 
     Args:
+        client: The client to fetch with, see open_client
         station_code: The code of the station to fetch analyses for
         batch_size: Number of analyses to fetch per API call
         debug_limit: If set, limits the total number of analyses fetched (for debugging)
+        prefetch: Number of pages to fetch concurrently ahead of consumption
     """
-    url = ENDPOINTS["analyse_pc"]
-    start = 0
-    total_fetched = 0
-
-    while True:
-        if debug_limit is not None and total_fetched >= debug_limit:
-            print(
-                f"Debug limit of {debug_limit} analyses reached for station {station_code}"
-            )
-            break
-
-        print(
-            f"Fetching analyses for station {station_code}, "
-            f"batch {start} to {start + batch_size - 1}..."
-        )
-
-        try:
-            resp = httpx.get(
-                url,
-                params={
-                    "code_station": station_code,
-                    "size": batch_size,
-                    "start": start,
-                },
-                timeout=30,
-            )
-            resp.raise_for_status()
-            data = resp.json().get("data", [])
-
-            if not data:  # No more results
-                break
-
-            # Yield each analysis individually
-            for item in data:
-                if debug_limit is not None and total_fetched >= debug_limit:
-                    break
-                yield AnalysePc(**item)
-                total_fetched += 1
-
-            # Break if we get fewer results than requested
-            if len(data) < batch_size:
-                break
-
-            start += batch_size
-
-        except Exception as e:
-            logger.error(f"Error fetching analyses for station {station_code}: {e}")
-            break
+    analyses = client.qualite_rivieres.iter_analyses(
+        station_code, size=batch_size, prefetch=prefetch
+    )
+    yield from islice(analyses, debug_limit)
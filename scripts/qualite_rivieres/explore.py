@@ -2,7 +2,12 @@ from typing import Any, Dict, List
 
 import httpx
 
-from scripts.qualite_rivieres.api_utils import fetch_analyses, fetch_stations
+from hubeau_py.client import HubeauClient
+from scripts.qualite_rivieres.api_utils import (
+    fetch_analyses,
+    fetch_stations,
+    open_client,
+)
 
 # Define endpoints
 ENDPOINTS = {
@@ -55,8 +60,13 @@ def print_sample_record(summaries: List[Dict[str, Any]], endpoint: str) -> None:
 
 def main() -> None:
     print("Fetching stations...")
+    with open_client() as client:
+        explore_stations(client)
+
+
+def explore_stations(client: HubeauClient) -> None:
     try:
-        stations = fetch_stations(10)
+        stations = fetch_stations(client, 10)
         print(f"Found {len(stations)} stations.")
 
         if not stations:
@@ -71,9 +81,10 @@ def main() -> None:
                 )
                 continue
             try:
-                analyses = list(fetch_analyses(station.code_station))
+                analyses = list(fetch_analyses(client, station.code_station))
                 print(
-                    f"\nStation: {station.libelle_station} (code: {station.code_station})"
+                    f"\nStation: {station.libelle_station}"
+                    f" (code: {station.code_station})"
                 )
                 print(f"Number of analyses: {len(analyses)}")
                 if analyses:
@@ -0,0 +1,757 @@
+import asyncio
+import io
+import math
+import warnings
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+import httpx
+from pydantic import BaseModel
+
+from hubeau_py.columnar import (
+    ResultSet,
+    check_format,
+    read_csv,
+    read_features,
+    read_records,
+)
+from hubeau_py.exceptions import DepthLimitWarning, PaginationError
+from hubeau_py.http import create_async_client, create_client
+from hubeau_py.jsonlib import JsonBackend, get_backend
+from hubeau_py.parallel import async_ordered_map, ordered_map
+from hubeau_py.projection import project
+from hubeau_py.sharding import (
+    DateRange,
+    DateWindows,
+    Window,
+    async_plan_windows,
+    plan_windows,
+)
+from hubeau_py.streaming import ChunkReader, EnvelopeDecoder
+from hubeau_py.validation import Validation, get_validation
+
+M = TypeVar("M", bound=BaseModel)
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Hubeau refuses to serve records beyond this offset (page * size) for a query.
+MAX_RESULT_DEPTH = 20000
+
+
+def _prefetch_pages(first: Dict[str, Any], params: Dict[str, Any]) -> List[int]:
+    """Page numbers still to fetch after `first`, or [] if not page-addressable.
+
+    Cursor-paginated endpoints (no `page` in the `next` link) cannot be fetched
+    out of order and must be walked sequentially.
+    """
+    next_url = first.get("next")
+    data = first.get("data") or []
+    if not next_url or not data or "page" not in httpx.URL(next_url).params:
+        return []
+    size = int(params.get("size") or len(data))
+    last_page = math.ceil(first["count"] / size)
+    if last_page > MAX_RESULT_DEPTH // size:
+        last_page = MAX_RESULT_DEPTH // size
+        warnings.warn(
+            f"{first['count']} records match {next_url}, more than the depth "
+            f"limit: only {last_page * size} are fetched",
+            DepthLimitWarning,
+            stacklevel=2,
+        )
+    return list(range(int(params["page"]) + 1, last_page + 1))
+
+
+def _page_offset(params: Optional[Dict[str, Any]]) -> int:
+    """Number of records before the page requested with `params`."""
+    if not params or "page" not in params or "size" not in params:
+        return 0
+    return (int(params["page"]) - 1) * int(params["size"])
+
+
+def _depth_limit(params: Dict[str, Any]) -> int:
+    """Records of a query with `params` that can be paginated: the depth limit
+    rounded down to a whole number of pages of `size`."""
+    size = int(params.get("size") or 0)
+    return MAX_RESULT_DEPTH // size * size if size else MAX_RESULT_DEPTH
+
+
+def _page_size(params: Optional[Dict[str, Any]], page_length: int) -> int:
+    """The `size` requested with `params`, else the length of the first page."""
+    return int((params or {}).get("size") or page_length)
+
+
+def _depth_reached(
+    next_url: str, fetched: int, size: int, count: Optional[int] = None
+) -> bool:
+    """Whether the page of `size` records at `next_url`, after the first
+    `fetched` ones, is past the depth limit.
+
+    Only page-addressed `next` links are limited; cursors can be followed to
+    the end of the result. `count` is the total reported by the envelope, if
+    any (CSV pages have none).
+    """
+    if fetched + size <= MAX_RESULT_DEPTH:
+        return False
+    if "page" not in httpx.URL(next_url).params:
+        return False
+    matching = "More records" if count is None else f"{count} records"
+    warnings.warn(
+        f"{matching} match {next_url}, more than the depth limit: only "
+        f"{fetched} are fetched",
+        DepthLimitWarning,
+        stacklevel=3,
+    )
+    return True
+
+
+def _check_resume(resume_from: Optional[str]) -> None:
+    if resume_from is not None:
+        raise ValueError("resume_from cannot be combined with date_range")
+
+
+def _page_url(url: str, params: Optional[Dict[str, Any]]) -> str:
+    """Full URL of a page request, as reported by PaginationError."""
+    return str(httpx.URL(url).copy_merge_params(params)) if params else url
+
+
+def _split_resume_url(resume_from: str) -> Tuple[str, Dict[str, Any]]:
+    url = httpx.URL(resume_from)
+    return str(url.copy_with(query=None)), dict(url.params)
+
+
+class BaseAPI:
+    """Common plumbing for the Hubeau sub-APIs.
+
+    All requests go through a single injected httpx.Client so that connections
+    are pooled and reused. When no client is given, a private one is created.
+    Responses are decoded with `json_backend` (see `hubeau_py.jsonlib`).
+    """
+
+    BASE_URL: str
+
+    def __init__(
+        self,
+        client: Optional[httpx.Client] = None,
+        json_backend: Union[str, JsonBackend] = "json",
+        validation: Union[str, Validation] = "full",
+    ) -> None:
+        self._client = client if client is not None else create_client()
+        self._json = get_backend(json_backend)
+        self._validation = get_validation(validation)
+
+    def _factory(
+        self,
+        model: Type[M],
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+    ) -> Callable[[Dict[str, Any]], M]:
+        """Build records of `model`, projected on `fields` if given.
+
+        `validation` overrides the API's validation policy for this call.
+        """
+        policy = self._validation if validation is None else get_validation(validation)
+        return policy.factory(project(model, fields))
+
+    def _get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._get_url(f"{self.BASE_URL}/{path}", params)
+
+    def _get_url(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        resp = self._client.get(url, params=params)
+        resp.raise_for_status()
+        payload: Dict[str, Any] = self._json.loads(resp.content)
+        return payload
+
+    def _get_page(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        try:
+            return self._get_url(url, params)
+        except httpx.HTTPError as exc:
+            raise PaginationError(_page_url(url, params), exc) from exc
+
+    def iter_pages(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        key: str = "data",
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the raw payloads of endpoint `path` (relative to BASE_URL)
+        queried with `params`, following the envelope `next` link.
+
+        This is the page-level iterator the typed methods build on, public for
+        tools such as `hubeau_py.jobs` that checkpoint progress page by page.
+        Only one page is held at a time, whatever the size of the result. With
+        `prefetch > 0`, the page count is derived from the first page's `count`
+        and up to `prefetch` following pages are fetched concurrently, while
+        pages are still yielded in order. `key` is the field holding the records
+        (`features` for GeoJSON pages); iteration stops at an empty page.
+
+        A page that still fails once the transport has given up retrying raises
+        PaginationError; its `resume_from` URL restarts iteration at that page.
+        """
+        url = f"{self.BASE_URL}/{path}"
+        if resume_from is not None:
+            url, params = _split_resume_url(resume_from)
+        if prefetch > 0:
+            params = {"page": 1, **params}
+        payload = self._get_page(url, params)
+        pages = _prefetch_pages(payload, params) if prefetch > 0 else []
+        if pages:
+            yield payload
+            yield from self._iter_prefetched(url, params, pages, prefetch)
+            return
+        fetched = _page_offset(params)
+        size = _page_size(params, len(payload.get(key) or []))
+        while True:
+            yield payload
+            next_url = payload.get("next")
+            fetched += len(payload.get(key) or [])
+            if not next_url or not payload.get(key):
+                return
+            if _depth_reached(next_url, fetched, size, payload.get("count")):
+                return
+            payload = self._get_page(next_url)
+
+    def _iter_prefetched(
+        self, url: str, params: Dict[str, Any], pages: List[int], prefetch: int
+    ) -> Iterator[Dict[str, Any]]:
+        def fetch(page: int) -> Dict[str, Any]:
+            return self._get_page(url, {**params, "page": page})
+
+        return ordered_map(fetch, pages, prefetch)
+
+    def _stream_page(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        decoder: EnvelopeDecoder,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the `data` items of one page as they are decoded off the wire.
+
+        The rest of the envelope (`count`, `next`...) is left in `decoder`. A
+        RateLimitedTransport only holds its slot while chunks are read, so the
+        caller can make requests while consuming the page.
+        """
+        with self._client.stream("GET", url, params=params) as resp:
+            resp.raise_for_status()
+            for chunk in resp.iter_bytes():
+                yield from decoder.feed(chunk)
+            yield from decoder.close()
+
+    def _get_items(self, path: str, params: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield the `data` items of a single page."""
+        if not self._json.incremental:
+            return iter(self._get(path, params).get("data") or [])
+        return self._stream_page(f"{self.BASE_URL}/{path}", params, EnvelopeDecoder())
+
+    def _iter_items(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the `data` items of every page.
+
+        Without prefetch, and with an incremental JSON backend, pages are
+        decoded as they arrive so memory stays proportional to one record. A
+        PaginationError raised part-way through a page resumes at the start of
+        that page, so its first items are yielded again.
+        """
+        if prefetch > 0 or not self._json.incremental:
+            for payload in self.iter_pages(path, params, prefetch, resume_from):
+                yield from payload.get("data", [])
+            return
+        url: str = f"{self.BASE_URL}/{path}"
+        page_params: Optional[Dict[str, Any]] = params
+        if resume_from is not None:
+            url, page_params = _split_resume_url(resume_from)
+        fetched = _page_offset(page_params)
+        size = _page_size(page_params, 0)
+        while True:
+            decoder = EnvelopeDecoder()
+            count = 0
+            try:
+                for item in self._stream_page(url, page_params, decoder):
+                    count += 1
+                    yield item
+            except httpx.HTTPError as exc:
+                raise PaginationError(_page_url(url, page_params), exc) from exc
+            next_url = decoder.envelope.get("next")
+            fetched += count
+            if not next_url or not count:
+                return
+            total = decoder.envelope.get("count")
+            if _depth_reached(next_url, fetched, size or count, total):
+                return
+            url, page_params = next_url, None
+
+    def _count(self, path: str, params: Dict[str, Any]) -> int:
+        return int(self._get(path, {**params, "size": 1}).get("count") or 0)
+
+    def _iter_windowed(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        windows: DateWindows,
+        date_range: DateRange,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield every record in `date_range`, in date order.
+
+        The range is cut into windows small enough to be paginated in full
+        (see `plan_windows`); with `prefetch > 0`, up to that many windows are
+        counted, then fetched, concurrently. Windows are not resumable:
+        `resume_from` raises ValueError.
+        """
+        _check_resume(resume_from)
+
+        def count(window: Window) -> int:
+            return self._count(path, windows.params(params, window))
+
+        limit = _depth_limit(params)
+
+        def fetch(window: Window) -> List[Dict[str, Any]]:
+            items = self._iter_items(path, windows.params(params, window))
+            return sorted(islice(items, limit), key=windows.sort_key)
+
+        planned = plan_windows(count, windows, date_range, limit, prefetch)
+        for batch in ordered_map(fetch, planned, prefetch):
+            yield from batch
+
+    def _iter_sharded(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        shard_param: str,
+        shards: Iterable[str],
+        key: str,
+        prefetch: int = 0,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the records of every shard, once per `key` value.
+
+        Each shard is the query `params` filtered on `shard_param`; with
+        `prefetch > 0`, up to that many shards are fetched concurrently.
+        Records matched by several shards (e.g. overlapping bounding boxes)
+        are only yielded the first time.
+        """
+
+        def fetch(shard: str) -> List[Dict[str, Any]]:
+            return list(self._iter_items(path, {**params, shard_param: shard}))
+
+        seen: Set[Any] = set()
+        for batch in ordered_map(fetch, shards, prefetch):
+            for item in batch:
+                code = item.get(key)
+                if code is not None:
+                    if code in seen:
+                        continue
+                    seen.add(code)
+                yield item
+
+    def _get_table_page(
+        self, url: str, params: Optional[Dict[str, Any]], model: Type[BaseModel]
+    ) -> Tuple[ResultSet, Optional[str]]:
+        """Parse one CSV page as it is streamed, with the URL of the next page.
+
+        CSV responses carry no envelope: the next page is in the `Link` header.
+        """
+        try:
+            with self._client.stream("GET", url, params=params) as resp:
+                resp.raise_for_status()
+                body = io.BufferedReader(ChunkReader(resp.iter_bytes()))
+                table = read_csv(body, model)
+                return table, resp.links.get("next", {}).get("url")
+        except httpx.HTTPError as exc:
+            raise PaginationError(_page_url(url, params), exc) from exc
+
+    def _get_table(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        model: Type[BaseModel],
+        format: str = "csv",
+    ) -> ResultSet:
+        """Every record of the CSV, GeoJSON or JSON variant of `path`, as columns.
+
+        JSON and GeoJSON pages are decoded one at a time and turned into
+        columns (plus a `geometry` column for GeoJSON, see `read_features`),
+        so no model is built and only one page of dicts is held at once. CSV
+        pages are followed through their `Link` header, and like the other
+        formats stop with a DepthLimitWarning at the depth limit.
+        """
+        if check_format(format) == "json":
+            payloads = self.iter_pages(path, params)
+            tables = [read_records(p.get("data") or [], model) for p in payloads]
+            return ResultSet.concat(tables)
+        if format == "geojson":
+            params = {**params, "format": "geojson"}
+            payloads = self.iter_pages(path, params, key="features")
+            tables = [read_features(p.get("features") or [], model) for p in payloads]
+            return ResultSet.concat(tables)
+        url = f"{self.BASE_URL}/{path}.csv"
+        page_params: Optional[Dict[str, Any]] = params
+        pages: List[ResultSet] = []
+        fetched = _page_offset(params)
+        size = _page_size(params, 0)
+        while True:
+            table, next_url = self._get_table_page(url, page_params, model)
+            pages.append(table)
+            fetched += len(table)
+            if not next_url or not len(table):
+                return ResultSet.concat(pages)
+            if _depth_reached(next_url, fetched, size or len(table)):
+                return ResultSet.concat(pages)
+            url, page_params = next_url, None
+
+    def _get_windowed_table(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        model: Type[BaseModel],
+        windows: DateWindows,
+        date_range: DateRange,
+        prefetch: int = 0,
+        format: str = "csv",
+    ) -> ResultSet:
+        """Every record in `date_range` as columns, in date order.
+
+        Windows are planned as for `_iter_windowed`, then fetched as tables.
+        """
+        check_format(format)
+
+        def count(window: Window) -> int:
+            return self._count(path, windows.params(params, window))
+
+        def fetch(window: Window) -> ResultSet:
+            window_params = windows.params(params, window)
+            table = self._get_table(path, window_params, model, format)
+            return table.sorted_by(*windows.sort_fields)
+
+        limit = _depth_limit(params)
+        planned = plan_windows(count, windows, date_range, limit, prefetch)
+        return ResultSet.concat(list(ordered_map(fetch, planned, prefetch)))
+
+
+class AsyncBaseAPI:
+    """Async counterpart of BaseAPI.
+
+    Every request holds a slot of `semaphore` while in flight. Sub-APIs of the
+    same AsyncHubeauClient share one semaphore, which bounds the total number
+    of concurrent requests however many coroutines are fanned out.
+    """
+
+    BASE_URL: str
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        json_backend: Union[str, JsonBackend] = "json",
+        validation: Union[str, Validation] = "full",
+    ) -> None:
+        self._client = client if client is not None else create_async_client()
+        self._json = get_backend(json_backend)
+        self._validation = get_validation(validation)
+        self._semaphore = (
+            semaphore
+            if semaphore is not None
+            else asyncio.Semaphore(DEFAULT_MAX_CONCURRENCY)
+        )
+
+    def _factory(
+        self,
+        model: Type[M],
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+    ) -> Callable[[Dict[str, Any]], M]:
+        """Build records of `model`, projected on `fields` if given.
+
+        `validation` overrides the API's validation policy for this call.
+        """
+        policy = self._validation if validation is None else get_validation(validation)
+        return policy.factory(project(model, fields))
+
+    async def _get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._get_url(f"{self.BASE_URL}/{path}", params)
+
+    async def _get_url(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        async with self._semaphore:
+            resp = await self._client.get(url, params=params)
+        resp.raise_for_status()
+        payload: Dict[str, Any] = self._json.loads(resp.content)
+        return payload
+
+    async def _get_page(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        try:
+            return await self._get_url(url, params)
+        except httpx.HTTPError as exc:
+            raise PaginationError(_page_url(url, params), exc) from exc
+
+    async def iter_pages(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        key: str = "data",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async counterpart of `BaseAPI.iter_pages`."""
+        url = f"{self.BASE_URL}/{path}"
+        if resume_from is not None:
+            url, params = _split_resume_url(resume_from)
+        if prefetch > 0:
+            params = {"page": 1, **params}
+        payload = await self._get_page(url, params)
+        pages = _prefetch_pages(payload, params) if prefetch > 0 else []
+        if pages:
+            yield payload
+            async for payload in self._iter_prefetched(url, params, pages, prefetch):
+                yield payload
+            return
+        fetched = _page_offset(params)
+        size = _page_size(params, len(payload.get(key) or []))
+        while True:
+            yield payload
+            next_url = payload.get("next")
+            fetched += len(payload.get(key) or [])
+            if not next_url or not payload.get(key):
+                return
+            if _depth_reached(next_url, fetched, size, payload.get("count")):
+                return
+            payload = await self._get_page(next_url)
+
+    def _iter_prefetched(
+        self, url: str, params: Dict[str, Any], pages: List[int], prefetch: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async def fetch(page: int) -> Dict[str, Any]:
+            return await self._get_page(url, {**params, "page": page})
+
+        return async_ordered_map(fetch, pages, prefetch)
+
+    async def _stream_page(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        decoder: EnvelopeDecoder,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the `data` items of one page as they are decoded off the wire.
+
+        A slot of the semaphore is held to send the request and to read and
+        decode each chunk, but not while its items are handed to the caller:
+        requests made while consuming the page cannot wait on its slot.
+        """
+        request = self._client.build_request("GET", url, params=params)
+        async with self._semaphore:
+            resp = await self._client.send(request, stream=True)
+        try:
+            resp.raise_for_status()
+            chunks = aiter(resp.aiter_bytes())
+            while True:
+                async with self._semaphore:
+                    chunk = await anext(chunks, None)
+                    items = decoder.close() if chunk is None else decoder.feed(chunk)
+                for item in items:
+                    yield item
+                if chunk is None:
+                    return
+        finally:
+            await resp.aclose()
+
+    async def _get_items(
+        self, path: str, params: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        if not self._json.incremental:
+            for item in (await self._get(path, params)).get("data") or []:
+                yield item
+            return
+        url = f"{self.BASE_URL}/{path}"
+        async for item in self._stream_page(url, params, EnvelopeDecoder()):
+            yield item
+
+    async def _iter_items(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        if prefetch > 0 or not self._json.incremental:
+            async for payload in self.iter_pages(path, params, prefetch, resume_from):
+                for item in payload.get("data", []):
+                    yield item
+            return
+        url: str = f"{self.BASE_URL}/{path}"
+        page_params: Optional[Dict[str, Any]] = params
+        if resume_from is not None:
+            url, page_params = _split_resume_url(resume_from)
+        fetched = _page_offset(page_params)
+        size = _page_size(page_params, 0)
+        while True:
+            decoder = EnvelopeDecoder()
+            count = 0
+            try:
+                async for item in self._stream_page(url, page_params, decoder):
+                    count += 1
+                    yield item
+            except httpx.HTTPError as exc:
+                raise PaginationError(_page_url(url, page_params), exc) from exc
+            next_url = decoder.envelope.get("next")
+            fetched += count
+            if not next_url or not count:
+                return
+            total = decoder.envelope.get("count")
+            if _depth_reached(next_url, fetched, size or count, total):
+                return
+            url, page_params = next_url, None
+
+    async def _count(self, path: str, params: Dict[str, Any]) -> int:
+        payload = await self._get(path, {**params, "size": 1})
+        return int(payload.get("count") or 0)
+
+    async def _iter_windowed(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        windows: DateWindows,
+        date_range: DateRange,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        _check_resume(resume_from)
+
+        async def count(window: Window) -> int:
+            return await self._count(path, windows.params(params, window))
+
+        limit = _depth_limit(params)
+
+        async def fetch(window: Window) -> List[Dict[str, Any]]:
+            items: List[Dict[str, Any]] = []
+            async for item in self._iter_items(path, windows.params(params, window)):
+                items.append(item)
+                if len(items) >= limit:
+                    break
+            return sorted(items, key=windows.sort_key)
+
+        planned = await async_plan_windows(count, windows, date_range, limit, prefetch)
+        async for batch in async_ordered_map(fetch, planned, prefetch):
+            for item in batch:
+                yield item
+
+    async def _iter_sharded(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        shard_param: str,
+        shards: Iterable[str],
+        key: str,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async def fetch(shard: str) -> List[Dict[str, Any]]:
+            items = self._iter_items(path, {**params, shard_param: shard})
+            return [item async for item in items]
+
+        seen: Set[Any] = set()
+        async for batch in async_ordered_map(fetch, shards, prefetch):
+            for item in batch:
+                code = item.get(key)
+                if code is not None:
+                    if code in seen:
+                        continue
+                    seen.add(code)
+                yield item
+
+    async def _get_table_page(
+        self, url: str, params: Optional[Dict[str, Any]], model: Type[BaseModel]
+    ) -> Tuple[ResultSet, Optional[str]]:
+        # pandas cannot parse from an async stream: the page is read first.
+        try:
+            async with self._semaphore:
+                resp = await self._client.get(url, params=params)
+            resp.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise PaginationError(_page_url(url, params), exc) from exc
+        table = read_csv(io.BytesIO(resp.content), model)
+        return table, resp.links.get("next", {}).get("url")
+
+    async def _get_table(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        model: Type[BaseModel],
+        format: str = "csv",
+    ) -> ResultSet:
+        if check_format(format) == "json":
+            payloads = self.iter_pages(path, params)
+            tables = [read_records(p.get("data") or [], model) async for p in payloads]
+            return ResultSet.concat(tables)
+        if format == "geojson":
+            params = {**params, "format": "geojson"}
+            payloads = self.iter_pages(path, params, key="features")
+            tables = [
+                read_features(p.get("features") or [], model) async for p in payloads
+            ]
+            return ResultSet.concat(tables)
+        url = f"{self.BASE_URL}/{path}.csv"
+        page_params: Optional[Dict[str, Any]] = params
+        pages: List[ResultSet] = []
+        fetched = _page_offset(params)
+        size = _page_size(params, 0)
+        while True:
+            table, next_url = await self._get_table_page(url, page_params, model)
+            pages.append(table)
+            fetched += len(table)
+            if not next_url or not len(table):
+                return ResultSet.concat(pages)
+            if _depth_reached(next_url, fetched, size or len(table)):
+                return ResultSet.concat(pages)
+            url, page_params = next_url, None
+
+    async def _get_windowed_table(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        model: Type[BaseModel],
+        windows: DateWindows,
+        date_range: DateRange,
+        prefetch: int = 0,
+        format: str = "csv",
+    ) -> ResultSet:
+        check_format(format)
+
+        async def count(window: Window) -> int:
+            return await self._count(path, windows.params(params, window))
+
+        async def fetch(window: Window) -> ResultSet:
+            window_params = windows.params(params, window)
+            table = await self._get_table(path, window_params, model, format)
+            return table.sorted_by(*windows.sort_fields)
+
+        limit = _depth_limit(params)
+        planned = await async_plan_windows(count, windows, date_range, limit, prefetch)
+        tables = [table async for table in async_ordered_map(fetch, planned, prefetch)]
+        return ResultSet.concat(tables)
@@ -1,37 +1,652 @@
-from typing import Any, List
-
-import httpx
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 
+from hubeau_py.api.base import AsyncBaseAPI, BaseAPI
+from hubeau_py.columnar import ResultSet
 from hubeau_py.models.hydrometrie import ObsElab, ObservationTr, Site, Station
+from hubeau_py.projection import check_fields, fields_param
+from hubeau_py.series import (
+    OBS_ELAB_SERIES,
+    OBSERVATIONS_TR_SERIES,
+    StationSeries,
+    station_series,
+)
+from hubeau_py.sharding import (
+    DEPARTMENTS,
+    OBS_ELAB_WINDOWS,
+    OBSERVATIONS_TR_WINDOWS,
+    DateRange,
+)
+from hubeau_py.validation import Validation
 
 
-class HydrometrieAPI:
+class HydrometrieAPI(BaseAPI):
     BASE_URL = "https://hubeau.eaufrance.fr/api/v2/hydrometrie"
 
-    def get_sites(self, **kwargs: Any) -> List[Site]:
-        url = f"{self.BASE_URL}/referentiel/sites"
-        resp = httpx.get(url, params=kwargs)
-        resp.raise_for_status()
-        data = resp.json()["data"]
-        return [Site(**item) for item in data]
-
-    def get_stations(self, **kwargs: Any) -> List[Station]:
-        url = f"{self.BASE_URL}/referentiel/stations"
-        resp = httpx.get(url, params=kwargs)
-        resp.raise_for_status()
-        data = resp.json()["data"]
-        return [Station(**item) for item in data]
-
-    def get_observations_tr(self, **kwargs: Any) -> List[ObservationTr]:
-        url = f"{self.BASE_URL}/observations_tr"
-        resp = httpx.get(url, params=kwargs)
-        resp.raise_for_status()
-        data = resp.json()["data"]
-        return [ObservationTr(**item) for item in data]
-
-    def get_obs_elab(self, **kwargs: Any) -> List[ObsElab]:
-        url = f"{self.BASE_URL}/obs_elab"
-        resp = httpx.get(url, params=kwargs)
-        resp.raise_for_status()
-        data = resp.json()["data"]
-        return [ObsElab(**item) for item in data]
+    # `fields` restricts the fields downloaded and validated to these model
+    # fields; the other fields of the returned records are None.
+    # `validation` ("full", "trusted", "sampled" or a Validation) overrides the
+    # client's validation policy for one call.
+
+    def get_sites(
+        self,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> List[Site]:
+        make = self._factory(Site, fields, validation)
+        params = fields_param(kwargs, fields)
+        return [make(item) for item in self._get_items("referentiel/sites", params)]
+
+    def get_stations(
+        self,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> List[Station]:
+        make = self._factory(Station, fields, validation)
+        params = fields_param(kwargs, fields)
+        return [make(item) for item in self._get_items("referentiel/stations", params)]
+
+    def get_observations_tr(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> List[ObservationTr]:
+        if date_range is not None:
+            return list(
+                self.iter_observations_tr(
+                    date_range=date_range,
+                    prefetch=prefetch,
+                    fields=fields,
+                    validation=validation,
+                    **kwargs,
+                )
+            )
+        make = self._factory(ObservationTr, fields, validation)
+        params = fields_param(kwargs, fields)
+        return [make(item) for item in self._get_items("observations_tr", params)]
+
+    def get_obs_elab(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> List[ObsElab]:
+        if date_range is not None:
+            return list(
+                self.iter_obs_elab(
+                    date_range=date_range,
+                    prefetch=prefetch,
+                    fields=fields,
+                    validation=validation,
+                    **kwargs,
+                )
+            )
+        make = self._factory(ObsElab, fields, validation)
+        params = fields_param(kwargs, fields)
+        return [make(item) for item in self._get_items("obs_elab", params)]
+
+    # --- Streaming iterators (follow the `next` link across all pages) ---
+    # `prefetch` > 0 fetches that many following pages concurrently.
+    # `resume_from` is the URL carried by a PaginationError, to resume there.
+    # `date_range=(start, end)` cuts the date range into windows small enough to
+    # get past the API depth limit and yields records in date order; `prefetch`
+    # is then the number of windows counted and fetched concurrently, and
+    # `resume_from` is not accepted. The get_* methods accept it too, returning
+    # every record in the range instead of one page. Records past the depth
+    # limit that cannot be fetched are reported with a DepthLimitWarning.
+    # iter_all_* extract a whole referentiel with one query per value of
+    # `shard_by` (departments by default, or `bbox` with `bbox_tiles()`),
+    # `prefetch` shards at a time, dropping records already seen in a shard.
+
+    def iter_sites(
+        self,
+        *,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> Iterator[Site]:
+        make = self._factory(Site, fields, validation)
+        params = fields_param(kwargs, fields)
+        for item in self._iter_items(
+            "referentiel/sites", params, prefetch, resume_from
+        ):
+            yield make(item)
+
+    def iter_stations(
+        self,
+        *,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> Iterator[Station]:
+        make = self._factory(Station, fields, validation)
+        params = fields_param(kwargs, fields)
+        for item in self._iter_items(
+            "referentiel/stations", params, prefetch, resume_from
+        ):
+            yield make(item)
+
+    def iter_all_sites(
+        self,
+        *,
+        shard_by: str = "code_departement",
+        shards: Iterable[str] = DEPARTMENTS,
+        prefetch: int = 4,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> Iterator[Site]:
+        make = self._factory(Site, fields, validation)
+        params = fields_param(kwargs, fields, "code_site")
+        items = self._iter_sharded(
+            "referentiel/sites", params, shard_by, shards, "code_site", prefetch
+        )
+        for item in items:
+            yield make(item)
+
+    def iter_all_stations(
+        self,
+        *,
+        shard_by: str = "code_departement",
+        shards: Iterable[str] = DEPARTMENTS,
+        prefetch: int = 4,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> Iterator[Station]:
+        make = self._factory(Station, fields, validation)
+        params = fields_param(kwargs, fields, "code_station")
+        items = self._iter_sharded(
+            "referentiel/stations", params, shard_by, shards, "code_station", prefetch
+        )
+        for item in items:
+            yield make(item)
+
+    def iter_observations_tr(
+        self,
+        *,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        date_range: Optional[DateRange] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> Iterator[ObservationTr]:
+        make = self._factory(ObservationTr, fields, validation)
+        if date_range is not None:
+            windows = OBSERVATIONS_TR_WINDOWS
+            params = fields_param(kwargs, fields, *windows.sort_fields)
+            items = self._iter_windowed(
+                "observations_tr",
+                params,
+                windows,
+                date_range,
+                prefetch,
+                resume_from,
+            )
+        else:
+            params = fields_param(kwargs, fields)
+            items = self._iter_items("observations_tr", params, prefetch, resume_from)
+        for item in items:
+            yield make(item)
+
+    def iter_obs_elab(
+        self,
+        *,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        date_range: Optional[DateRange] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> Iterator[ObsElab]:
+        make = self._factory(ObsElab, fields, validation)
+        if date_range is not None:
+            windows = OBS_ELAB_WINDOWS
+            params = fields_param(kwargs, fields, *windows.sort_fields)
+            items = self._iter_windowed(
+                "obs_elab",
+                params,
+                windows,
+                date_range,
+                prefetch,
+                resume_from,
+            )
+        else:
+            params = fields_param(kwargs, fields)
+            items = self._iter_items("obs_elab", params, prefetch, resume_from)
+        for item in items:
+            yield make(item)
+
+    # --- Columnar tables, parsed from the CSV variant of the endpoint ---
+    # Smaller downloads than JSON and no dict or model per record; see
+    # ResultSet. `date_range`, `prefetch` and `fields` work as for iter_*.
+    # With format="json" the JSON pages are turned into columns one at a time
+    # instead, still without building a model per record. Sites and stations
+    # can also be fetched with format="geojson", which adds a `geometry`
+    # column of shapely points built in one vectorized call.
+
+    def get_sites_table(
+        self,
+        *,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> ResultSet:
+        check_fields(Site, fields or ())
+        params = fields_param(kwargs, fields)
+        return self._get_table("referentiel/sites", params, Site, format)
+
+    def get_stations_table(
+        self,
+        *,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> ResultSet:
+        check_fields(Station, fields or ())
+        params = fields_param(kwargs, fields)
+        return self._get_table("referentiel/stations", params, Station, format)
+
+    def get_observations_tr_table(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> ResultSet:
+        check_fields(ObservationTr, fields or ())
+        if date_range is None:
+            params = fields_param(kwargs, fields)
+            return self._get_table("observations_tr", params, ObservationTr, format)
+        params = fields_param(kwargs, fields, *OBSERVATIONS_TR_WINDOWS.sort_fields)
+        return self._get_windowed_table(
+            "observations_tr",
+            params,
+            ObservationTr,
+            OBSERVATIONS_TR_WINDOWS,
+            date_range,
+            prefetch,
+            format,
+        )
+
+    def get_obs_elab_table(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> ResultSet:
+        check_fields(ObsElab, fields or ())
+        if date_range is None:
+            params = fields_param(kwargs, fields)
+            return self._get_table("obs_elab", params, ObsElab, format)
+        params = fields_param(kwargs, fields, *OBS_ELAB_WINDOWS.sort_fields)
+        return self._get_windowed_table(
+            "obs_elab",
+            params,
+            ObsElab,
+            OBS_ELAB_WINDOWS,
+            date_range,
+            prefetch,
+            format,
+        )
+
+    # --- Compact series: one StationSeries per station and quantity, with
+    # the station fields stored once and the observations packed in arrays ---
+
+    def get_observations_tr_series(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        format: str = "csv",
+        **kwargs: Any,
+    ) -> List[StationSeries]:
+        table = self.get_observations_tr_table(
+            date_range=date_range, prefetch=prefetch, format=format, **kwargs
+        )
+        return station_series(table, OBSERVATIONS_TR_SERIES)
+
+    def get_obs_elab_series(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        format: str = "csv",
+        **kwargs: Any,
+    ) -> List[StationSeries]:
+        table = self.get_obs_elab_table(
+            date_range=date_range, prefetch=prefetch, format=format, **kwargs
+        )
+        return station_series(table, OBS_ELAB_SERIES)
+
+
+class AsyncHydrometrieAPI(AsyncBaseAPI):
+    BASE_URL = HydrometrieAPI.BASE_URL
+
+    async def get_sites(
+        self,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> List[Site]:
+        make = self._factory(Site, fields, validation)
+        params = fields_param(kwargs, fields)
+        return [
+            make(item) async for item in self._get_items("referentiel/sites", params)
+        ]
+
+    async def get_stations(
+        self,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> List[Station]:
+        make = self._factory(Station, fields, validation)
+        params = fields_param(kwargs, fields)
+        return [
+            make(item) async for item in self._get_items("referentiel/stations", params)
+        ]
+
+    async def get_observations_tr(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> List[ObservationTr]:
+        if date_range is not None:
+            items = self.iter_observations_tr(
+                date_range=date_range,
+                prefetch=prefetch,
+                fields=fields,
+                validation=validation,
+                **kwargs,
+            )
+            return [item async for item in items]
+        make = self._factory(ObservationTr, fields, validation)
+        params = fields_param(kwargs, fields)
+        return [make(item) async for item in self._get_items("observations_tr", params)]
+
+    async def get_obs_elab(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> List[ObsElab]:
+        if date_range is not None:
+            items = self.iter_obs_elab(
+                date_range=date_range,
+                prefetch=prefetch,
+                fields=fields,
+                validation=validation,
+                **kwargs,
+            )
+            return [item async for item in items]
+        make = self._factory(ObsElab, fields, validation)
+        params = fields_param(kwargs, fields)
+        return [make(item) async for item in self._get_items("obs_elab", params)]
+
+    # --- Streaming iterators (follow the `next` link across all pages) ---
+
+    async def iter_sites(
+        self,
+        *,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Site]:
+        make = self._factory(Site, fields, validation)
+        params = fields_param(kwargs, fields)
+        async for item in self._iter_items(
+            "referentiel/sites", params, prefetch, resume_from
+        ):
+            yield make(item)
+
+    async def iter_stations(
+        self,
+        *,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Station]:
+        make = self._factory(Station, fields, validation)
+        params = fields_param(kwargs, fields)
+        async for item in self._iter_items(
+            "referentiel/stations", params, prefetch, resume_from
+        ):
+            yield make(item)
+
+    async def iter_all_sites(
+        self,
+        *,
+        shard_by: str = "code_departement",
+        shards: Iterable[str] = DEPARTMENTS,
+        prefetch: int = 4,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Site]:
+        make = self._factory(Site, fields, validation)
+        params = fields_param(kwargs, fields, "code_site")
+        items = self._iter_sharded(
+            "referentiel/sites", params, shard_by, shards, "code_site", prefetch
+        )
+        async for item in items:
+            yield make(item)
+
+    async def iter_all_stations(
+        self,
+        *,
+        shard_by: str = "code_departement",
+        shards: Iterable[str] = DEPARTMENTS,
+        prefetch: int = 4,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Station]:
+        make = self._factory(Station, fields, validation)
+        params = fields_param(kwargs, fields, "code_station")
+        items = self._iter_sharded(
+            "referentiel/stations", params, shard_by, shards, "code_station", prefetch
+        )
+        async for item in items:
+            yield make(item)
+
+    async def iter_observations_tr(
+        self,
+        *,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        date_range: Optional[DateRange] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ObservationTr]:
+        make = self._factory(ObservationTr, fields, validation)
+        if date_range is not None:
+            windows = OBSERVATIONS_TR_WINDOWS
+            params = fields_param(kwargs, fields, *windows.sort_fields)
+            items = self._iter_windowed(
+                "observations_tr",
+                params,
+                windows,
+                date_range,
+                prefetch,
+                resume_from,
+            )
+        else:
+            params = fields_param(kwargs, fields)
+            items = self._iter_items("observations_tr", params, prefetch, resume_from)
+        async for item in items:
+            yield make(item)
+
+    async def iter_obs_elab(
+        self,
+        *,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        date_range: Optional[DateRange] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ObsElab]:
+        make = self._factory(ObsElab, fields, validation)
+        if date_range is not None:
+            windows = OBS_ELAB_WINDOWS
+            params = fields_param(kwargs, fields, *windows.sort_fields)
+            items = self._iter_windowed(
+                "obs_elab",
+                params,
+                windows,
+                date_range,
+                prefetch,
+                resume_from,
+            )
+        else:
+            params = fields_param(kwargs, fields)
+            items = self._iter_items("obs_elab", params, prefetch, resume_from)
+        async for item in items:
+            yield make(item)
+
+    # --- Columnar tables, parsed from the CSV variant of the endpoint ---
+
+    async def get_sites_table(
+        self,
+        *,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> ResultSet:
+        check_fields(Site, fields or ())
+        params = fields_param(kwargs, fields)
+        return await self._get_table("referentiel/sites", params, Site, format)
+
+    async def get_stations_table(
+        self,
+        *,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> ResultSet:
+        check_fields(Station, fields or ())
+        params = fields_param(kwargs, fields)
+        return await self._get_table("referentiel/stations", params, Station, format)
+
+    async def get_observations_tr_table(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> ResultSet:
+        check_fields(ObservationTr, fields or ())
+        if date_range is None:
+            params = fields_param(kwargs, fields)
+            return await self._get_table(
+                "observations_tr", params, ObservationTr, format
+            )
+        params = fields_param(kwargs, fields, *OBSERVATIONS_TR_WINDOWS.sort_fields)
+        return await self._get_windowed_table(
+            "observations_tr",
+            params,
+            ObservationTr,
+            OBSERVATIONS_TR_WINDOWS,
+            date_range,
+            prefetch,
+            format,
+        )
+
+    async def get_obs_elab_table(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> ResultSet:
+        check_fields(ObsElab, fields or ())
+        if date_range is None:
+            params = fields_param(kwargs, fields)
+            return await self._get_table("obs_elab", params, ObsElab, format)
+        params = fields_param(kwargs, fields, *OBS_ELAB_WINDOWS.sort_fields)
+        return await self._get_windowed_table(
+            "obs_elab",
+            params,
+            ObsElab,
+            OBS_ELAB_WINDOWS,
+            date_range,
+            prefetch,
+            format,
+        )
+
+    # --- Compact series: one StationSeries per station and quantity, with
+    # the station fields stored once and the observations packed in arrays ---
+
+    async def get_observations_tr_series(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        format: str = "csv",
+        **kwargs: Any,
+    ) -> List[StationSeries]:
+        table = await self.get_observations_tr_table(
+            date_range=date_range, prefetch=prefetch, format=format, **kwargs
+        )
+        return station_series(table, OBSERVATIONS_TR_SERIES)
+
+    async def get_obs_elab_series(
+        self,
+        *,
+        date_range: Optional[DateRange] = None,
+        prefetch: int = 0,
+        format: str = "csv",
+        **kwargs: Any,
+    ) -> List[StationSeries]:
+        table = await self.get_obs_elab_table(
+            date_range=date_range, prefetch=prefetch, format=format, **kwargs
+        )
+        return station_series(table, OBS_ELAB_SERIES)
@@ -1,53 +1,477 @@
-from typing import Any, List, Optional
-
-import httpx
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 
+from hubeau_py.api.base import AsyncBaseAPI, BaseAPI
+from hubeau_py.columnar import ResultSet
 from hubeau_py.models.qualite_rivieres import AnalysePc, StationPc
+from hubeau_py.normalize import (
+    ANALYSE_PC_NORMALIZED_FIELDS,
+    Normalized,
+    normalize_analyses,
+)
+from hubeau_py.projection import check_fields, fields_param
+from hubeau_py.sharding import ANALYSE_PC_WINDOWS, DEPARTMENTS, DateRange
+from hubeau_py.validation import Validation
+
+
+def _station_params(
+    libelle_commune: Optional[str], size: int, params: Dict[str, Any]
+) -> Dict[str, Any]:
+    params["size"] = size
+    if libelle_commune:
+        params["libelle_commune"] = libelle_commune
+    return params
 
 
-class QualiteRivieresAPI:
+def _analyse_params(
+    code_station: Optional[str], size: int, params: Dict[str, Any]
+) -> Dict[str, Any]:
+    params["size"] = size
+    if code_station:
+        params["code_station"] = code_station
+    return params
+
+
+class QualiteRivieresAPI(BaseAPI):
     BASE_URL = "https://hubeau.eaufrance.fr/api/v2/qualite_rivieres"
 
     def get_stations(
-        self, libelle_commune: Optional[str] = None, size: int = 10, **params: Any
+        self,
+        libelle_commune: Optional[str] = None,
+        size: int = 10,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **params: Any,
     ) -> List[StationPc]:
         """
         Fetch a list of stations, optionally filtered by commune name.
+        With fields, only those fields are downloaded; the others are None.
+        validation overrides the client's validation policy for this call.
         """
-        url = f"{self.BASE_URL}/station_pc"
-        params["size"] = size
-        if libelle_commune:
-            params["libelle_commune"] = libelle_commune
-        resp = httpx.get(url, params=params, timeout=30)
-        resp.raise_for_status()
-        data = resp.json().get("data", [])
-        return [StationPc(**item) for item in data]
+        make = self._factory(StationPc, fields, validation)
+        params = fields_param(_station_params(libelle_commune, size, params), fields)
+        return [make(item) for item in self._get_items("station_pc", params)]
 
     def get_analyses(
         self,
         code_station: Optional[str] = None,
         size: int = 100,
-        max_records: int = 1000,
+        max_records: Optional[int] = 1000,
+        prefetch: int = 0,
+        date_range: Optional[DateRange] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
         **params: Any,
     ) -> List[AnalysePc]:
         """
-        Fetch analyses, paginated, for a station. Returns up to max_records.
+        Fetch analyses, paginated, for a station. Returns up to max_records
+        (all of them if None).
+        With prefetch > 0, up to that many pages are fetched concurrently.
+        With date_range or fields, see iter_analyses.
+        """
+        analyses = self.iter_analyses(
+            code_station,
+            size=size,
+            prefetch=prefetch,
+            date_range=date_range,
+            fields=fields,
+            validation=validation,
+            **params,
+        )
+        return list(islice(analyses, max_records))
+
+    def iter_stations(
+        self,
+        libelle_commune: Optional[str] = None,
+        size: int = 1000,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **params: Any,
+    ) -> Iterator[StationPc]:
+        """
+        Stream every matching station, one page in memory at a time.
+        With prefetch > 0, up to that many pages are fetched concurrently.
+        To continue after a PaginationError, pass its `resume_from` URL.
+        """
+        make = self._factory(StationPc, fields, validation)
+        params = fields_param(_station_params(libelle_commune, size, params), fields)
+        for item in self._iter_items("station_pc", params, prefetch, resume_from):
+            yield make(item)
+
+    def iter_all_stations(
+        self,
+        shard_by: str = "code_departement",
+        shards: Iterable[str] = DEPARTMENTS,
+        size: int = 1000,
+        prefetch: int = 4,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **params: Any,
+    ) -> Iterator[StationPc]:
+        """
+        Stream the whole station referentiel (or the part matching params),
+        querying one shard per value of shard_by and dropping duplicate
+        code_station. Up to prefetch shards are fetched concurrently.
+        Pass shard_by="bbox", shards=bbox_tiles(...) to shard geographically.
         """
-        url = f"{self.BASE_URL}/analyse_pc"
+        make = self._factory(StationPc, fields, validation)
         params["size"] = size
-        if code_station:
-            params["code_station"] = code_station
-        results: List[Any] = []
-        page = 1
-        while len(results) < max_records:
-            params["page"] = page
-            resp = httpx.get(url, params=params, timeout=30)
-            resp.raise_for_status()
-            data = resp.json().get("data", [])
-            if not data:
+        params = fields_param(params, fields, "code_station")
+        items = self._iter_sharded(
+            "station_pc", params, shard_by, shards, "code_station", prefetch
+        )
+        for item in items:
+            yield make(item)
+
+    def iter_analyses(
+        self,
+        code_station: Optional[str] = None,
+        size: int = 1000,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        date_range: Optional[DateRange] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **params: Any,
+    ) -> Iterator[AnalysePc]:
+        """
+        Stream every matching analysis, one page in memory at a time.
+        With prefetch > 0, up to that many pages are fetched concurrently.
+        To continue after a PaginationError, pass its `resume_from` URL.
+
+        With date_range=(start, end), sampling dates are cut into windows
+        small enough to be paginated past the API depth limit, and results
+        come in date order. prefetch is then the number of windows counted
+        and fetched concurrently, and resume_from is not accepted. Records
+        past the depth limit that cannot be fetched are reported with a
+        DepthLimitWarning.
+
+        With fields, only those AnalysePc fields are requested from the API
+        and validated; the other fields of the returned analyses are None.
+        validation ("full", "trusted", "sampled" or a Validation) overrides
+        the client's validation policy for this call.
+        """
+        make = self._factory(AnalysePc, fields, validation)
+        params = _analyse_params(code_station, size, params)
+        if date_range is not None:
+            windows = ANALYSE_PC_WINDOWS
+            params = fields_param(params, fields, *windows.sort_fields)
+            items = self._iter_windowed(
+                "analyse_pc",
+                params,
+                windows,
+                date_range,
+                prefetch,
+                resume_from,
+            )
+        else:
+            params = fields_param(params, fields)
+            items = self._iter_items("analyse_pc", params, prefetch, resume_from)
+        for item in items:
+            yield make(item)
+
+    def get_stations_table(
+        self,
+        libelle_commune: Optional[str] = None,
+        size: int = 5000,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **params: Any,
+    ) -> ResultSet:
+        """
+        Fetch every matching station as columns (see ResultSet), from the CSV
+        variant of the endpoint or, with format="geojson", from GeoJSON
+        features, adding a `geometry` column of shapely points built in one
+        vectorized call (`to_geopandas()` makes a GeoDataFrame of it).
+        """
+        check_fields(StationPc, fields or ())
+        params = fields_param(_station_params(libelle_commune, size, params), fields)
+        return self._get_table("station_pc", params, StationPc, format)
+
+    def get_analyses_table(
+        self,
+        code_station: Optional[str] = None,
+        size: int = 5000,
+        prefetch: int = 0,
+        date_range: Optional[DateRange] = None,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **params: Any,
+    ) -> ResultSet:
+        """
+        Fetch every matching analysis as columns (see ResultSet), parsed from
+        the CSV variant of the endpoint as it is streamed: a smaller download
+        than JSON, and no dict or model is built per record. format="json"
+        turns JSON pages into columns one at a time instead. code_station,
+        date_range, prefetch and fields work as in iter_analyses.
+        """
+        check_fields(AnalysePc, fields or ())
+        params = _analyse_params(code_station, size, params)
+        if date_range is None:
+            params = fields_param(params, fields)
+            return self._get_table("analyse_pc", params, AnalysePc, format)
+        windows = ANALYSE_PC_WINDOWS
+        params = fields_param(params, fields, *windows.sort_fields)
+        return self._get_windowed_table(
+            "analyse_pc", params, AnalysePc, windows, date_range, prefetch, format
+        )
+
+    def get_analyses_normalized(
+        self,
+        code_station: Optional[str] = None,
+        size: int = 5000,
+        prefetch: int = 0,
+        date_range: Optional[DateRange] = None,
+        format: str = "csv",
+        **params: Any,
+    ) -> Normalized:
+        """
+        Fetch every matching analysis as a fact table of ids, dates and
+        results plus deduplicated dimension tables (stations, parameters,
+        units, laboratories, methods, networks); see normalize_analyses.
+        Only the fields these tables hold are downloaded. Arguments work as
+        in get_analyses_table.
+        """
+        table = self.get_analyses_table(
+            code_station,
+            size,
+            prefetch,
+            date_range,
+            format,
+            fields=ANALYSE_PC_NORMALIZED_FIELDS,
+            **params,
+        )
+        return normalize_analyses(table)
+
+
+class AsyncQualiteRivieresAPI(AsyncBaseAPI):
+    BASE_URL = QualiteRivieresAPI.BASE_URL
+
+    async def get_stations(
+        self,
+        libelle_commune: Optional[str] = None,
+        size: int = 10,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **params: Any,
+    ) -> List[StationPc]:
+        """
+        Fetch a list of stations, optionally filtered by commune name.
+        With fields, only those fields are downloaded; the others are None.
+        validation overrides the client's validation policy for this call.
+        """
+        make = self._factory(StationPc, fields, validation)
+        params = fields_param(_station_params(libelle_commune, size, params), fields)
+        return [make(item) async for item in self._get_items("station_pc", params)]
+
+    async def get_analyses(
+        self,
+        code_station: Optional[str] = None,
+        size: int = 100,
+        max_records: Optional[int] = 1000,
+        prefetch: int = 0,
+        date_range: Optional[DateRange] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **params: Any,
+    ) -> List[AnalysePc]:
+        """
+        Fetch analyses, paginated, for a station. Returns up to max_records
+        (all of them if None).
+        With prefetch > 0, up to that many pages are fetched concurrently.
+        With date_range or fields, see iter_analyses.
+        """
+        results: List[AnalysePc] = []
+        if max_records is not None and max_records <= 0:
+            return results
+        analyses = self.iter_analyses(
+            code_station,
+            size=size,
+            prefetch=prefetch,
+            date_range=date_range,
+            fields=fields,
+            validation=validation,
+            **params,
+        )
+        async for analysis in analyses:
+            results.append(analysis)
+            if max_records is not None and len(results) >= max_records:
                 break
-            results.extend([AnalysePc(**item) for item in data])
-            if len(data) < size:
-                break  # Last page
-            page += 1
-        return results[:max_records]
+        return results
+
+    async def iter_stations(
+        self,
+        libelle_commune: Optional[str] = None,
+        size: int = 1000,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **params: Any,
+    ) -> AsyncIterator[StationPc]:
+        """
+        Stream every matching station, one page in memory at a time.
+        With prefetch > 0, up to that many pages are fetched concurrently.
+        To continue after a PaginationError, pass its `resume_from` URL.
+        """
+        make = self._factory(StationPc, fields, validation)
+        params = fields_param(_station_params(libelle_commune, size, params), fields)
+        async for item in self._iter_items("station_pc", params, prefetch, resume_from):
+            yield make(item)
+
+    async def iter_all_stations(
+        self,
+        shard_by: str = "code_departement",
+        shards: Iterable[str] = DEPARTMENTS,
+        size: int = 1000,
+        prefetch: int = 4,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **params: Any,
+    ) -> AsyncIterator[StationPc]:
+        """
+        Stream the whole station referentiel (or the part matching params),
+        querying one shard per value of shard_by and dropping duplicate
+        code_station. Up to prefetch shards are fetched concurrently.
+        Pass shard_by="bbox", shards=bbox_tiles(...) to shard geographically.
+        """
+        make = self._factory(StationPc, fields, validation)
+        params["size"] = size
+        params = fields_param(params, fields, "code_station")
+        items = self._iter_sharded(
+            "station_pc", params, shard_by, shards, "code_station", prefetch
+        )
+        async for item in items:
+            yield make(item)
+
+    async def iter_analyses(
+        self,
+        code_station: Optional[str] = None,
+        size: int = 1000,
+        prefetch: int = 0,
+        resume_from: Optional[str] = None,
+        date_range: Optional[DateRange] = None,
+        fields: Optional[Sequence[str]] = None,
+        validation: Optional[Union[str, Validation]] = None,
+        **params: Any,
+    ) -> AsyncIterator[AnalysePc]:
+        """
+        Stream every matching analysis, one page in memory at a time.
+        With prefetch > 0, up to that many pages are fetched concurrently.
+        To continue after a PaginationError, pass its `resume_from` URL.
+
+        With date_range=(start, end), sampling dates are cut into windows
+        small enough to be paginated past the API depth limit, and results
+        come in date order. prefetch is then the number of windows counted
+        and fetched concurrently, and resume_from is not accepted. Records
+        past the depth limit that cannot be fetched are reported with a
+        DepthLimitWarning.
+
+        With fields, only those AnalysePc fields are requested from the API
+        and validated; the other fields of the returned analyses are None.
+        validation ("full", "trusted", "sampled" or a Validation) overrides
+        the client's validation policy for this call.
+        """
+        make = self._factory(AnalysePc, fields, validation)
+        params = _analyse_params(code_station, size, params)
+        if date_range is not None:
+            windows = ANALYSE_PC_WINDOWS
+            params = fields_param(params, fields, *windows.sort_fields)
+            items = self._iter_windowed(
+                "analyse_pc",
+                params,
+                windows,
+                date_range,
+                prefetch,
+                resume_from,
+            )
+        else:
+            params = fields_param(params, fields)
+            items = self._iter_items("analyse_pc", params, prefetch, resume_from)
+        async for item in items:
+            yield make(item)
+
+    async def get_stations_table(
+        self,
+        libelle_commune: Optional[str] = None,
+        size: int = 5000,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **params: Any,
+    ) -> ResultSet:
+        """
+        Fetch every matching station as columns (see ResultSet), from the CSV
+        variant of the endpoint or, with format="geojson", from GeoJSON
+        features, adding a `geometry` column of shapely points built in one
+        vectorized call (`to_geopandas()` makes a GeoDataFrame of it).
+        """
+        check_fields(StationPc, fields or ())
+        params = fields_param(_station_params(libelle_commune, size, params), fields)
+        return await self._get_table("station_pc", params, StationPc, format)
+
+    async def get_analyses_table(
+        self,
+        code_station: Optional[str] = None,
+        size: int = 5000,
+        prefetch: int = 0,
+        date_range: Optional[DateRange] = None,
+        format: str = "csv",
+        fields: Optional[Sequence[str]] = None,
+        **params: Any,
+    ) -> ResultSet:
+        """
+        Fetch every matching analysis as columns (see ResultSet), parsed from
+        the CSV variant of the endpoint as it is streamed: a smaller download
+        than JSON, and no dict or model is built per record. format="json"
+        turns JSON pages into columns one at a time instead. code_station,
+        date_range, prefetch and fields work as in iter_analyses.
+        """
+        check_fields(AnalysePc, fields or ())
+        params = _analyse_params(code_station, size, params)
+        if date_range is None:
+            params = fields_param(params, fields)
+            return await self._get_table("analyse_pc", params, AnalysePc, format)
+        windows = ANALYSE_PC_WINDOWS
+        params = fields_param(params, fields, *windows.sort_fields)
+        return await self._get_windowed_table(
+            "analyse_pc", params, AnalysePc, windows, date_range, prefetch, format
+        )
+
+    async def get_analyses_normalized(
+        self,
+        code_station: Optional[str] = None,
+        size: int = 5000,
+        prefetch: int = 0,
+        date_range: Optional[DateRange] = None,
+        format: str = "csv",
+        **params: Any,
+    ) -> Normalized:
+        """
+        Fetch every matching analysis as a fact table of ids, dates and
+        results plus deduplicated dimension tables (stations, parameters,
+        units, laboratories, methods, networks); see normalize_analyses.
+        Only the fields these tables hold are downloaded. Arguments work as
+        in get_analyses_table.
+        """
+        table = await self.get_analyses_table(
+            code_station,
+            size,
+            prefetch,
+            date_range,
+            format,
+            fields=ANALYSE_PC_NORMALIZED_FIELDS,
+            **params,
+        )
+        return normalize_analyses(table)
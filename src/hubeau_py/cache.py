@@ -0,0 +1,334 @@
+import asyncio
+import json
+import posixpath
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Mapping, Optional, Tuple, Union
+
+import httpx
+
+DAY = 24 * 3600.0
+
+# Time-to-live in seconds per endpoint, matched against the end of the URL path
+# without its format extension, so "obs_elab" covers "obs_elab.csv" too.
+DEFAULT_TTLS: Mapping[str, float] = {
+    "referentiel/sites": 7 * DAY,
+    "referentiel/stations": 7 * DAY,
+    "station_pc": 7 * DAY,
+    "operation_pc": DAY,
+    "condition_environnementale_pc": DAY,
+    "analyse_pc": DAY,
+    "obs_elab": 3600.0,
+    "observations_tr": 60.0,
+}
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "hubeau_py" / "http_cache.sqlite"
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+# Hub'eau answers 206 for every page of a paginated query but the last.
+CACHEABLE_STATUSES = frozenset({200, 206})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+@dataclass
+class CacheStats:
+    """Counters of an HttpCache.
+
+    `misses` counts cacheable requests forwarded to the server, including
+    conditional ones; `revalidated` counts those answered with 304.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def to_response(self) -> httpx.Response:
+        return httpx.Response(self.status, headers=self.headers, content=self.body)
+
+
+def cache_key(request: httpx.Request) -> str:
+    """Normalized key: method, URL without query, then sorted query parameters."""
+    url = request.url
+    params = sorted(url.params.multi_items())
+    query = "&".join(f"{k}={v}" for k, v in params)
+    return f"{request.method} {url.copy_with(query=None)}?{query}"
+
+
+class HttpCache:
+    """SQLite-backed HTTP response cache with per-endpoint TTLs.
+
+    Responses are keyed on the normalized URL and query parameters, and kept
+    for the TTL of the endpoint they belong to (endpoints without a TTL are
+    not cached). Expired entries carrying an ETag or Last-Modified header are
+    revalidated with a conditional request. Once the stored bodies exceed
+    `max_size` bytes, or the cache holds more than `max_entries` responses,
+    the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_CACHE_PATH,
+        ttls: Mapping[str, float] = DEFAULT_TTLS,
+        default_ttl: float = 0.0,
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Longest endpoint first, so "referentiel/stations" wins over "stations".
+        self.ttls = dict(sorted(ttls.items(), key=lambda kv: -len(kv[0])))
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        # Running totals, so that stores only touch the table to evict.
+        self._entries, self._size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    def ttl_for(self, url: httpx.URL) -> float:
+        path, _ = posixpath.splitext(url.path.rstrip("/"))
+        for endpoint, ttl in self.ttls.items():
+            if path.endswith("/" + endpoint):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._db.commit()
+        status, headers, body, expires_at = row
+        pairs = [(k, v) for k, v in json.loads(headers)]
+        return CachedResponse(status, pairs, body, expires_at)
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        now = time.time()
+        with self._lock:
+            replaced = self._db.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if replaced is not None:
+                self._entries -= 1
+                self._size -= replaced[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.status,
+                    json.dumps(entry.headers),
+                    entry.body,
+                    len(entry.body),
+                    entry.expires_at,
+                    now,
+                ),
+            )
+            self._entries += 1
+            self._size += len(entry.body)
+            self.stats.stores += 1
+            if self._over_limit(self._entries, self._size):
+                self._evict()
+            self._db.commit()
+
+    def refresh(self, key: str, expires_at: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET expires_at = ? WHERE key = ?", (expires_at, key)
+            )
+            self._db.commit()
+
+    def _over_limit(self, entries: int, size: int) -> bool:
+        too_many = self.max_entries is not None and entries > self.max_entries
+        return too_many or size > self.max_size
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until both limits are met."""
+        victims: List[Tuple[str]] = []
+        rows = self._db.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        )
+        for key, size in rows:
+            if not self._over_limit(self._entries, self._size):
+                break
+            victims.append((key,))
+            self._entries -= 1
+            self._size -= size
+        rows.close()
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.stats.evictions += len(victims)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._entries = self._size = 0
+
+    def close(self) -> None:
+        self._db.close()
+
+    def lookup(
+        self, request: httpx.Request
+    ) -> Tuple[Optional[str], Optional[CachedResponse]]:
+        """Return (key, entry) for a cacheable request, else (None, None).
+
+        A fresh entry is a hit. A stale entry with validators is returned too,
+        after turning the request into a conditional one.
+        """
+        if request.method != "GET" or self.ttl_for(request.url) <= 0:
+            return None, None
+        key = cache_key(request)
+        entry = self.get(key)
+        fresh = entry is not None and entry.fresh
+        with self._lock:
+            if fresh:
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+        if fresh:
+            return key, entry
+        if entry is None:
+            return key, None
+        headers = {k.lower(): v for k, v in entry.headers}
+        if "etag" in headers:
+            request.headers["If-None-Match"] = headers["etag"]
+        if "last-modified" in headers:
+            request.headers["If-Modified-Since"] = headers["last-modified"]
+        if "etag" not in headers and "last-modified" not in headers:
+            return key, None
+        return key, entry
+
+    def store(
+        self,
+        key: str,
+        request: httpx.Request,
+        response: httpx.Response,
+        body: bytes,
+    ) -> None:
+        if response.status_code not in CACHEABLE_STATUSES:
+            return
+        expires_at = time.time() + self.ttl_for(request.url)
+        headers = response.headers.multi_items()
+        self.set(key, CachedResponse(response.status_code, headers, body, expires_at))
+
+    def revalidated(self, key: str, request: httpx.Request) -> None:
+        with self._lock:
+            self.stats.revalidated += 1
+        self.refresh(key, time.time() + self.ttl_for(request.url))
+
+
+class CacheTransport(httpx.BaseTransport):
+    """httpx transport answering cacheable GET requests from an HttpCache."""
+
+    def __init__(self, transport: httpx.BaseTransport, cache: HttpCache) -> None:
+        self._transport = transport
+        self._cache = cache
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key, entry = self._cache.lookup(request)
+        if key is None:
+            return self._transport.handle_request(request)
+        if entry is not None and entry.fresh:
+            return entry.to_response()
+        response = self._transport.handle_request(request)
+        if entry is not None and response.status_code == 304:
+            response.close()
+            self._cache.revalidated(key, request)
+            return entry.to_response()
+        if response.status_code not in CACHEABLE_STATUSES:
+            return response
+        # Keep the raw (still content-encoded) bytes alongside their headers.
+        assert isinstance(response.stream, httpx.SyncByteStream)
+        try:
+            body = b"".join(response.stream)
+        finally:
+            response.close()
+        self._cache.store(key, request, response, body)
+        return httpx.Response(
+            response.status_code, headers=response.headers, content=body
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncCacheTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of CacheTransport.
+
+    The SQLite calls run in a worker thread, off the event loop.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: HttpCache) -> None:
+        self._transport = transport
+        self._cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key, entry = await asyncio.to_thread(self._cache.lookup, request)
+        if key is None:
+            return await self._transport.handle_async_request(request)
+        if entry is not None and entry.fresh:
+            return entry.to_response()
+        response = await self._transport.handle_async_request(request)
+        if entry is not None and response.status_code == 304:
+            await response.aclose()
+            await asyncio.to_thread(self._cache.revalidated, key, request)
+            return entry.to_response()
+        if response.status_code not in CACHEABLE_STATUSES:
+            return response
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        try:
+            body = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        await asyncio.to_thread(self._cache.store, key, request, response, body)
+        return httpx.Response(
+            response.status_code, headers=response.headers, content=body
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
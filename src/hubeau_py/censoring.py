@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+from hubeau_py.columnar import ResultSet
+
+# Sandre remark codes (`code_remarque`) of censored analysis results.
+BELOW_DETECTION_CODES = (2,)  # < detection limit
+BELOW_QUANTIFICATION_CODES = (2, 7, 10)  # < quantification limit, traces included
+ABOVE_SATURATION_CODES = (3,)  # > saturation limit
+
+
+@dataclass(frozen=True)
+class Results:
+    """Analysis results as numbers, with their censoring.
+
+    `values` is float64, NaN where a result is missing or not a number. The
+    masks flag results only known to lie below the detection limit, below the
+    quantification limit (which includes below detection) or above the
+    saturation limit; `values` then holds the limit, as the API reports it.
+    """
+
+    values: np.ndarray
+    below_detection: np.ndarray
+    below_quantification: np.ndarray
+    above_saturation: np.ndarray
+
+    @property
+    def censored(self) -> np.ndarray:
+        censored: np.ndarray = self.below_quantification | self.above_saturation
+        return censored
+
+    @property
+    def quantified(self) -> np.ndarray:
+        """Numeric results that are not censored."""
+        quantified: np.ndarray = ~np.isnan(self.values) & ~self.censored
+        return quantified
+
+
+def _numbers(column: Any) -> np.ndarray:
+    """float64 of `column`, NaN for missing values and values not numeric."""
+    try:
+        # Fast path: only numbers, numeric strings and None.
+        return np.array(column, dtype=np.float64)
+    except (TypeError, ValueError):
+        numbers = pd.to_numeric(pd.Series(column, dtype=object), errors="coerce")
+        values: NDArray[np.float64] = numbers.to_numpy(np.float64, copy=True)
+        return values
+
+
+def _parse_results(column: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Numbers of `column`, and where they were written "<x" or ">x".
+
+    Numbers and numeric strings convert in one pass; only the strings left
+    over are retried with a "<" or ">" prefix and a decimal comma removed.
+    """
+    series = pd.Series(column, dtype=object)
+    values = _numbers(column)
+    less = np.zeros(len(series), dtype=bool)
+    more = np.zeros(len(series), dtype=bool)
+    failed = np.flatnonzero(np.isnan(values) & series.notna().to_numpy())
+    if len(failed):
+        # Values other than str give NaN, then False or NaN again, below.
+        text = series.iloc[failed].str.strip()
+        less[failed] = text.str.startswith("<", na=False).to_numpy(dtype=bool)
+        more[failed] = text.str.startswith(">", na=False).to_numpy(dtype=bool)
+        number = text.str.lstrip("<>= ").str.replace(",", ".", regex=False)
+        values[failed] = pd.to_numeric(number, errors="coerce").to_numpy(np.float64)
+    return values, less, more
+
+
+def parse_results(
+    resultat: Any,
+    code_remarque: Any = None,
+    limite_detection: Any = None,
+    limite_quantification: Any = None,
+) -> Results:
+    """Vectorized numbers and censoring masks of analysis result columns.
+
+    A result is censored when its `code_remarque` says so (see the *_CODES
+    constants) or when it is written "<x" / ">x". Results without a remark
+    code are also compared with their detection and quantification limits.
+    """
+    values, less, more = _parse_results(resultat)
+    missing = np.full(len(values), np.nan)
+    codes = missing if code_remarque is None else _numbers(code_remarque)
+    uncoded = np.isnan(codes)
+    detection = missing if limite_detection is None else _numbers(limite_detection)
+    quantification = (
+        missing if limite_quantification is None else _numbers(limite_quantification)
+    )
+    with np.errstate(invalid="ignore"):
+        below_detection = np.isin(codes, BELOW_DETECTION_CODES) | (
+            uncoded & (values < detection)
+        )
+        below_quantification = (
+            np.isin(codes, BELOW_QUANTIFICATION_CODES)
+            | less
+            | below_detection
+            | (uncoded & (values < quantification))
+        )
+    above_saturation = np.isin(codes, ABOVE_SATURATION_CODES) | more
+    return Results(values, below_detection, below_quantification, above_saturation)
+
+
+def analysis_results(table: ResultSet) -> Results:
+    """`parse_results` of the result columns of an analyses table."""
+    return parse_results(
+        table["resultat"],
+        table.columns.get("code_remarque"),
+        table.columns.get("limite_detection"),
+        table.columns.get("limite_quantification"),
+    )
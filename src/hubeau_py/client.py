@@ -1,33 +1,297 @@
-from typing import List
+import asyncio
+from types import TracebackType
+from typing import Any, Dict, Iterable, List, Optional, Self, Tuple, Type, Union
 
-from hubeau_py.api.hydrometrie import HydrometrieAPI
-from hubeau_py.api.qualite_rivieres import QualiteRivieresAPI
+import httpx
+
+from hubeau_py.api.base import DEFAULT_MAX_CONCURRENCY
+from hubeau_py.api.hydrometrie import AsyncHydrometrieAPI, HydrometrieAPI
+from hubeau_py.api.qualite_rivieres import AsyncQualiteRivieresAPI, QualiteRivieresAPI
+from hubeau_py.cache import HttpCache
+from hubeau_py.http import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_TIMEOUT,
+    create_async_client,
+    create_client,
+)
+from hubeau_py.jsonlib import JsonBackend
+from hubeau_py.lookup import (
+    DEFAULT_LOOKUP_SIZE,
+    DEFAULT_LOOKUP_TTL,
+    CodeLookup,
+    LRUCache,
+)
 from hubeau_py.models.hydrometrie import ObsElab, ObservationTr, Site, Station
+from hubeau_py.models.qualite_rivieres import StationPc
+from hubeau_py.ratelimit import AdaptiveRateLimiter
+from hubeau_py.retry import DEFAULT_RETRY_POLICY, RetryPolicy
+from hubeau_py.validation import Validation
+
+
+def _check_injected(
+    client: Optional[Union[httpx.Client, httpx.AsyncClient]],
+    rate_limiter: Optional[AdaptiveRateLimiter],
+    retry: Optional[RetryPolicy],
+    cache: Optional[HttpCache],
+    coalesce_requests: bool,
+) -> None:
+    """Reject transport options that an injected `client` would silently drop."""
+    if client is None:
+        return
+    given = [
+        name
+        for name, value in [
+            ("rate_limiter", rate_limiter is not None),
+            ("retry", retry is not DEFAULT_RETRY_POLICY),
+            ("cache", cache is not None),
+            ("coalesce_requests", not coalesce_requests),
+        ]
+        if value
+    ]
+    if given:
+        raise ValueError(
+            f"{', '.join(given)} only apply to the client built by HubeauClient; "
+            "configure the transport of the injected client instead"
+        )
 
 
 class HubeauClient:
     """Unified client for the Hubeau APIs.
     Access sub-APIs as .qualite_rivieres and .hydrometrie attributes.
+
+    A single pooled httpx.Client is shared by every sub-API so connections are
+    kept alive across calls. Pass `client` to supply your own; otherwise one is
+    built from the pool/timeout options and closed by `close()` or on leaving a
+    `with` block.
+
+    Pass an AdaptiveRateLimiter to throttle every sub-API through one adaptive
+    token bucket; the same limiter may also be given to an AsyncHubeauClient.
+    Idempotent requests are retried with backoff according to `retry` (pass
+    None to disable retries). Pass an HttpCache to keep responses on disk with
+    per-endpoint TTLs. Identical requests issued concurrently (from several
+    threads or coroutines) share one HTTP call unless `coalesce_requests` is
+    False. These four options configure the client built internally: combined
+    with `client`, they raise ValueError. `json_backend` selects the JSON
+    decoder: "json" (default, decodes pages incrementally), "orjson", "msgspec",
+    or "auto" for the fastest one installed. `validation` sets how much
+    pydantic validation records go through: "full" (default), "trusted" or
+    "sampled" (see Validation); each method can override it per call.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.Client] = None,
+        *,
+        timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY_POLICY,
+        cache: Optional[HttpCache] = None,
+        coalesce_requests: bool = True,
+        json_backend: Union[str, JsonBackend] = "json",
+        validation: Union[str, Validation] = "full",
+    ) -> None:
+        _check_injected(client, rate_limiter, retry, cache, coalesce_requests)
+        self._owns_client = client is None
+        if client is None:
+            client = create_client(
+                timeout=timeout,
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                http2=http2,
+                rate_limiter=rate_limiter,
+                retry=retry,
+                cache=cache,
+                coalesce=coalesce_requests,
+            )
+        self.http = client
+        self.qualite_rivieres = QualiteRivieresAPI(self.http, json_backend, validation)
+        self.hydrometrie = HydrometrieAPI(self.http, json_backend, validation)
+
+    def close(self) -> None:
+        if self._owns_client:
+            self.http.close()
+
+    def __enter__(self) -> "HubeauClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class AsyncHubeauClient:
+    """Asyncio counterpart of HubeauClient, built on httpx.AsyncClient.
+
+    Sub-API methods are coroutines returning the same pydantic models as the
+    sync client. A single semaphore shared by all sub-APIs caps the number of
+    requests in flight at `max_concurrency`, so callers can freely fan out with
+    `asyncio.gather` over hundreds of stations. As with HubeauClient,
+    `rate_limiter`, `retry`, `cache` and `coalesce_requests` cannot be combined
+    with an injected `client`.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY_POLICY,
+        cache: Optional[HttpCache] = None,
+        coalesce_requests: bool = True,
+        json_backend: Union[str, JsonBackend] = "json",
+        validation: Union[str, Validation] = "full",
+    ) -> None:
+        _check_injected(client, rate_limiter, retry, cache, coalesce_requests)
+        self._owns_client = client is None
+        if client is None:
+            client = create_async_client(
+                timeout=timeout,
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                http2=http2,
+                rate_limiter=rate_limiter,
+                retry=retry,
+                cache=cache,
+                coalesce=coalesce_requests,
+            )
+        self.http = client
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.qualite_rivieres = AsyncQualiteRivieresAPI(
+            self.http, self.semaphore, json_backend, validation
+        )
+        self.hydrometrie = AsyncHydrometrieAPI(
+            self.http, self.semaphore, json_backend, validation
+        )
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self.http.aclose()
+
+    async def __aenter__(self) -> "AsyncHubeauClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+
+class _SimpleClient:
+    """Base of the convenience wrappers, built on a HubeauClient.
+
+    Without `client`, the HubeauClient builds its own, with the default retry
+    policy and request coalescing, closed by `close()` or on leaving a `with`
+    block.
     """
 
-    def __init__(self) -> None:
-        self.qualite_rivieres = QualiteRivieresAPI()
-        self.hydrometrie = HydrometrieAPI()
+    def __init__(self, client: Optional[httpx.Client] = None) -> None:
+        self.hubeau = HubeauClient(client)
+
+    def close(self) -> None:
+        self.hubeau.close()
+
+    def __enter__(self) -> Self:
+        return self
 
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class SimpleHydrometrieClient(_SimpleClient):
+    """Convenience wrapper over HydrometrieAPI.
+
+    Referentiel lookups (sites and stations) are memoized in memory with LRU
+    eviction and a TTL, so repeated lookups of the same codes or queries do not
+    hit the network again; bulk lookups only fetch the codes not yet cached.
+    """
 
-class SimpleHydrometrieClient:
-    def __init__(self) -> None:
-        self.api = HydrometrieAPI()
+    def __init__(
+        self,
+        client: Optional[httpx.Client] = None,
+        lookup_size: int = DEFAULT_LOOKUP_SIZE,
+        lookup_ttl: float = DEFAULT_LOOKUP_TTL,
+    ) -> None:
+        super().__init__(client)
+        self.api = self.hubeau.hydrometrie
+        self.sites: CodeLookup[Site] = CodeLookup(
+            lambda codes: self.api.iter_sites(code_site=",".join(codes), size=200),
+            lambda site: site.code_site,
+            lookup_size,
+            lookup_ttl,
+        )
+        self.stations: CodeLookup[Station] = CodeLookup(
+            lambda codes: self.api.iter_stations(
+                code_station=",".join(codes), size=200
+            ),
+            lambda station: station.code_station,
+            lookup_size,
+            lookup_ttl,
+        )
+        self._queries: LRUCache[Tuple[str, str, int], List[Any]] = LRUCache(
+            lookup_size, lookup_ttl
+        )
 
     def get_sites_by_department(
         self, code_departement: str, size: int = 10
     ) -> List[Site]:
-        return self.api.get_sites(code_departement=code_departement, size=size)
+        key = ("sites", code_departement, size)
+        hit, sites = self._queries.find(key)
+        if not hit or sites is None:
+            sites = self.api.get_sites(code_departement=code_departement, size=size)
+            self._queries.set(key, sites)
+            self.sites.add(sites)
+        return list(sites)
 
     def get_stations_by_commune(
         self, code_commune: str, size: int = 10
     ) -> List[Station]:
-        return self.api.get_stations(code_commune_station=code_commune, size=size)
+        key = ("stations", code_commune, size)
+        hit, stations = self._queries.find(key)
+        if not hit or stations is None:
+            stations = self.api.get_stations(
+                code_commune_station=code_commune, size=size
+            )
+            self._queries.set(key, stations)
+            self.stations.add(stations)
+        return list(stations)
+
+    def get_site(self, code_site: str) -> Optional[Site]:
+        return self.sites.get(code_site)
+
+    def get_station(self, code_station: str) -> Optional[Station]:
+        return self.stations.get(code_station)
+
+    def get_sites_by_codes(self, codes: Iterable[str]) -> Dict[str, Site]:
+        return self.sites.get_many(codes)
+
+    def get_stations_by_codes(self, codes: Iterable[str]) -> Dict[str, Station]:
+        return self.stations.get_many(codes)
 
     def get_observations_by_station(
         self, code_station: str, size: int = 10
@@ -38,3 +302,30 @@ class SimpleHydrometrieClient:
         self, code_station: str, size: int = 10
     ) -> List[ObsElab]:
         return self.api.get_obs_elab(code_station=code_station, size=size)
+
+
+class SimpleQualiteRivieresClient(_SimpleClient):
+    """Convenience wrapper over QualiteRivieresAPI with memoized station lookups."""
+
+    def __init__(
+        self,
+        client: Optional[httpx.Client] = None,
+        lookup_size: int = DEFAULT_LOOKUP_SIZE,
+        lookup_ttl: float = DEFAULT_LOOKUP_TTL,
+    ) -> None:
+        super().__init__(client)
+        self.api = self.hubeau.qualite_rivieres
+        self.stations: CodeLookup[StationPc] = CodeLookup(
+            lambda codes: self.api.iter_stations(
+                code_station=",".join(codes), size=200
+            ),
+            lambda station: station.code_station,
+            lookup_size,
+            lookup_ttl,
+        )
+
+    def get_station(self, code_station: str) -> Optional[StationPc]:
+        return self.stations.get(code_station)
+
+    def get_stations_by_codes(self, codes: Iterable[str]) -> Dict[str, StationPc]:
+        return self.stations.get_many(codes)
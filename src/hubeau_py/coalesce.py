@@ -0,0 +1,164 @@
+import asyncio
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from hubeau_py.cache import cache_key
+
+
+class _Call:
+    """One in-flight request and the identical requests waiting on it."""
+
+    def __init__(self) -> None:
+        self.waiters = 0
+        self.result: Optional[Tuple[int, httpx.Headers, bytes]] = None
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+        self.async_done = asyncio.Event()
+
+    def set_result(self, response: httpx.Response, body: bytes) -> None:
+        self.result = (response.status_code, response.headers, body)
+
+    @property
+    def abandoned(self) -> bool:
+        """Whether the leader was cancelled or interrupted before answering."""
+        return self.result is None and self.error is None
+
+    def response(self) -> httpx.Response:
+        if self.error is not None:
+            raise self.error
+        assert self.result is not None
+        status, headers, body = self.result
+        return httpx.Response(status, headers=headers, content=body)
+
+
+class _Calls:
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def join(self, key: str) -> Tuple[_Call, bool]:
+        """Return the call for `key` and whether the caller leads it."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def close(self, key: str) -> int:
+        """Stop accepting waiters for `key`; return how many joined."""
+        with self._lock:
+            return self._calls.pop(key).waiters
+
+
+class CoalescingTransport(httpx.BaseTransport):
+    """httpx transport issuing a single request for identical concurrent GETs.
+
+    Requests are keyed on their normalized URL and parameters. While one is in
+    flight, identical requests wait for it and receive a copy of its response
+    (or its error). The body is only buffered when someone is actually
+    waiting; otherwise the leader's response is streamed as usual. If the
+    leading request is interrupted rather than failing, its waiters do not
+    inherit the interruption: one of them sends the request again.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport) -> None:
+        self._transport = transport
+        self._calls = _Calls()
+
+    @property
+    def coalesced(self) -> int:
+        """Number of requests that waited on an identical in-flight request."""
+        return self._calls.coalesced
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return self._transport.handle_request(request)
+        key = cache_key(request)
+        while True:
+            call, leader = self._calls.join(key)
+            if leader:
+                return self._lead(request, key, call)
+            call.done.wait()
+            if not call.abandoned:
+                return call.response()
+
+    def _lead(self, request: httpx.Request, key: str, call: _Call) -> httpx.Response:
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException as exc:
+            if isinstance(exc, Exception):
+                call.error = exc
+            self._calls.close(key)
+            call.done.set()
+            raise
+        if not self._calls.close(key):
+            return response
+        assert isinstance(response.stream, httpx.SyncByteStream)
+        try:
+            call.set_result(response, b"".join(response.stream))
+        except Exception as exc:
+            call.error = exc
+        finally:
+            response.close()
+            call.done.set()
+        return call.response()
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncCoalescingTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of CoalescingTransport."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+        self._calls = _Calls()
+
+    @property
+    def coalesced(self) -> int:
+        return self._calls.coalesced
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self._transport.handle_async_request(request)
+        key = cache_key(request)
+        while True:
+            call, leader = self._calls.join(key)
+            if leader:
+                return await self._lead(request, key, call)
+            await call.async_done.wait()
+            if not call.abandoned:
+                return call.response()
+
+    async def _lead(
+        self, request: httpx.Request, key: str, call: _Call
+    ) -> httpx.Response:
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException as exc:
+            if isinstance(exc, Exception):
+                call.error = exc
+            self._calls.close(key)
+            call.async_done.set()
+            raise
+        if not self._calls.close(key):
+            return response
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        try:
+            body = b"".join([chunk async for chunk in response.stream])
+            call.set_result(response, body)
+        except Exception as exc:
+            call.error = exc
+        finally:
+            await response.aclose()
+            call.async_done.set()
+        return call.response()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,416 @@
+import json
+import types
+from collections import defaultdict
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    cast,
+    get_args,
+    get_origin,
+)
+
+import numpy as np
+import pandas as pd
+import shapely
+from pydantic import BaseModel
+
+from hubeau_py.dates import parse_datetimes
+from hubeau_py.labels import is_label
+
+# Column kinds, derived from the model annotations (see `column_kinds`):
+# numbers are float64 arrays with NaN for missing values, the rest are object
+# arrays holding bool or str values and None for missing values.
+FLOAT = "float"
+BOOL = "bool"
+STR = "str"
+
+_CSV_DTYPES = {FLOAT: "float64", BOOL: "boolean", STR: "object"}
+
+# Response formats of the *_table methods.
+TABLE_FORMATS = ("csv", "geojson", "json")
+
+# A column: a NumPy array, or a pandas Categorical once dictionary-encoded.
+Column = Union[np.ndarray, "pd.Categorical[Any]"]
+
+
+def check_format(format: str) -> str:
+    if format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown format {format!r}, expected one of {TABLE_FORMATS}")
+    return format
+
+
+def _kind(annotation: Any) -> str:
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = set(get_args(annotation)) - {type(None)}
+    else:
+        args = {annotation}
+    if args == {bool}:
+        return BOOL
+    if args and args <= {int, float}:
+        return FLOAT
+    return STR
+
+
+def column_kinds(model: Type[BaseModel]) -> Dict[str, str]:
+    """Column kind of every field of `model`."""
+    return {name: _kind(info.annotation) for name, info in model.model_fields.items()}
+
+
+def _value(value: Any) -> Any:
+    """A cell as in decoded JSON: None for NaN and missing values."""
+    if value is None or value != value:
+        return None
+    return value
+
+
+def _cells(column: Column) -> List[Any]:
+    """Values of `column` as `row` reads them, built in one pass."""
+    if column.dtype.kind == "M":
+        # tolist() would turn datetime64[ns] values into int nanoseconds.
+        return list(column)
+    cells: List[Any] = column.tolist()
+    return cells
+
+
+def _is_geometry(column: Column) -> bool:
+    return isinstance(column, np.ndarray) and bool(shapely.is_geometry(column).any())
+
+
+class ResultSet:
+    """Records stored column by column, one NumPy array per field.
+
+    Columns are read with `rs["field"]` and rows, as dicts, with `rs.row(i)`
+    or `rs.rows()`. `dictionary_encode()` stores repeated strings once, as
+    integer codes into a Categorical. `to_pandas()` builds a DataFrame without
+    copying numeric columns and `to_arrow()` a pyarrow Table.
+    """
+
+    def __init__(self, columns: Dict[str, Column]) -> None:
+        self.columns = columns
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __repr__(self) -> str:
+        return f"<ResultSet {len(self)} rows x {len(self.columns)} columns>"
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Row `index` as a dict, with None for missing values.
+
+        Datetime columns give np.datetime64 values, as `rows` does.
+        """
+        return {name: _value(col[index]) for name, col in self.columns.items()}
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Every row as a dict, as `row` builds them, one at a time."""
+        names = list(self.columns)
+        for values in zip(*(_cells(col) for col in self.columns.values())):
+            yield {name: _value(value) for name, value in zip(names, values)}
+
+    def take(self, indices: np.ndarray) -> "ResultSet":
+        return ResultSet({name: col[indices] for name, col in self.columns.items()})
+
+    def dictionary_encode(self, *names: str) -> "ResultSet":
+        """Result set with the given str columns (all of them by default)
+        dictionary-encoded: each distinct string is stored once and rows hold
+        small integer codes (see `pandas.Categorical`). Missing values read as
+        NaN from the column, and as None from `row` and `rows`.
+        """
+        if not names:
+            names = tuple(
+                name
+                for name, col in self.columns.items()
+                if col.dtype == object
+                and pd.api.types.infer_dtype(col, skipna=True) == "string"
+            )
+        return ResultSet(
+            {
+                name: (
+                    pd.Categorical(col)
+                    if name in names and isinstance(col, np.ndarray)
+                    else col
+                )
+                for name, col in self.columns.items()
+            }
+        )
+
+    def sorted_by(self, *names: str) -> "ResultSet":
+        """Rows sorted by the given columns (missing values first), stably.
+
+        Numeric and datetime columns sort by value, the others as strings.
+        """
+        keys: List[np.ndarray] = []
+        for name in reversed(names):
+            if name in self:
+                keys.extend(_sort_keys(self.columns[name]))
+        if not keys or not len(self):
+            return self
+        return self.take(np.lexsort(keys))
+
+    def parse_dates(self, *names: str) -> "ResultSet":
+        """Result set with the given date columns (every `date_*` one by
+        default) parsed into datetime64[ns] arrays in UTC, NaT when missing.
+
+        Each column is parsed in one vectorized pass (see `parse_datetimes`).
+        A date column with a matching `heure_*` column, as `date_prelevement`
+        and `heure_prelevement`, gets its time of day added in.
+        """
+        if not names:
+            names = tuple(
+                name
+                for name, col in self.columns.items()
+                if name.startswith("date_") and col.dtype.kind != "M"
+            )
+        columns = dict(self.columns)
+        for name in names:
+            times = self.columns.get("heure_" + name.removeprefix("date_"))
+            columns[name] = parse_datetimes(self.columns[name], times)
+        return ResultSet(columns)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """DataFrame of the columns; datetime columns get the UTC time zone."""
+        return pd.DataFrame(
+            {
+                name: (
+                    pd.Series(col, copy=False).dt.tz_localize("UTC")
+                    if col.dtype.kind == "M"
+                    else col
+                )
+                for name, col in self.columns.items()
+            },
+            copy=False,
+        )
+
+    def to_arrow(self) -> Any:
+        """pyarrow Table of the columns, with NaN, NaT and None as nulls.
+
+        Dictionary-encoded columns become dictionary arrays, datetime columns
+        UTC timestamps and shapely geometries WKB binary. Requires pyarrow
+        (the `arrow` extra).
+        """
+        import pyarrow
+
+        arrays = {}
+        for name, col in self.columns.items():
+            if _is_geometry(col):
+                col = shapely.to_wkb(col)
+            kind = pyarrow.timestamp("ns", tz="UTC") if col.dtype.kind == "M" else None
+            arrays[name] = pyarrow.array(col, type=kind, from_pandas=True)
+        return pyarrow.table(arrays)
+
+    def to_geopandas(self) -> Any:
+        """GeoDataFrame (WGS84) of a result set having a `geometry` column."""
+        import geopandas
+
+        return geopandas.GeoDataFrame(
+            self.to_pandas(), geometry="geometry", crs="EPSG:4326"
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["ResultSet"]) -> "ResultSet":
+        """Rows of every part, in order. Columns missing from a part are empty."""
+        filled = [part for part in parts if len(part)]
+        if len(filled) <= 1:
+            return filled[0] if filled else (parts[0] if parts else cls({}))
+        parts = filled
+        names = list(dict.fromkeys(name for part in parts for name in part))
+        columns: Dict[str, Column] = {}
+        for name in names:
+            if any(
+                isinstance(part.columns.get(name), pd.Categorical) for part in parts
+            ):
+                columns[name] = _concat_categorical(
+                    [part.columns.get(name) for part in parts], [len(p) for p in parts]
+                )
+                continue
+            dtype = next(part[name].dtype for part in parts if name in part)
+            columns[name] = np.concatenate(
+                [
+                    part[name] if name in part else _missing(len(part), dtype)
+                    for part in parts
+                ]
+            )
+        return cls(columns)
+
+
+def _sort_keys(column: Column) -> List[np.ndarray]:
+    """`np.lexsort` keys of a column: its values, then whether they are
+    present, the more significant, so that missing values come first."""
+    missing = np.asarray(pd.isna(column))
+    if isinstance(column, np.ndarray) and column.dtype.kind in "biufM":
+        values = column.view(np.int64) if column.dtype.kind == "M" else column
+        return [np.where(missing, 0, values), ~missing]
+    return [np.where(missing, "", column).astype(str), ~missing]
+
+
+def _missing(length: int, dtype: Any) -> np.ndarray:
+    """Column of `length` missing values, for a part lacking a column."""
+    if dtype.kind == "f":
+        return np.full(length, np.nan)
+    if dtype.kind == "M":
+        return np.full(length, np.datetime64("NaT", "ns"), dtype=dtype)
+    return np.full(length, None)
+
+
+def _concat_categorical(
+    columns: Sequence[Optional[Column]], lengths: Sequence[int]
+) -> "pd.Categorical[Any]":
+    """Categorical of `columns` one after the other, None ones being missing."""
+    parts = [
+        (
+            col
+            if isinstance(col, pd.Categorical)
+            else pd.Categorical(np.full(n, None) if col is None else col)
+        )
+        for col, n in zip(columns, lengths)
+    ]
+    categories = pd.Index(
+        np.concatenate([np.asarray(part.categories, dtype=object) for part in parts])
+    ).unique()
+    codes = np.concatenate(
+        [
+            np.where(
+                part.codes < 0, -1, categories.get_indexer(part.categories)[part.codes]
+            )
+            for part in parts
+        ]
+    )
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def code_array(column: Any, missing: int) -> np.ndarray:
+    """Codes of `column` as int16, `missing` where absent or not numeric."""
+    values = pd.to_numeric(pd.Series(column, dtype=object), errors="coerce")
+    array = values.to_numpy(np.float64)
+    return np.where(np.isnan(array), missing, array).astype(np.int16)
+
+
+def _to_array(series: "pd.Series[Any]", kind: str) -> Column:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return cast("pd.Categorical[Any]", series.array)
+    if kind == FLOAT:
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = series.to_numpy(dtype=object, copy=True)
+    values[pd.isna(values)] = None
+    return values
+
+
+def read_csv(source: IO[bytes], model: Type[BaseModel]) -> ResultSet:
+    """Parse a Hub'eau CSV body straight into columns typed after `model`.
+
+    `source` is read in chunks by the pandas C parser, without building a
+    dict or a model per row. Columns unknown to the model are kept as str.
+    Label columns (see `hubeau_py.labels`) are dictionary-encoded as they are
+    parsed, each distinct label being stored once.
+    """
+    kinds: Dict[str, str] = defaultdict(lambda: STR, column_kinds(model))
+    dtypes = defaultdict(
+        lambda: "object",
+        {
+            name: "category" if is_label(name) else _CSV_DTYPES[kind]
+            for name, kind in kinds.items()
+        },
+    )
+    try:
+        frame = pd.read_csv(
+            source, sep=";", dtype=dtypes, keep_default_na=False, na_values=[""]
+        )
+    except pd.errors.EmptyDataError:
+        return ResultSet({})
+    return ResultSet(
+        {str(name): _to_array(frame[name], kinds[str(name)]) for name in frame}
+    )
+
+
+def _column(values: List[Any], kind: str, label: bool = False) -> Column:
+    if kind == FLOAT:
+        try:
+            return np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            series = pd.Series(values, dtype=object)
+            return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    if label and pd.api.types.infer_dtype(column, skipna=True) == "string":
+        return pd.Categorical(column)
+    return column
+
+
+def read_records(
+    records: Sequence[Dict[str, Any]], model: Type[BaseModel]
+) -> ResultSet:
+    """Columns of decoded JSON records, typed after `model` as in `read_csv`.
+
+    Numbers that cannot be parsed become NaN; list values are kept as lists.
+    Label columns of str values are dictionary-encoded, as in `read_csv`.
+    """
+    kinds = column_kinds(model)
+    names = dict.fromkeys(name for record in records for name in record)
+    return ResultSet(
+        {
+            name: _column(
+                [record.get(name) for record in records],
+                kinds.get(name, STR),
+                is_label(name),
+            )
+            for name in names
+        }
+    )
+
+
+def geometry_array(geometries: Sequence[Optional[Dict[str, Any]]]) -> np.ndarray:
+    """Shapely geometries of GeoJSON `geometries`, None where missing.
+
+    Points, the geometry of every station and site, are built in a single
+    vectorized `shapely.points` call; other types go through
+    `shapely.from_geojson`.
+    """
+    coords = np.full((len(geometries), 2), np.nan)
+    others: List[int] = []
+    for i, geometry in enumerate(geometries):
+        if not geometry:
+            continue
+        if geometry.get("type") == "Point":
+            coords[i] = geometry["coordinates"][:2]
+        else:
+            others.append(i)
+    column: np.ndarray = shapely.points(coords)
+    column[np.isnan(coords).any(axis=1)] = None
+    if others:
+        column[others] = shapely.from_geojson(
+            [json.dumps(geometries[i]) for i in others]
+        )
+    return column
+
+
+def read_features(
+    features: Sequence[Dict[str, Any]], model: Type[BaseModel]
+) -> ResultSet:
+    """Columns of GeoJSON features: their properties and a `geometry` column."""
+    table = read_records(
+        [feature.get("properties") or {} for feature in features], model
+    )
+    table.columns["geometry"] = geometry_array(
+        [feature.get("geometry") for feature in features]
+    )
+    return table
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+# Distinct date strings remembered by `parse_datetime`. Records of a station
+# share few dates, so a bounded cache avoids parsing the same string again.
+CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(value: str, time: Optional[str]) -> datetime:
+    parsed = datetime.fromisoformat(f"{value}T{time}" if time else value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_datetime(
+    value: Optional[str], time: Optional[str] = None
+) -> Optional[datetime]:
+    """UTC datetime of a Hub'eau date string, None if `value` is None.
+
+    `value` is an ISO 8601 date ("2024-01-31") or datetime; `time` is an
+    optional time of day ("10:30:00") completing a date, as in
+    `date_prelevement` and `heure_prelevement`. Results are memoized, so
+    parsing the dates of many records of the same days is cheap. Raises
+    ValueError for a malformed string.
+    """
+    if value is None:
+        return None
+    return _parse(value, time)
+
+
+def parse_datetimes(values: Any, times: Any = None) -> np.ndarray:
+    """Dates of `values` (and times of day of `times`) as datetime64[ns] UTC.
+
+    Parses a whole column in one vectorized pass over its distinct strings,
+    which records share a lot of. Missing or malformed values become NaT;
+    missing times count as midnight.
+    """
+    column = pd.Series(values, dtype=object)
+    if times is not None:
+        joined = column.str.cat(pd.Series(times, dtype=object), sep="T")
+        column = joined.fillna(column)
+    codes, uniques = pd.factorize(column)
+    parsed = pd.to_datetime(
+        pd.Series(uniques, dtype=object), utc=True, format="ISO8601", errors="coerce"
+    )
+    naive = parsed.dt.tz_localize(None).to_numpy().astype("datetime64[ns]")
+    # Code -1 (a missing value) takes the NaT appended last.
+    dates: np.ndarray = np.append(naive, np.datetime64("NaT", "ns"))[codes]
+    return dates
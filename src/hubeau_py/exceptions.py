@@ -0,0 +1,22 @@
+class PaginationError(Exception):
+    """A page could not be fetched while iterating over a paginated result.
+
+    `resume_from` is the full URL of the failed page. Passing it back as the
+    `resume_from` argument of the same `iter_*` method restarts iteration at
+    that exact page, without refetching or losing the pages already consumed.
+    """
+
+    def __init__(self, resume_from: str, cause: Exception) -> None:
+        super().__init__(f"Failed to fetch {resume_from}: {cause}")
+        self.resume_from = resume_from
+        self.cause = cause
+
+
+class DepthLimitWarning(UserWarning):
+    """Records of a query lie beyond the API result-depth limit.
+
+    Issued when a query (or a date window that cannot be split any further)
+    matches more records than can be paginated: only the first ones are
+    fetched. Turn it into an error with `warnings.simplefilter("error",
+    DepthLimitWarning)` to never get an incomplete result.
+    """
@@ -0,0 +1,88 @@
+from typing import Optional, Union
+
+import httpx
+
+from hubeau_py.cache import AsyncCacheTransport, CacheTransport, HttpCache
+from hubeau_py.coalesce import AsyncCoalescingTransport, CoalescingTransport
+from hubeau_py.ratelimit import (
+    AdaptiveRateLimiter,
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+)
+from hubeau_py.retry import AsyncRetryTransport, RetryPolicy, RetryTransport
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+def _limits(
+    max_connections: int, max_keepalive_connections: int, keepalive_expiry: float
+) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+
+def create_client(
+    timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = False,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    retry: Optional[RetryPolicy] = None,
+    cache: Optional[HttpCache] = None,
+    coalesce: bool = False,
+) -> httpx.Client:
+    """Build a pooled, keep-alive httpx.Client suited to the Hubeau APIs.
+
+    HTTP/2 requires the optional `h2` package (`pip install hubeau-py[http2]`).
+    If `rate_limiter` is given, every request goes through it. If `retry` is
+    given, failed requests are retried, each attempt going through the limiter.
+    With `coalesce`, identical concurrent GETs share a single request.
+    If `cache` is given, cached responses are served before any of the above.
+    """
+    transport: httpx.BaseTransport = httpx.HTTPTransport(
+        limits=_limits(max_connections, max_keepalive_connections, keepalive_expiry),
+        http2=http2,
+    )
+    if rate_limiter is not None:
+        transport = RateLimitedTransport(transport, rate_limiter)
+    if retry is not None:
+        transport = RetryTransport(transport, retry)
+    if coalesce:
+        transport = CoalescingTransport(transport)
+    if cache is not None:
+        transport = CacheTransport(transport, cache)
+    return httpx.Client(timeout=timeout, transport=transport)
+
+
+def create_async_client(
+    timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = False,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    retry: Optional[RetryPolicy] = None,
+    cache: Optional[HttpCache] = None,
+    coalesce: bool = False,
+) -> httpx.AsyncClient:
+    """Async counterpart of `create_client`."""
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+        limits=_limits(max_connections, max_keepalive_connections, keepalive_expiry),
+        http2=http2,
+    )
+    if rate_limiter is not None:
+        transport = AsyncRateLimitedTransport(transport, rate_limiter)
+    if retry is not None:
+        transport = AsyncRetryTransport(transport, retry)
+    if coalesce:
+        transport = AsyncCoalescingTransport(transport)
+    if cache is not None:
+        transport = AsyncCacheTransport(transport, cache)
+    return httpx.AsyncClient(timeout=timeout, transport=transport)
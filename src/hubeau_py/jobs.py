@@ -0,0 +1,233 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from hubeau_py.api.base import BaseAPI
+from hubeau_py.exceptions import PaginationError
+from hubeau_py.jsonlib import JsonBackend, get_backend
+from hubeau_py.parallel import ordered_map
+from hubeau_py.sharding import DateRange, DateWindows
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One unit of a job: a query on an endpoint of a sub-API.
+
+    `id` must be unique within the job and stable across runs, since it is
+    the key under which progress is recorded in the manifest.
+    """
+
+    id: str
+    path: str
+    params: Dict[str, Any]
+
+
+def station_window_shards(
+    path: str,
+    codes: Iterable[str],
+    windows: DateWindows,
+    date_ranges: Sequence[DateRange],
+    code_param: str = "code_station",
+    **params: Any,
+) -> List[Shard]:
+    """One shard per station code and date range, e.g. per station and year.
+
+    Each date range should hold few enough records to be paginated in full
+    (see `hubeau_py.api.base.MAX_RESULT_DEPTH`).
+    """
+    shards: List[Shard] = []
+    for code in codes:
+        for date_range in date_ranges:
+            window = windows.bounds(date_range)
+            start, end = (windows.format(d) for d in window)
+            shard_params = windows.params({**params, code_param: code}, window)
+            shards.append(Shard(f"{code}_{start}_{end}", path, shard_params))
+    return shards
+
+
+@dataclass
+class JobReport:
+    """Outcome of one `Job.run`."""
+
+    completed: int = 0
+    skipped: int = 0
+    records: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+class Manifest:
+    """Progress of a job: a JSON snapshot and an append-only log of changes.
+
+    For each shard it records a status, the number of records delivered and,
+    while in progress, the URL of the next page to fetch. Each change of a
+    shard is appended to `<path>.log` as one JSON line (see `record`), so
+    checkpointing a page costs the same however many shards the job has.
+    `save` folds the log into the snapshot, replaced atomically, and empties
+    it. Loading replays the log over the snapshot; a line cut short by a
+    crash is ignored.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.shards: Dict[str, Dict[str, Any]] = {}
+        self._log: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self.shards = json.loads(self.path.read_text(encoding="utf-8"))["shards"]
+        if self.log_path.exists():
+            for line in self.log_path.read_text(encoding="utf-8").splitlines():
+                try:
+                    change = json.loads(line)
+                except ValueError:
+                    continue
+                self.shards[change.pop("id")] = change
+
+    def state(self, shard_id: str) -> Dict[str, Any]:
+        return self.shards.setdefault(
+            shard_id, {"status": PENDING, "next": None, "records": 0}
+        )
+
+    def record(self, shard_id: str) -> None:
+        """Append the current state of `shard_id` to the log."""
+        line = json.dumps({"id": shard_id, **self.shards[shard_id]}) + "\n"
+        with self._lock:
+            if self._log is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._log = open(self.log_path, "a", encoding="utf-8")
+            self._log.write(line)
+            self._log.flush()
+
+    def save(self) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps({"shards": self.shards}), encoding="utf-8")
+            os.replace(tmp, self.path)
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            self.log_path.unlink(missing_ok=True)
+
+
+class Job:
+    """Resumable bulk extraction over a list of shards.
+
+    Every page of every shard is handed to `sink(shard, records)`, then the
+    manifest records the URL of the shard's next page. Running the job again
+    skips completed shards and resumes the others at the page they stopped
+    at, so an interrupted extraction never restarts from zero.
+
+    Delivery is at least once: if the process dies between `sink` returning
+    and the manifest recording the page, that page is delivered again on
+    resume. Sink calls are serialized, so the sink need not be thread-safe.
+    """
+
+    def __init__(
+        self,
+        api: BaseAPI,
+        shards: Sequence[Shard],
+        manifest: Union[str, Path, Manifest],
+        sink: Callable[[Shard, List[Dict[str, Any]]], None],
+    ) -> None:
+        self.api = api
+        self.shards = shards
+        self.manifest = (
+            manifest if isinstance(manifest, Manifest) else Manifest(manifest)
+        )
+        self.sink = sink
+        self._lock = threading.Lock()
+
+    def run(self, workers: int = 0) -> JobReport:
+        """Run the unfinished shards, `workers` of them concurrently.
+
+        A shard that fails (a page still failing after retries, a page that
+        cannot be decoded, an error of the sink) is marked failed and kept
+        resumable; the other shards carry on.
+        """
+        report = JobReport()
+        todo: List[Shard] = []
+        for shard in self.shards:
+            if self.manifest.state(shard.id)["status"] == DONE:
+                report.skipped += 1
+            else:
+                todo.append(shard)
+        try:
+            results = ordered_map(self._run_shard, todo, workers)
+            for shard, (records, error) in zip(todo, results):
+                report.records += records
+                if error is None:
+                    report.completed += 1
+                else:
+                    report.failed[shard.id] = error
+        finally:
+            self.manifest.save()
+        return report
+
+    def _run_shard(self, shard: Shard) -> Tuple[int, Optional[str]]:
+        """Run `shard` to completion; return (records delivered, error)."""
+        records = 0
+        state = self.manifest.state(shard.id)
+        try:
+            for payload in self.api.iter_pages(
+                shard.path, shard.params, resume_from=state["next"]
+            ):
+                data = payload.get("data") or []
+                if data:
+                    with self._lock:
+                        self.sink(shard, data)
+                records += len(data)
+                state["records"] += len(data)
+                state["next"] = payload.get("next") if data else None
+                self.manifest.record(shard.id)
+        except Exception as exc:
+            # The page that failed, if any, is fetched again on resume.
+            if isinstance(exc, PaginationError):
+                state["next"] = exc.resume_from
+            state["status"] = FAILED
+            self.manifest.record(shard.id)
+            return records, f"{type(exc).__name__}: {exc}"
+        state["status"] = DONE
+        state["next"] = None
+        self.manifest.record(shard.id)
+        return records, None
+
+
+class JsonlSink:
+    """Sink appending the records of each shard to `<directory>/<shard id>.jsonl`."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        json_backend: Union[str, JsonBackend] = "json",
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._json = get_backend(json_backend)
+
+    def path(self, shard: Shard) -> Path:
+        return self.directory / f"{shard.id}.jsonl"
+
+    def __call__(self, shard: Shard, records: List[Dict[str, Any]]) -> None:
+        with open(self.path(shard), "ab") as f:
+            f.writelines(self._json.dumps(record) + b"\n" for record in records)
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,82 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Union
+
+# Backends tried, in order, by get_backend("auto").
+FAST_BACKENDS = ("orjson", "msgspec")
+
+
+@dataclass(frozen=True)
+class JsonBackend:
+    """A JSON implementation: `loads` accepts bytes or str, `dumps` returns bytes.
+
+    Only the stdlib backend can decode page items incrementally (see
+    `hubeau_py.streaming`); with the others, each page is buffered and decoded
+    in one call, which is faster but holds a whole page in memory.
+    """
+
+    name: str
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps: Callable[..., bytes]
+    incremental: bool = False
+
+
+def _stdlib_dumps(obj: Any, indent: bool = False) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode()
+
+
+def _orjson() -> JsonBackend:
+    import orjson
+
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+
+    return JsonBackend("orjson", orjson.loads, dumps)
+
+
+def _msgspec() -> JsonBackend:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        data: bytes = encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    return JsonBackend("msgspec", msgspec.json.decode, dumps)
+
+
+STDLIB = JsonBackend("json", json.loads, _stdlib_dumps, incremental=True)
+
+_FACTORIES: Dict[str, Callable[[], JsonBackend]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+}
+
+
+def get_backend(name: Union[str, JsonBackend] = "json") -> JsonBackend:
+    """Return the backend called `name`.
+
+    "auto" picks the first installed of FAST_BACKENDS, falling back to the
+    standard library. Asking for a backend that is not installed is an error.
+    """
+    if isinstance(name, JsonBackend):
+        return name
+    if name == "json":
+        return STDLIB
+    if name == "auto":
+        for candidate in FAST_BACKENDS:
+            try:
+                return _FACTORIES[candidate]()
+            except ImportError:
+                continue
+        return STDLIB
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown JSON backend {name!r}")
+    try:
+        return _FACTORIES[name]()
+    except ImportError as exc:
+        raise ValueError(
+            f"JSON backend {name!r} is not installed (pip install {name})"
+        ) from exc
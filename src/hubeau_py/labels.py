@@ -0,0 +1,42 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple, Type
+
+from pydantic import BaseModel
+
+# Fields holding labels repeated across records (parameter, unit, laboratory,
+# network names, URIs, ...), recognized by name.
+LABEL_PREFIXES = ("libelle_", "nom_", "uri_", "symbole_", "mnemo_")
+
+
+def is_label(name: str) -> bool:
+    return name.startswith(LABEL_PREFIXES)
+
+
+@lru_cache(maxsize=None)
+def label_fields(model: Type[BaseModel]) -> Tuple[str, ...]:
+    """Label fields of `model`."""
+    return tuple(name for name in model.model_fields if is_label(name))
+
+
+def interner(names: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Function replacing, in place, the label strings of a decoded item by
+    equal strings shared with every item it saw before.
+
+    Decoding builds a new string for every value, so a page of analyses holds
+    as many copies of "Nitrates" as it has nitrate analyses; interned, they
+    all reference one. The strings are shared through a dict owned by the
+    function, rather than `sys.intern`, so they are freed with the records.
+    """
+    shared: Dict[str, str] = {}
+    share = shared.setdefault
+
+    def intern(item: Dict[str, Any]) -> Dict[str, Any]:
+        for name in names:
+            value = item.get(name)
+            if type(value) is str:
+                item[name] = share(value, value)
+            elif type(value) is list:
+                item[name] = [share(v, v) if type(v) is str else v for v in value]
+        return item
+
+    return intern
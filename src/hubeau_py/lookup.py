@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
+
+DEFAULT_LOOKUP_TTL = 6 * 3600.0
+DEFAULT_LOOKUP_SIZE = 50_000
+
+# Hubeau accepts up to 200 comma-separated values for code filters.
+MAX_CODES_PER_REQUEST = 200
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe in-memory mapping with LRU eviction and a time-to-live."""
+
+    def __init__(
+        self, maxsize: int = DEFAULT_LOOKUP_SIZE, ttl: float = DEFAULT_LOOKUP_TTL
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def find(self, key: K) -> Tuple[bool, Optional[V]]:
+        """Return (True, value) for a live entry, else (False, None)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, item[1]
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CodeLookup(Generic[T]):
+    """Memoizing lookup of referentiel records by code.
+
+    `fetch` receives a batch of codes and returns the matching records; `key`
+    extracts the code of a record. Only codes missing from the cache are ever
+    fetched, in batches of `batch_size`. Codes the API does not know about are
+    remembered too, so they are not requested again until they expire.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Iterable[T]],
+        key: Callable[[T], Optional[str]],
+        maxsize: int = DEFAULT_LOOKUP_SIZE,
+        ttl: float = DEFAULT_LOOKUP_TTL,
+        batch_size: int = MAX_CODES_PER_REQUEST,
+    ) -> None:
+        self.cache: LRUCache[str, Optional[T]] = LRUCache(maxsize, ttl)
+        self._fetch = fetch
+        self._key = key
+        self._batch_size = batch_size
+
+    def add(self, records: Iterable[T]) -> None:
+        """Seed the cache with records obtained elsewhere."""
+        for record in records:
+            code = self._key(record)
+            if code is not None:
+                self.cache.set(code, record)
+
+    def get(self, code: str) -> Optional[T]:
+        return self.get_many([code]).get(code)
+
+    def get_many(self, codes: Iterable[str]) -> Dict[str, T]:
+        found: Dict[str, T] = {}
+        missing: List[str] = []
+        for code in dict.fromkeys(codes):
+            hit, record = self.cache.find(code)
+            if not hit:
+                missing.append(code)
+            elif record is not None:
+                found[code] = record
+        for start in range(0, len(missing), self._batch_size):
+            batch = missing[start : start + self._batch_size]
+            fetched = {self._key(r): r for r in self._fetch(batch)}
+            for code in batch:
+                record = fetched.get(code)
+                self.cache.set(code, record)
+                if record is not None:
+                    found[code] = record
+        return found
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Type, Union
 
 from pydantic import BaseModel
 
@@ -72,6 +72,37 @@ Geometry = Union[
 ]
 
 
+GEOMETRY_TYPES: Dict[str, Type[BaseModel]] = {
+    cls.__name__: cls
+    for cls in (
+        Point,
+        MultiPoint,
+        LineString,
+        MultiLineString,
+        Polygon,
+        MultiPolygon,
+        GeometryCollection,
+    )
+}
+
+
+def construct_geometry(raw: Any) -> Any:
+    """Geometry model for a decoded GeoJSON geometry, built without validation.
+
+    The class is picked from the `type` member; anything that is not a known
+    geometry is returned as is.
+    """
+    if not isinstance(raw, dict):
+        return raw
+    cls = GEOMETRY_TYPES.get(str(raw.get("type")))
+    if cls is None:
+        return raw
+    if cls is GeometryCollection:
+        geometries = [construct_geometry(g) for g in raw.get("geometries") or []]
+        return cls.model_construct(**{**raw, "geometries": geometries})
+    return cls.model_construct(**raw)
+
+
 class Feature(BaseModel):
     type: str  # "Feature"
     bbox: Optional[List[float]] = None
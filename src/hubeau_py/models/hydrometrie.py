@@ -1,7 +1,10 @@
+from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel
 
+from hubeau_py.dates import parse_datetime
+
 
 class Site(BaseModel):
     altitude_site: Optional[float] = None
@@ -40,6 +43,11 @@ class Site(BaseModel):
     type_site: str
     uri_cours_eau: str
 
+    @property
+    def datetime_maj_site(self) -> Optional[datetime]:
+        """UTC datetime of `date_maj_site`."""
+        return parse_datetime(self.date_maj_site)
+
 
 class Station(BaseModel):
     altitude_ref_alti_station: Optional[float] = None
@@ -82,6 +90,16 @@ class Station(BaseModel):
     type_station: str
     uri_cours_eau: str
 
+    @property
+    def datetime_maj_station(self) -> Optional[datetime]:
+        """UTC datetime of `date_maj_station`."""
+        return parse_datetime(self.date_maj_station)
+
+    @property
+    def datetime_maj_ref_alti_station(self) -> Optional[datetime]:
+        """UTC datetime of `date_maj_ref_alti_station`."""
+        return parse_datetime(self.date_maj_ref_alti_station)
+
 
 class ObservationTr(BaseModel):
     code_continuite: Optional[int] = None  # Adjust if sometimes string
@@ -103,6 +121,11 @@ class ObservationTr(BaseModel):
     longitude: Optional[float] = None
     resultat_obs: Optional[float] = None  # or int, depending on data
 
+    @property
+    def datetime_obs(self) -> Optional[datetime]:
+        """UTC datetime of `date_obs`."""
+        return parse_datetime(self.date_obs)
+
 
 class ObsElab(BaseModel):
     code_methode: Optional[int] = None
@@ -119,3 +142,8 @@ class ObsElab(BaseModel):
     libelle_statut: Optional[str] = None
     longitude: Optional[float] = None
     resultat_obs_elab: Optional[float] = None  # or int, depending on the data
+
+    @property
+    def datetime_obs_elab(self) -> Optional[datetime]:
+        """UTC datetime (midnight) of the day `date_obs_elab`."""
+        return parse_datetime(self.date_obs_elab)
@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import Generic, List, Optional, TypeVar, Union
 
 from pydantic import BaseModel
 
+from hubeau_py.dates import parse_datetime
 from hubeau_py.models.geojson import Geometry
 
 T = TypeVar("T")
@@ -95,6 +97,16 @@ class AnalysePc(BaseModel):
     code_banque_reference: Optional[str] = None
     geometry: Optional[Geometry] = None  # Use GeoJSON type, forward ref if needed
 
+    @property
+    def datetime_prelevement(self) -> Optional[datetime]:
+        """UTC datetime of `date_prelevement` and `heure_prelevement`."""
+        return parse_datetime(self.date_prelevement, self.heure_prelevement)
+
+    @property
+    def datetime_maj_analyse(self) -> Optional[datetime]:
+        """UTC datetime of `date_maj_analyse`."""
+        return parse_datetime(self.date_maj_analyse)
+
 
 class ConditionEnvironnementalePc(BaseModel):
     code_station: Optional[str] = None
@@ -142,6 +154,11 @@ class ConditionEnvironnementalePc(BaseModel):
     date_maj: Optional[str] = None
     geometry: Optional[Geometry] = None  # Use GeoJSON type, forward ref if needed
 
+    @property
+    def datetime_maj(self) -> Optional[datetime]:
+        """UTC datetime of `date_maj`."""
+        return parse_datetime(self.date_maj)
+
 
 class OperationPc(BaseModel):
     code_station: Optional[str] = None
@@ -236,6 +253,11 @@ class StationPc(BaseModel):
     superficie_bassin_versant_topo: Optional[float] = None
     geometry: Optional["Geometry"] = None  # Use GeoJSON type, forward ref if needed
 
+    @property
+    def datetime_maj_information(self) -> Optional[datetime]:
+        """UTC datetime of `date_maj_information`."""
+        return parse_datetime(self.date_maj_information)
+
 
 # --- Envelope Aliases ---
 JsonAnalysePc = HubeauEnvelope[AnalysePc]
@@ -0,0 +1,184 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from hubeau_py.censoring import analysis_results
+from hubeau_py.columnar import ResultSet, code_array
+from hubeau_py.dates import parse_datetimes
+
+# Id of a missing dimension member in fact and link tables.
+MISSING_ID = -1
+
+
+@dataclass(frozen=True)
+class Dimension:
+    """Fields of the records describing one kind of entity.
+
+    Members are identified by the `key` code and described by `fields`. The
+    fact table refers to them by id in its `column`. A dimension with `many`
+    members per record (lists of codes, like networks) is referred to from a
+    link table instead.
+    """
+
+    table: str
+    column: str
+    key: str
+    fields: Tuple[str, ...]
+    many: bool = False
+
+
+ANALYSE_PC_DIMENSIONS = (
+    Dimension(
+        "stations",
+        "station",
+        "code_station",
+        ("libelle_station", "uri_station", "longitude", "latitude"),
+    ),
+    Dimension(
+        "parameters",
+        "parameter",
+        "code_parametre",
+        ("libelle_parametre", "uri_parametre"),
+    ),
+    Dimension("units", "unit", "code_unite", ("symbole_unite", "uri_unite")),
+    Dimension(
+        "laboratories",
+        "laboratory",
+        "code_laboratoire",
+        ("nom_laboratoire", "uri_laboratoire"),
+    ),
+    Dimension(
+        "methods",
+        "method",
+        "code_methode_analyse",
+        ("nom_methode_analyse", "uri_methode_analyse"),
+    ),
+    Dimension("networks", "network", "code_reseau", ("nom_reseau",), many=True),
+)
+
+# Measurement fields of the analyses fact table.
+ANALYSE_PC_FACTS = (
+    "date_prelevement",
+    "heure_prelevement",
+    "resultat",
+    "code_remarque",
+    "limite_detection",
+    "limite_quantification",
+)
+
+# Every field read by `normalize_analyses`, to pass as `fields=`.
+ANALYSE_PC_NORMALIZED_FIELDS = tuple(
+    dict.fromkeys(
+        [
+            *(f for d in ANALYSE_PC_DIMENSIONS for f in (d.key, *d.fields)),
+            *ANALYSE_PC_FACTS,
+        ]
+    )
+)
+
+
+@dataclass(frozen=True)
+class Normalized:
+    """Records split into a fact table and deduplicated dimension tables.
+
+    Fact columns named after a dimension hold row numbers into that dimension
+    table (MISSING_ID when missing). `links` maps a many-valued dimension to
+    a table of (`fact`, member id) pairs.
+    """
+
+    facts: ResultSet
+    dimensions: Dict[str, ResultSet]
+    links: Dict[str, ResultSet]
+
+
+def _ids(codes: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Id of each code (in order of first appearance) and the row of the
+    first occurrence of each id."""
+    ids, _ = pd.factorize(pd.Series(codes, dtype=object))
+    present = np.flatnonzero(ids >= 0)
+    _, first = np.unique(ids[present], return_index=True)
+    return ids.astype(np.int32), present[first]
+
+
+def _dimension(table: ResultSet, dimension: Dimension) -> Tuple[np.ndarray, ResultSet]:
+    ids, first = _ids(table[dimension.key])
+    names = [name for name in (dimension.key, *dimension.fields) if name in table]
+    members = ResultSet({name: table[name] for name in names}).take(first)
+    return ids, members
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None or value != value:
+        return []
+    if isinstance(value, str):
+        # A list read from a CSV body is a single comma-separated string.
+        return value.split(",")
+    return list(value)
+
+
+def _many(table: ResultSet, dimension: Dimension) -> Tuple[ResultSet, ResultSet]:
+    facts: List[int] = []
+    codes: List[Any] = []
+    attributes: Dict[str, List[Any]] = {name: [] for name in dimension.fields}
+    lists = {name: table[name].tolist() for name in dimension.fields if name in table}
+    for row, value in enumerate(table[dimension.key].tolist()):
+        members = _as_list(value)
+        facts.extend([row] * len(members))
+        codes.extend(members)
+        for name in dimension.fields:
+            found = _as_list(lists[name][row]) if name in lists else []
+            # Labels only line up with codes when there is one per code.
+            attributes[name].extend(
+                found if len(found) == len(members) else [None] * len(members)
+            )
+    exploded = ResultSet(
+        {
+            dimension.key: np.array(codes, dtype=object),
+            **{
+                name: np.array(values, dtype=object)
+                for name, values in attributes.items()
+            },
+        }
+    )
+    ids, first = _ids(exploded[dimension.key])
+    link = ResultSet({"fact": np.array(facts, dtype=np.int32), dimension.column: ids})
+    return link, exploded.take(first)
+
+
+def normalize_analyses(table: ResultSet) -> Normalized:
+    """Split analyses into facts and dimensions (see ANALYSE_PC_DIMENSIONS).
+
+    The fact table has one row per analysis: the id of its station,
+    parameter, unit, laboratory and method, its sampling `datetime`
+    (datetime64 UTC), its `resultat` as float64 (NaN when not numeric) with
+    its censoring masks (see `analysis_results`) and its `code_remarque` as
+    int16. Networks, several per analysis, go to the `networks` link table.
+    """
+    facts: Dict[str, Any] = {}
+    dimensions: Dict[str, ResultSet] = {}
+    links: Dict[str, ResultSet] = {}
+    for dimension in ANALYSE_PC_DIMENSIONS:
+        if dimension.key not in table:
+            continue
+        if dimension.many:
+            links[dimension.table], dimensions[dimension.table] = _many(
+                table, dimension
+            )
+        else:
+            facts[dimension.column], dimensions[dimension.table] = _dimension(
+                table, dimension
+            )
+    if "date_prelevement" in table:
+        facts["datetime"] = parse_datetimes(
+            table["date_prelevement"], table.columns.get("heure_prelevement")
+        )
+    if "resultat" in table:
+        results = analysis_results(table)
+        facts["resultat"] = results.values
+        facts["below_quantification"] = results.below_quantification
+        facts["above_saturation"] = results.above_saturation
+    if "code_remarque" in table:
+        facts["code_remarque"] = code_array(table["code_remarque"], MISSING_ID)
+    return Normalized(ResultSet(facts), dimensions, links)
@@ -0,0 +1,67 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_map(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int
+) -> Iterator[R]:
+    """Like `map`, running up to `max_workers` calls ahead in threads.
+
+    Results are yielded in input order, and at most `max_workers` results are
+    pending at any time. Stopping the iteration cancels the calls not started.
+    With `max_workers < 1`, calls are made one by one in the calling thread.
+    """
+    if max_workers < 1:
+        yield from map(func, items)
+        return
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    remaining = iter(items)
+    pending: Deque[Future[R]] = deque()
+    try:
+        for item in islice(remaining, max_workers):
+            pending.append(pool.submit(func, item))
+        while pending:
+            result = pending.popleft().result()
+            for item in islice(remaining, 1):
+                pending.append(pool.submit(func, item))
+            yield result
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def async_ordered_map(
+    func: Callable[[T], Awaitable[R]], items: Iterable[T], max_workers: int
+) -> AsyncIterator[R]:
+    """Async counterpart of `ordered_map`, running calls as tasks."""
+    max_workers = max(max_workers, 1)
+    remaining = iter(items)
+    pending: Deque[asyncio.Task[R]] = deque()
+
+    async def call(item: T) -> R:
+        return await func(item)
+
+    try:
+        for item in islice(remaining, max_workers):
+            pending.append(asyncio.create_task(call(item)))
+        while pending:
+            result = await pending.popleft()
+            for item in islice(remaining, 1):
+                pending.append(asyncio.create_task(call(item)))
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,76 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple, Type, TypeVar, cast
+
+from pydantic import BaseModel, create_model
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def check_fields(model: Type[BaseModel], fields: Sequence[str]) -> None:
+    unknown = [name for name in fields if name not in model.model_fields]
+    if unknown:
+        raise ValueError(f"{model.__name__} has no field(s) {', '.join(unknown)}")
+
+
+def _restore(
+    model: Type[BaseModel], fields: Tuple[str, ...], state: Dict[str, Any]
+) -> BaseModel:
+    """Unpickle a record of `project(model, fields)`."""
+    cls = _projection(model, fields)
+    record = cls.__new__(cls)
+    record.__setstate__(state)
+    return record
+
+
+def _reduce(self: BaseModel) -> Tuple[Any, ...]:
+    # Projections are built at run time, so they cannot be pickled by name:
+    # records are pickled as their model and fields, to project them again.
+    model, fields = self.__class__.__projection__  # type: ignore[attr-defined]
+    return _restore, (model, fields, self.__getstate__())
+
+
+@lru_cache(maxsize=None)
+def _projection(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    overrides: Dict[str, Any] = {
+        name: (Optional[info.annotation], None)
+        for name, info in model.model_fields.items()
+        if name not in fields
+    }
+    name = f"{model.__name__}Projection"
+    projected: Type[BaseModel] = create_model(
+        name, __base__=model, __module__=model.__module__, **overrides
+    )
+    projected.__qualname__ = f"{model.__qualname__}Projection"
+    setattr(projected, "__projection__", (model, fields))
+    setattr(projected, "__reduce__", _reduce)
+    return projected
+
+
+def project(model: Type[M], fields: Optional[Sequence[str]]) -> Type[M]:
+    """Subclass of `model` for records holding only `fields`.
+
+    The selected fields keep their type and validation; every other field
+    becomes optional and defaults to None, so records fetched with the Hub'eau
+    `fields` parameter validate even when the full model has required fields.
+    Instances are still instances of `model`, of a class named after it
+    (`SiteProjection`), and can be pickled. Projections are cached, so
+    repeated calls with the same fields return the same class.
+    """
+    if not fields:
+        return model
+    check_fields(model, fields)
+    return cast(Type[M], _projection(model, tuple(sorted(set(fields)))))
+
+
+def fields_param(
+    params: Dict[str, Any], fields: Optional[Sequence[str]], *required: str
+) -> Dict[str, Any]:
+    """`params` with the Hub'eau `fields` parameter selecting `fields`.
+
+    Fields in `required` are always selected (e.g. the code used to
+    deduplicate records), whether or not the caller asked for them.
+    """
+    if not fields:
+        return params
+    selected = dict.fromkeys([*fields, *required])
+    return {**params, "fields": ",".join(selected)}
@@ -0,0 +1,254 @@
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Iterator, Optional
+
+import httpx
+
+# Poll interval used while waiting for a free concurrency slot.
+_SLOT_POLL_INTERVAL = 0.01
+
+
+class AdaptiveRateLimiter:
+    """Token-bucket rate limiter with AIMD-adapted rate and concurrency.
+
+    Every request takes one token (refilled at `rate` per second) and one of
+    `concurrency` slots. Throttling (429) and server errors (5xx, connection
+    failures) multiplicatively decrease both, at most once per `cooldown`
+    seconds; successful responses additively increase them again, unless they
+    are slower than `latency_target`.
+
+    The limiter is thread-safe and usable from both sync and async code, so one
+    instance can be shared by a HubeauClient and an AsyncHubeauClient.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 32,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_target: Optional[float] = None,
+        cooldown: float = 1.0,
+    ) -> None:
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.concurrency = concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, token: bool) -> float:
+        """Take a slot (and a token) if possible; else return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            burst = max(1.0, self.rate)
+            self._tokens = min(burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self.in_flight >= self.concurrency:
+                return _SLOT_POLL_INTERVAL
+            if token:
+                if self._tokens < 1.0:
+                    return (1.0 - self._tokens) / self.rate
+                self._tokens -= 1.0
+            self.in_flight += 1
+            return 0.0
+
+    def acquire(self, token: bool = True) -> None:
+        """Wait for a slot, and for a token unless `token` is False."""
+        while (wait := self._try_acquire(token)) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, token: bool = True) -> None:
+        while (wait := self._try_acquire(token)) > 0:
+            await asyncio.sleep(wait)
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def record(self, status_code: Optional[int], latency: float) -> None:
+        """Adapt rate and concurrency to one response (None: transport error)."""
+        congested = status_code is None or status_code == 429 or status_code >= 500
+        with self._lock:
+            if congested:
+                now = time.monotonic()
+                if now - self._last_decrease < self.cooldown:
+                    return
+                self._last_decrease = now
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self.concurrency = max(
+                    self.min_concurrency, int(self.concurrency * self.decrease_factor)
+                )
+                self._successes = 0
+                return
+            if self.latency_target is not None and latency > self.latency_target:
+                return
+            # Roughly +`increase` req/s and +1 slot per window of successes.
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+            self._successes += 1
+            if self._successes >= self.concurrency:
+                self._successes = 0
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+
+class _SlotStream(httpx.SyncByteStream):
+    """Response body holding a limiter slot only while a chunk is read.
+
+    The slot of the request is kept until the first chunk is read, then given
+    back between chunks (each later read takes a slot again, without a
+    token). Whatever the caller does with a chunk thus holds no slot, and a
+    request made while a body is consumed never waits on that body's slot.
+    """
+
+    def __init__(
+        self, stream: httpx.SyncByteStream, limiter: AdaptiveRateLimiter
+    ) -> None:
+        self._stream = stream
+        self._limiter = limiter
+        self._held = True
+
+    def _release(self) -> None:
+        if self._held:
+            self._held = False
+            self._limiter.release()
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks = iter(self._stream)
+        while True:
+            if not self._held:
+                self._limiter.acquire(token=False)
+                self._held = True
+            try:
+                chunk = next(chunks, None)
+            finally:
+                self._release()
+            if chunk is None:
+                return
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncSlotStream(httpx.AsyncByteStream):
+    def __init__(
+        self, stream: httpx.AsyncByteStream, limiter: AdaptiveRateLimiter
+    ) -> None:
+        self._stream = stream
+        self._limiter = limiter
+        self._held = True
+
+    def _release(self) -> None:
+        if self._held:
+            self._held = False
+            self._limiter.release()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        chunks = aiter(self._stream)
+        while True:
+            if not self._held:
+                await self._limiter.acquire_async(token=False)
+                self._held = True
+            try:
+                chunk = await anext(chunks, None)
+            finally:
+                self._release()
+            if chunk is None:
+                return
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """httpx transport holding a limiter slot while a request is in flight.
+
+    The slot is taken before the request is sent and held until the first
+    body chunk is read; see `_SlotStream` for the rest of the body.
+    """
+
+    def __init__(
+        self, transport: httpx.BaseTransport, limiter: AdaptiveRateLimiter
+    ) -> None:
+        self._transport = transport
+        self._limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = self._transport.handle_request(request)
+        except httpx.TransportError:
+            self._limiter.record(None, time.monotonic() - start)
+            self._limiter.release()
+            raise
+        except BaseException:
+            self._limiter.release()
+            raise
+        self._limiter.record(response.status_code, time.monotonic() - start)
+        assert isinstance(response.stream, httpx.SyncByteStream)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_SlotStream(response.stream, self._limiter),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of RateLimitedTransport."""
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, limiter: AdaptiveRateLimiter
+    ) -> None:
+        self._transport = transport
+        self._limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._limiter.acquire_async()
+        start = time.monotonic()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            self._limiter.record(None, time.monotonic() - start)
+            self._limiter.release()
+            raise
+        except BaseException:
+            self._limiter.release()
+            raise
+        self._limiter.record(response.status_code, time.monotonic() - start)
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_AsyncSlotStream(response.stream, self._limiter),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,160 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional, Type
+
+import httpx
+
+# Maximum number of attempts (first try included) per retryable status code.
+DEFAULT_RETRY_STATUSES: Mapping[int, int] = {
+    429: 8,
+    500: 3,
+    502: 5,
+    503: 5,
+    504: 5,
+}
+
+# Maximum number of attempts per transport error class (matched along the MRO).
+DEFAULT_RETRY_EXCEPTIONS: Mapping[Type[httpx.TransportError], int] = {
+    httpx.ConnectError: 5,
+    httpx.ConnectTimeout: 5,
+    httpx.PoolTimeout: 5,
+    httpx.RemoteProtocolError: 5,
+    httpx.ReadError: 3,
+    httpx.ReadTimeout: 3,
+}
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request.
+
+    Only idempotent methods are retried. Each retryable status code and
+    transport error class has its own attempt budget. Waits grow exponentially
+    from `backoff_factor` up to `max_backoff`, with full jitter, unless the
+    server sent a `Retry-After` header, which is honoured up to
+    `max_retry_after` seconds.
+    """
+
+    def __init__(
+        self,
+        statuses: Mapping[int, int] = DEFAULT_RETRY_STATUSES,
+        exceptions: Mapping[Type[httpx.TransportError], int] = DEFAULT_RETRY_EXCEPTIONS,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        max_retry_after: float = 120.0,
+        methods: frozenset[str] = IDEMPOTENT_METHODS,
+    ) -> None:
+        self.statuses = dict(statuses)
+        self.exceptions = dict(exceptions)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self.methods = methods
+
+    def _max_attempts_for_exception(self, exc: Exception) -> int:
+        for cls in type(exc).__mro__:
+            if cls in self.exceptions:
+                return self.exceptions[cls]
+        return 1
+
+    def should_retry_response(
+        self, request: httpx.Request, response: httpx.Response, attempt: int
+    ) -> bool:
+        """`attempt` is the 1-based number of the attempt that just failed."""
+        if request.method not in self.methods:
+            return False
+        return attempt < self.statuses.get(response.status_code, 1)
+
+    def should_retry_exception(
+        self, request: httpx.Request, exc: Exception, attempt: int
+    ) -> bool:
+        if request.method not in self.methods:
+            return False
+        return attempt < self._max_attempts_for_exception(exc)
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Seconds to wait after the failed `attempt`."""
+        if response is not None:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header, given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryTransport(httpx.BaseTransport):
+    """httpx transport retrying failed requests according to a RetryPolicy."""
+
+    def __init__(self, transport: httpx.BaseTransport, policy: RetryPolicy) -> None:
+        self._transport = transport
+        self._policy = policy
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 1
+        while True:
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError as exc:
+                if not self._policy.should_retry_exception(request, exc, attempt):
+                    raise
+                time.sleep(self._policy.backoff(attempt))
+            else:
+                if not self._policy.should_retry_response(request, response, attempt):
+                    return response
+                response.close()
+                time.sleep(self._policy.backoff(attempt, response))
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of RetryTransport."""
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, policy: RetryPolicy
+    ) -> None:
+        self._transport = transport
+        self._policy = policy
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 1
+        while True:
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as exc:
+                if not self._policy.should_retry_exception(request, exc, attempt):
+                    raise
+                await asyncio.sleep(self._policy.backoff(attempt))
+            else:
+                if not self._policy.should_retry_response(request, response, attempt):
+                    return response
+                await response.aclose()
+                await asyncio.sleep(self._policy.backoff(attempt, response))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,163 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from hubeau_py.columnar import ResultSet, code_array
+from hubeau_py.dates import parse_datetimes
+
+# Code arrays of a StationSeries use -1 for a missing code.
+MISSING_CODE = -1
+
+
+@dataclass(frozen=True)
+class SeriesLayout:
+    """Fields of an observation endpoint, as packed by `station_series`.
+
+    A series is the observations of one station for one quantity
+    (`grandeur`). `codes` maps the name of each code array of the series to
+    its field, and `labels` maps code fields to the field labelling them.
+    """
+
+    grandeur: str
+    date: str
+    value: str
+    codes: Tuple[Tuple[str, str], ...]
+    labels: Tuple[Tuple[str, str], ...]
+
+
+OBSERVATIONS_TR_SERIES = SeriesLayout(
+    "grandeur_hydro",
+    "date_obs",
+    "resultat_obs",
+    (("qualification", "code_qualification_obs"), ("status", "code_statut")),
+    (
+        ("code_qualification_obs", "libelle_qualification_obs"),
+        ("code_statut", "libelle_statut"),
+        ("code_methode_obs", "libelle_methode_obs"),
+        ("code_continuite", "libelle_continuite"),
+    ),
+)
+OBS_ELAB_SERIES = SeriesLayout(
+    "grandeur_hydro_elab",
+    "date_obs_elab",
+    "resultat_obs_elab",
+    (("qualification", "code_qualification"), ("status", "code_statut")),
+    (
+        ("code_qualification", "libelle_qualification"),
+        ("code_statut", "libelle_statut"),
+        ("code_methode", "libelle_methode"),
+    ),
+)
+
+
+@dataclass(frozen=True)
+class StationSeries:
+    """Observations of one station for one quantity, packed in arrays.
+
+    Fields with one value over the whole series (station and site codes,
+    quantity, coordinates, ...) are stored once in `header`. Observations are
+    parallel arrays in date order: `dates` (datetime64[s], UTC), `values`
+    (float64, NaN when missing) and one int16 array per code in `codes`.
+    `labels` gives the label of every code seen, per code field. Fields that
+    vary within the series without being packed are kept in `extra`.
+    """
+
+    header: Dict[str, Any]
+    dates: np.ndarray
+    values: np.ndarray
+    codes: Dict[str, np.ndarray]
+    labels: Dict[str, Dict[int, str]]
+    extra: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays of the series."""
+        arrays = [self.dates, self.values, *self.codes.values(), *self.extra.values()]
+        return sum(array.nbytes for array in arrays)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """The observations as a DataFrame indexed by UTC date."""
+        index = pd.DatetimeIndex(self.dates, name="date").tz_localize("UTC")
+        return pd.DataFrame(
+            {"value": self.values, **self.codes, **self.extra}, index=index
+        )
+
+
+def station_series(table: ResultSet, layout: SeriesLayout) -> List[StationSeries]:
+    """Split observations into one StationSeries per station and quantity.
+
+    Series come in order of first appearance in `table`. Dates are parsed and
+    codes packed once for the whole table, then each series takes its rows.
+    """
+    if not len(table):
+        return []
+    frame = table.to_pandas()
+    keys = [name for name in ("code_station", layout.grandeur) if name in frame]
+    dates = (
+        parse_datetimes(table[layout.date]).astype("datetime64[s]")
+        if layout.date in table
+        else None
+    )
+    values = frame[layout.value].to_numpy(np.float64) if layout.value in frame else None
+    codes = {
+        name: code_array(frame[field], MISSING_CODE)
+        for name, field in layout.codes
+        if field in frame
+    }
+    label_fields = {label for _, label in layout.labels}
+    code_fields = {field for field, _ in layout.labels}
+    packed = {layout.date, layout.value, *(field for _, field in layout.codes)}
+    rest = [str(name) for name in frame if name not in packed | label_fields]
+    groups = (
+        frame.groupby(keys, sort=False, dropna=False)
+        if keys
+        else frame.groupby(np.zeros(len(frame)))
+    )
+    # Rows of each series, series numbered as the groups of `varying`.
+    ids = groups.ngroup().to_numpy()
+    bounds = np.cumsum(np.bincount(ids))[:-1]
+    varying = groups[rest].nunique(dropna=False).gt(1).to_numpy() if rest else None
+
+    series: List[StationSeries] = []
+    for number, rows in enumerate(np.split(np.argsort(ids, kind="stable"), bounds)):
+        if dates is not None:
+            rows = rows[np.argsort(dates[rows], kind="stable")]
+        row = table.row(rows[0])
+        header: Dict[str, Any] = {}
+        extra: Dict[str, np.ndarray] = {}
+        for i, name in enumerate(rest):
+            if varying is None or not varying[number, i]:
+                header[name] = row[name]
+            elif name in code_fields:
+                extra[name] = code_array(table[name][rows], MISSING_CODE)
+            else:
+                extra[name] = np.asarray(table[name][rows])
+        labels: Dict[str, Dict[int, str]] = {}
+        for field, label in layout.labels:
+            if field in frame and label in frame:
+                pairs = frame[[field, label]].iloc[rows].dropna().drop_duplicates()
+                labels[field] = {
+                    int(code): str(text) for code, text in pairs.itertuples(index=False)
+                }
+        series.append(
+            StationSeries(
+                header=header,
+                dates=(
+                    dates[rows]
+                    if dates is not None
+                    else np.full(len(rows), np.datetime64("NaT", "s"))
+                ),
+                values=(
+                    values[rows] if values is not None else np.full(len(rows), np.nan)
+                ),
+                codes={name: array[rows] for name, array in codes.items()},
+                labels=labels,
+                extra=extra,
+            )
+        )
+    return series
@@ -0,0 +1,193 @@
+import warnings
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from hubeau_py.exceptions import DepthLimitWarning
+from hubeau_py.parallel import async_ordered_map, ordered_map
+
+DateLike = Union[date, datetime]
+DateRange = Tuple[DateLike, DateLike]
+Window = Tuple[datetime, datetime]
+
+
+@dataclass(frozen=True)
+class DateWindows:
+    """How an endpoint filters and orders its records by date.
+
+    Both bounds of the filter are inclusive, at the given `resolution`: one day
+    for endpoints filtered by date, one second for those filtered by datetime.
+    """
+
+    start_param: str
+    end_param: str
+    sort_fields: Tuple[str, ...]
+    resolution: timedelta = timedelta(days=1)
+
+    def bounds(self, date_range: DateRange) -> Window:
+        start, end = (_as_datetime(d) for d in date_range)
+        if not isinstance(date_range[1], datetime):
+            # A plain end date covers that whole day.
+            end += timedelta(days=1) - self.resolution
+        return start, end
+
+    def format(self, value: datetime) -> str:
+        if self.resolution >= timedelta(days=1):
+            return value.date().isoformat()
+        return value.isoformat(timespec="seconds")
+
+    def params(self, params: Dict[str, Any], window: Window) -> Dict[str, Any]:
+        start, end = window
+        return {
+            **params,
+            self.start_param: self.format(start),
+            self.end_param: self.format(end),
+        }
+
+    def split(self, window: Window) -> Optional[Tuple[Window, Window]]:
+        """Bisect `window` into two adjacent windows, or None if it is atomic."""
+        start, end = window
+        steps = (end - start) // self.resolution
+        if steps < 1:
+            return None
+        middle = start + (steps // 2) * self.resolution
+        return (start, middle), (middle + self.resolution, end)
+
+    def sort_key(self, item: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(item.get(field) or "" for field in self.sort_fields)
+
+
+ANALYSE_PC_WINDOWS = DateWindows(
+    "date_debut_prelevement",
+    "date_fin_prelevement",
+    ("date_prelevement", "heure_prelevement"),
+)
+OBSERVATIONS_TR_WINDOWS = DateWindows(
+    "date_debut_obs", "date_fin_obs", ("date_obs",), timedelta(seconds=1)
+)
+OBS_ELAB_WINDOWS = DateWindows(
+    "date_debut_obs_elab", "date_fin_obs_elab", ("date_obs_elab",)
+)
+
+
+def calendar_years(first: int, last: int) -> List[DateRange]:
+    """One date range per calendar year, from `first` to `last` included."""
+    return [(date(year, 1, 1), date(year, 12, 31)) for year in range(first, last + 1)]
+
+
+def _as_datetime(value: DateLike) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, time.min)
+
+
+# Windows being planned, with their record count (None: not counted yet).
+_Plan = List[Tuple[Window, Optional[int]]]
+
+
+def _uncounted(plan: _Plan) -> List[Window]:
+    return [window for window, total in plan if total is None]
+
+
+def _refine(plan: _Plan, totals: List[int], windows: DateWindows, limit: int) -> _Plan:
+    """Give the uncounted windows of `plan` their `totals`, bisecting those
+    over `limit` into new uncounted windows."""
+    counted = iter(totals)
+    refined: _Plan = []
+    for window, total in plan:
+        if total is None:
+            total = next(counted)
+            halves = windows.split(window) if total > limit else None
+            if halves is not None:
+                refined.extend((half, None) for half in halves)
+                continue
+        refined.append((window, total))
+    return refined
+
+
+def _planned(plan: _Plan, limit: int) -> List[Window]:
+    for (start, end), total in plan:
+        if total is not None and total > limit:
+            warnings.warn(
+                f"{total} records from {start} to {end}, a window that cannot "
+                f"be split, exceed the depth limit: only {limit} are fetched",
+                DepthLimitWarning,
+                stacklevel=3,
+            )
+    return [window for window, total in plan if total]
+
+
+def plan_windows(
+    count: Callable[[Window], int],
+    windows: DateWindows,
+    date_range: DateRange,
+    limit: int,
+    max_workers: int = 0,
+) -> List[Window]:
+    """Cut `date_range` into chronological windows of at most `limit` records.
+
+    `count` returns the number of records in a window. Windows over the limit
+    are bisected recursively; empty windows are dropped. The windows of each
+    round of bisection are counted with up to `max_workers` calls at once
+    (see `ordered_map`). A window that cannot be split any further is kept
+    even if it is still over the limit, with a DepthLimitWarning.
+    """
+    plan: _Plan = [(windows.bounds(date_range), None)]
+    while todo := _uncounted(plan):
+        totals = list(ordered_map(count, todo, max_workers))
+        plan = _refine(plan, totals, windows, limit)
+    return _planned(plan, limit)
+
+
+async def async_plan_windows(
+    count: Callable[[Window], Awaitable[int]],
+    windows: DateWindows,
+    date_range: DateRange,
+    limit: int,
+    max_workers: int = 0,
+) -> List[Window]:
+    """Async counterpart of `plan_windows`."""
+    plan: _Plan = [(windows.bounds(date_range), None)]
+    while todo := _uncounted(plan):
+        totals = [total async for total in async_ordered_map(count, todo, max_workers)]
+        plan = _refine(plan, totals, windows, limit)
+    return _planned(plan, limit)
+
+
+# Department codes accepted by the `code_departement` filter: metropolitan
+# France (with Corsica as 2A/2B) and the overseas departments.
+DEPARTMENTS: Tuple[str, ...] = (
+    *(f"{n:02d}" for n in range(1, 96) if n != 20),
+    "2A",
+    "2B",
+    "971",
+    "972",
+    "973",
+    "974",
+    "976",
+)
+
+BBox = Tuple[float, float, float, float]
+
+# (min_lon, min_lat, max_lon, max_lat) enclosing metropolitan France.
+METROPOLITAN_BBOX: BBox = (-5.5, 41.0, 10.0, 51.5)
+
+
+def bbox_tiles(bbox: BBox = METROPOLITAN_BBOX, nx: int = 4, ny: int = 4) -> List[str]:
+    """Cut `bbox` into `nx` x `ny` tiles, formatted for the `bbox` filter."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    width = (max_lon - min_lon) / nx
+    height = (max_lat - min_lat) / ny
+    return [
+        ",".join(
+            f"{v:.6f}"
+            for v in (
+                min_lon + i * width,
+                min_lat + j * height,
+                min_lon + (i + 1) * width,
+                min_lat + (j + 1) * height,
+            )
+        )
+        for j in range(ny)
+        for i in range(nx)
+    ]
@@ -0,0 +1,158 @@
+import codecs
+import io
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_WHITESPACE = " \t\n\r"
+
+# Parser states, in the order they are met in `{"count": 2, "data": [{..}, {..}]}`.
+_OPEN = 0  # before the opening brace
+_FIRST_KEY = 1  # after "{", a key or "}"
+_KEY = 2  # after ",", a key
+_COLON = 3
+_VALUE = 4
+_FIRST_ITEM = 5  # after "[", an item or "]"
+_ITEM = 6  # after ",", an item
+_AFTER_ITEM = 7  # "," or "]"
+_AFTER_VALUE = 8  # "," or "}"
+_DONE = 9
+
+
+class EnvelopeDecoder:
+    """Incremental decoder of a Hubeau JSON envelope.
+
+    Bytes are pushed with `feed`, which returns the items of the `key` array
+    completed so far; every other top-level field ends up in `envelope`. Only
+    the item being decoded is buffered, so memory stays proportional to one
+    record rather than to the whole page. Call `close` once the body is
+    exhausted to check the document was complete.
+    """
+
+    def __init__(self, key: str = "data") -> None:
+        self.envelope: Dict[str, Any] = {}
+        self._key = key
+        self._json = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = _OPEN
+        self._field: Optional[str] = None
+        self._eof = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buf = self._buf[self._pos :] + self._text.decode(chunk)
+        self._pos = 0
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        self._eof = True
+        self._buf = self._buf[self._pos :] + self._text.decode(b"", final=True)
+        self._pos = 0
+        items = self._drain()
+        if self._state != _DONE:
+            raise json.JSONDecodeError("Truncated document", self._buf, self._pos)
+        return items
+
+    def _drain(self) -> List[Any]:
+        items: List[Any] = []
+        while self._step(items):
+            pass
+        return items
+
+    def _peek(self) -> Optional[str]:
+        """Skip whitespace; return the next character, or None if none is buffered."""
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _value(self) -> Tuple[bool, Any]:
+        """Decode the next value; (False, None) if it is not fully buffered yet."""
+        try:
+            value, end = self._json.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            return False, None
+        if end == len(self._buf) and not self._eof:
+            # A number at the end of the buffer may go on in the next chunk.
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _expect(self, char: str, state: int) -> bool:
+        if self._buf[self._pos] != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self._buf, self._pos)
+        self._pos += 1
+        self._state = state
+        return True
+
+    def _step(self, items: List[Any]) -> bool:
+        char = self._peek()
+        if char is None:
+            return False
+        state = self._state
+        if state == _OPEN:
+            return self._expect("{", _FIRST_KEY)
+        if state == _FIRST_KEY and char == "}":
+            return self._expect("}", _DONE)
+        if state in (_FIRST_KEY, _KEY):
+            ok, field = self._value()
+            if ok:
+                self._field = field
+                self._state = _COLON
+            return ok
+        if state == _COLON:
+            return self._expect(":", _VALUE)
+        if state == _VALUE:
+            if self._field == self._key and char == "[":
+                return self._expect("[", _FIRST_ITEM)
+            ok, value = self._value()
+            if ok:
+                self.envelope[str(self._field)] = value
+                self._state = _AFTER_VALUE
+            return ok
+        if state == _FIRST_ITEM and char == "]":
+            return self._expect("]", _AFTER_VALUE)
+        if state in (_FIRST_ITEM, _ITEM):
+            ok, item = self._value()
+            if ok:
+                items.append(item)
+                self._state = _AFTER_ITEM
+            return ok
+        if state == _AFTER_ITEM:
+            if char == ",":
+                return self._expect(",", _ITEM)
+            return self._expect("]", _AFTER_VALUE)
+        if state == _AFTER_VALUE:
+            if char == ",":
+                return self._expect(",", _KEY)
+            return self._expect("}", _DONE)
+        raise json.JSONDecodeError("Extra data", self._buf, self._pos)
+
+
+class ChunkReader(io.RawIOBase):
+    """Read-only binary file over an iterable of byte chunks.
+
+    Lets parsers that read from files (e.g. `pandas.read_csv`) consume a
+    response body as it is streamed, one chunk in memory at a time.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._chunk = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._chunk:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._chunk = memoryview(chunk)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from itertools import count
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+)
+
+from pydantic import BaseModel
+
+from hubeau_py.labels import interner, label_fields
+from hubeau_py.models.geojson import GEOMETRY_TYPES, construct_geometry
+from hubeau_py.views import lazy_factory
+
+M = TypeVar("M", bound=BaseModel)
+
+FULL = "full"
+TRUSTED = "trusted"
+SAMPLED = "sampled"
+LAZY = "lazy"
+MODES = (FULL, TRUSTED, SAMPLED, LAZY)
+
+DEFAULT_SAMPLE_EVERY = 100
+
+
+@dataclass(frozen=True)
+class Validation:
+    """How records are built from decoded JSON.
+
+    - "full" validates every record with pydantic.
+    - "trusted" builds records without validation, like `model_construct`.
+      Values are stored as decoded, with no type coercion, except that
+      `geometry` is still built as a geometry model (without validation), so
+      records of every mode have the same field types there. Use it for data
+      known to match the schema.
+    - "sampled" is trusted construction that still fully validates the first
+      record and every `every`-th record after it, so schema drift raises a
+      ValidationError instead of going unnoticed.
+    - "lazy" keeps each decoded item and validates a field the first time it
+      is read (see `hubeau_py.views`), for code reading a few fields of each
+      record.
+
+    With `intern=True`, the label strings of the records built by one factory
+    (parameter names, units, URIs, ...) are shared instead of duplicated
+    (see `hubeau_py.labels`).
+    """
+
+    mode: str = FULL
+    every: int = DEFAULT_SAMPLE_EVERY
+    intern: bool = False
+
+    def __post_init__(self) -> None:
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown validation mode {self.mode!r}, expected {MODES}")
+        if self.every < 1:
+            raise ValueError("every must be at least 1")
+
+    def factory(self, model: Type[M]) -> Callable[[Dict[str, Any]], M]:
+        """Function building a `model` record from a decoded item."""
+        make = self._factory(model)
+        labels = label_fields(model)
+        if not self.intern or not labels:
+            return make
+        intern = interner(labels)
+        return lambda item: make(intern(item))
+
+    def _factory(self, model: Type[M]) -> Callable[[Dict[str, Any]], M]:
+        if self.mode == FULL:
+            return model.model_validate
+        if self.mode == LAZY:
+            return lazy_factory(model)
+
+        construct = _constructor(model)
+        if self.mode == TRUSTED:
+            return construct
+        counter = count()
+        every = self.every
+
+        def sample(item: Dict[str, Any]) -> M:
+            if next(counter) % every == 0:
+                return model.model_validate(item)
+            return construct(item)
+
+        return sample
+
+
+def _constructor(model: Type[M]) -> Callable[[Dict[str, Any]], M]:
+    """Build `model` records without validation.
+
+    Same result as `model.model_construct(**item)`, which loops over every
+    model field in Python, but only copies the item over the defaults. Items
+    of a page share their keys, so the keys set and the unknown keys (dropped,
+    as by validation) are only worked out when the keys change. Geometry
+    fields are built as geometry models (see `construct_geometry`), so that
+    `geometry` is a Point whether or not the record was validated.
+    """
+    names = frozenset(model.model_fields)
+    geometries = tuple(
+        name
+        for name, info in model.model_fields.items()
+        if _holds_geometry(info.annotation)
+    )
+    defaults = {
+        name: info.get_default(call_default_factory=True)
+        for name, info in model.model_fields.items()
+        if not info.is_required()
+    }
+    new = model.__new__
+    set_attribute = object.__setattr__
+    # (item keys, fields set, unknown keys) of the last item.
+    shape: List[Tuple[Tuple[str, ...], FrozenSet[str], Tuple[str, ...]]] = [
+        ((), frozenset(), ())
+    ]
+
+    def construct(item: Dict[str, Any]) -> M:
+        keys = tuple(item)
+        last = shape[0]
+        if keys != last[0]:
+            last = (keys, frozenset(item.keys() & names), tuple(item.keys() - names))
+            shape[0] = last
+        values = dict(defaults)
+        values.update(item)
+        for key in last[2]:
+            del values[key]
+        for name in geometries:
+            if values.get(name) is not None:
+                values[name] = construct_geometry(values[name])
+        record = new(model)
+        set_attribute(record, "__dict__", values)
+        set_attribute(record, "__pydantic_fields_set__", set(last[1]))
+        set_attribute(record, "__pydantic_extra__", None)
+        set_attribute(record, "__pydantic_private__", None)
+        return record
+
+    return construct
+
+
+def _holds_geometry(annotation: Any) -> bool:
+    if annotation in GEOMETRY_TYPES.values():
+        return True
+    return any(_holds_geometry(arg) for arg in get_args(annotation))
+
+
+def get_validation(validation: Union[str, Validation]) -> Validation:
+    """The Validation for a mode name (see `MODES`) or instance."""
+    if isinstance(validation, Validation):
+        return validation
+    return Validation(validation)
@@ -0,0 +1,177 @@
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+    Optional,
+    Self,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from hubeau_py.projection import project
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class _LazyRecord(BaseModel):
+    """Mixin of the lazy record classes built by `lazy_model`.
+
+    A lazy record keeps the decoded item in `_raw` and starts with an empty
+    `__dict__`; reading a field validates that field only and caches it.
+    Anything needing every field (dumps, equality, repr, copies) first
+    validates the fields not read yet. A lazy record equals the eagerly
+    validated record of its model with the same values, in either order.
+    Records pickle as their model and `_raw`, and unpickle as lazy records
+    again.
+    """
+
+    __slots__ = ("_raw",)
+    if TYPE_CHECKING:
+        _raw: Dict[str, Any]
+
+    def _load(self) -> None:
+        if len(self.__dict__) < len(type(self).model_fields):
+            values = {name: getattr(self, name) for name in type(self).model_fields}
+            object.__setattr__(self, "__dict__", values)
+
+    def to_model(self) -> BaseModel:
+        """The record fully validated as the model it was built for."""
+        base: Type[BaseModel] = type(self).__bases__[1]
+        return base.model_validate(self._raw)
+
+    def model_dump(self, **kwargs: Any) -> Dict[str, Any]:
+        self._load()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        self._load()
+        return super().model_dump_json(**kwargs)
+
+    def model_copy(
+        self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False
+    ) -> Self:
+        self._load()
+        return super().model_copy(update=update, deep=deep)
+
+    def __eq__(self, other: Any) -> bool:
+        # Being a subclass, this also runs first for `model == lazy`.
+        if type(other) is type(self).__bases__[1]:
+            return self.to_model() == other
+        self._load()
+        if isinstance(other, _LazyRecord):
+            other._load()
+        return super().__eq__(other)
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:  # type: ignore[override]
+        self._load()
+        return super().__iter__()
+
+    def __repr_args__(self) -> Any:
+        self._load()
+        return super().__repr_args__()
+
+    def __copy__(self) -> Self:
+        self._load()
+        return super().__copy__()
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> Self:
+        self._load()
+        return super().__deepcopy__(memo)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Lazy classes (and projections) are built at run time and cannot be
+        # pickled by name: pickle what rebuilds them instead.
+        base = type(self).__bases__[1]
+        model, fields = getattr(base, "__projection__", (base, None))
+        return _restore, (model, fields, self._raw)
+
+
+def _restore(
+    model: Type[BaseModel], fields: Optional[Tuple[str, ...]], raw: Dict[str, Any]
+) -> BaseModel:
+    """Unpickle a lazy record of `project(model, fields)`."""
+    return lazy_factory(project(model, fields))(raw)
+
+
+@lru_cache(maxsize=None)
+def lazy_model(model: Type[M]) -> Type[M]:
+    """Subclass of `model` whose records validate each field on first read.
+
+    Records are still instances of `model` with its typed attributes; reading
+    3 fields of a 60-field record only validates those 3. `to_model()` gives
+    the fully validated `model` instance.
+    """
+    readers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+    fallback = BaseModel.__getattr__  # type: ignore[attr-defined]
+
+    def get_attribute(self: _LazyRecord, name: str) -> Any:
+        read = readers.get(name)
+        if read is None:
+            if name not in model.model_fields:
+                return fallback(self, name)
+            read = readers[name] = _reader(model, name)
+        value = read(self._raw)
+        self.__dict__[name] = value
+        return value
+
+    namespace = {
+        "__slots__": (),
+        "__module__": model.__module__,
+        "__getattr__": get_attribute,
+    }
+    lazy = type(f"Lazy{model.__name__}", (_LazyRecord, model), namespace)
+    return cast(Type[M], lazy)
+
+
+def _reader(model: Type[BaseModel], name: str) -> Callable[[Dict[str, Any]], Any]:
+    """Function validating field `name` of `model` from a decoded item."""
+    info = model.model_fields[name]
+    annotation: Any = info.annotation
+    validate: Callable[[Any], Any] = TypeAdapter(annotation).validate_python
+
+    def read(raw: Dict[str, Any]) -> Any:
+        if name in raw:
+            try:
+                return validate(raw[name])
+            except ValidationError as exc:
+                # Report the error against the model and field, as eager
+                # validation would, rather than against the bare annotation.
+                errors: Any = [
+                    {**error, "loc": (name, *error["loc"])} for error in exc.errors()
+                ]
+                raise ValidationError.from_exception_data(
+                    model.__name__, errors
+                ) from None
+        if info.is_required():
+            error: Any = {"type": "missing", "loc": (name,), "input": raw}
+            raise ValidationError.from_exception_data(model.__name__, [error])
+        return info.get_default(call_default_factory=True)
+
+    return read
+
+
+def lazy_factory(model: Type[M]) -> Callable[[Dict[str, Any]], M]:
+    """Function wrapping decoded items in lazy `model` records."""
+    lazy = lazy_model(model)
+    names = frozenset(model.model_fields)
+    new = object.__new__
+    set_attribute = object.__setattr__
+
+    def make(item: Dict[str, Any]) -> M:
+        record = cast(M, new(lazy))
+        set_attribute(record, "__dict__", {})
+        set_attribute(record, "_raw", item)
+        set_attribute(record, "__pydantic_fields_set__", item.keys() & names)
+        set_attribute(record, "__pydantic_extra__", None)
+        set_attribute(record, "__pydantic_private__", None)
+        return record
+
+    return make
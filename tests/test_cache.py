@@ -0,0 +1,169 @@
+"""
+Offline tests for the on-disk HTTP response cache.
+"""
+
+import asyncio
+import gzip
+import json
+from pathlib import Path
+from typing import Any, List, Optional
+
+import httpx
+
+from hubeau_py.cache import (
+    AsyncCacheTransport,
+    CachedResponse,
+    CacheTransport,
+    HttpCache,
+    cache_key,
+)
+
+BASE_URL = "https://hubeau.eaufrance.fr/api/v2/hydrometrie"
+
+
+def _client(handler: Any, cache: HttpCache) -> httpx.Client:
+    return httpx.Client(transport=CacheTransport(httpx.MockTransport(handler), cache))
+
+
+def _body(code: str) -> bytes:
+    return json.dumps({"count": 1, "data": [{"code_station": code}]}).encode()
+
+
+def test_cache_key_is_normalized() -> None:
+    a = httpx.Request("GET", "https://x.org/a?b=2&a=1")
+    b = httpx.Request("GET", "https://x.org/a?a=1&b=2")
+    assert cache_key(a) == cache_key(b)
+
+
+def test_referentiel_is_cached_and_realtime_is_not(tmp_path: Path) -> None:
+    calls: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path.rsplit("/", 1)[-1])
+        return httpx.Response(200, content=_body("S1"))
+
+    ttls = {"referentiel/stations": 3600.0, "observations_tr": 0.0}
+    cache = HttpCache(tmp_path / "cache.sqlite", ttls=ttls)
+    client = _client(handler, cache)
+    for _ in range(2):
+        client.get(f"{BASE_URL}/referentiel/stations", params={"code_station": "S1"})
+        client.get(f"{BASE_URL}/observations_tr", params={"code_station": "S1"})
+    assert calls == ["stations", "observations_tr", "observations_tr"]
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    # The cache persists across clients sharing the same file.
+    client = _client(handler, HttpCache(tmp_path / "cache.sqlite", ttls=ttls))
+    resp = client.get(f"{BASE_URL}/referentiel/stations?code_station=S1")
+    assert resp.json()["data"] == [{"code_station": "S1"}]
+    assert calls.count("stations") == 1
+
+
+def test_stale_entries_are_revalidated(tmp_path: Path) -> None:
+    seen_etags: List[Optional[str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_etags.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        headers = {"ETag": '"v1"', "Content-Encoding": "gzip"}
+        return httpx.Response(200, content=gzip.compress(_body("S1")), headers=headers)
+
+    cache = HttpCache(tmp_path / "cache.sqlite", ttls={"referentiel/sites": 1e-9})
+    client = _client(handler, cache)
+    for _ in range(2):
+        resp = client.get(f"{BASE_URL}/referentiel/sites")
+        assert resp.json()["data"] == [{"code_station": "S1"}]
+    assert seen_etags == [None, '"v1"']
+    assert cache.stats.revalidated == 1
+
+
+def test_size_bounded_eviction(tmp_path: Path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"x" * 100)
+
+    cache = HttpCache(
+        tmp_path / "cache.sqlite", ttls={"referentiel/sites": 3600.0}, max_size=250
+    )
+    client = _client(handler, cache)
+    for code in ["A", "B", "C"]:
+        client.get(f"{BASE_URL}/referentiel/sites", params={"code_site": code})
+    assert cache.stats.evictions == 1
+
+    # "A" was the least recently used entry, so it is the one that was evicted.
+    client.get(f"{BASE_URL}/referentiel/sites", params={"code_site": "A"})
+    assert cache.stats.hits == 0
+
+
+def test_entry_bounded_eviction(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    key = f"GET {BASE_URL}/referentiel/sites?code_site="
+    cache = HttpCache(path, max_entries=2)
+    entry = CachedResponse(200, [], b"x" * 100, 0.0)
+    for code in ["A", "B", "A", "C"]:
+        cache.set(key + code, entry)
+    # Storing "A" again replaced it: only "B", the least recent, was evicted.
+    assert cache.stats.evictions == 1
+    assert cache.get(key + "B") is None
+    cache.close()
+
+    # The totals are read back from the file when the cache is reopened.
+    reopened = HttpCache(path, max_entries=2)
+    reopened.set(key + "D", entry)
+    assert reopened.stats.evictions == 1
+    assert reopened.get(key + "A") is None
+    assert reopened.get(key + "C") is not None
+
+
+def test_csv_endpoints_and_repeated_headers_are_cached(tmp_path: Path) -> None:
+    calls: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        headers = [("content-type", "text/csv"), ("link", "<a>"), ("link", "<b>")]
+        return httpx.Response(200, content=b"code_station\nS1\n", headers=headers)
+
+    cache = HttpCache(tmp_path / "cache.sqlite", ttls={"obs_elab": 3600.0})
+    client = _client(handler, cache)
+    for _ in range(2):
+        resp = client.get(f"{BASE_URL}/obs_elab.csv")
+        assert resp.headers.get_list("link") == ["<a>", "<b>"]
+    assert len(calls) == 1
+    assert cache.stats.hits == 1
+
+
+def test_partial_pages_are_cached_with_their_status(tmp_path: Path) -> None:
+    calls: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(206, content=_body("S1"))
+
+    cache = HttpCache(tmp_path / "cache.sqlite", ttls={"referentiel/sites": 3600.0})
+    client = _client(handler, cache)
+    for _ in range(2):
+        resp = client.get(f"{BASE_URL}/referentiel/sites", params={"size": 1})
+        assert resp.status_code == 206
+        assert resp.json()["data"] == [{"code_station": "S1"}]
+    assert len(calls) == 1
+    assert (cache.stats.stores, cache.stats.hits) == (1, 1)
+
+
+def test_async_transport(tmp_path: Path) -> None:
+    calls: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, content=_body("S1"))
+
+    cache = HttpCache(tmp_path / "cache.sqlite", ttls={"referentiel/sites": 3600.0})
+
+    async def run() -> None:
+        transport = AsyncCacheTransport(httpx.MockTransport(handler), cache)
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(2):
+                resp = await client.get(f"{BASE_URL}/referentiel/sites")
+                assert resp.json()["data"] == [{"code_station": "S1"}]
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    assert cache.stats.hits == 1
@@ -0,0 +1,46 @@
+"""
+Offline tests for the numeric coercion and censoring of analysis results.
+"""
+
+import numpy as np
+
+from hubeau_py.censoring import analysis_results, parse_results
+from hubeau_py.columnar import read_records
+from hubeau_py.models.qualite_rivieres import AnalysePc
+
+
+def test_parse_results() -> None:
+    resultat = np.array(["12.5", 3, None, "<0,5", ">100", "n.d.", 0.2, "0.05"], object)
+    codes = np.array(["1", 1, None, None, None, None, None, "10"], object)
+    results = parse_results(resultat, codes)
+    assert results.values.dtype == np.float64
+    np.testing.assert_array_equal(
+        results.values, [12.5, 3, np.nan, 0.5, 100, np.nan, 0.2, 0.05]
+    )
+    assert results.below_quantification.tolist() == [
+        False,
+        False,
+        False,
+        True,
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert results.above_saturation.tolist()[4]
+    assert not results.below_detection.any()
+    assert results.quantified.tolist() == [True, True] + [False] * 4 + [True, False]
+
+
+def test_limits_apply_without_remark_code() -> None:
+    records = [
+        {"resultat": 0.05, "limite_detection": 0.1, "limite_quantification": 0.5},
+        {"resultat": 0.2, "limite_detection": 0.1, "limite_quantification": 0.5},
+        {"resultat": 0.2, "code_remarque": "1", "limite_quantification": 0.5},
+        {"resultat": 0.1, "code_remarque": "2"},
+        {"resultat": 1.0, "limite_quantification": 0.5},
+    ]
+    results = analysis_results(read_records(records, AnalysePc))
+    assert results.below_detection.tolist() == [True, False, False, True, False]
+    assert results.below_quantification.tolist() == [True, True, False, True, False]
+    assert results.censored.tolist() == [True, True, False, True, False]
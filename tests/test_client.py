@@ -0,0 +1,113 @@
+"""
+Offline tests for the client plumbing, using httpx.MockTransport.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import List
+
+import httpx
+import pytest
+
+from hubeau_py.cache import HttpCache
+from hubeau_py.client import (
+    AsyncHubeauClient,
+    HubeauClient,
+    SimpleHydrometrieClient,
+    SimpleQualiteRivieresClient,
+)
+from hubeau_py.coalesce import CoalescingTransport
+from hubeau_py.models.hydrometrie import ObsElab
+from hubeau_py.ratelimit import AdaptiveRateLimiter
+
+
+def _recording_transport(calls: List[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"count": 0, "data": []})
+
+    return httpx.MockTransport(handler)
+
+
+def test_sub_apis_share_injected_client() -> None:
+    calls: List[httpx.Request] = []
+    http = httpx.Client(transport=_recording_transport(calls))
+    client = HubeauClient(http)
+    assert client.hydrometrie._client is http
+    assert client.qualite_rivieres._client is http
+
+    client.hydrometrie.get_sites(code_departement="95")
+    client.qualite_rivieres.get_stations(libelle_commune="Paris")
+    assert [r.url.path for r in calls] == [
+        "/api/v2/hydrometrie/referentiel/sites",
+        "/api/v2/qualite_rivieres/station_pc",
+    ]
+
+
+def test_context_manager_closes_owned_client_only() -> None:
+    with HubeauClient() as client:
+        owned = client.http
+    assert owned.is_closed
+
+    injected = httpx.Client(transport=_recording_transport([]))
+    with HubeauClient(injected):
+        pass
+    assert not injected.is_closed
+
+
+def test_transport_options_are_rejected_with_an_injected_client(
+    tmp_path: Path,
+) -> None:
+    injected = httpx.Client(transport=_recording_transport([]))
+    with pytest.raises(ValueError, match="cache"):
+        HubeauClient(injected, cache=HttpCache(tmp_path / "cache.sqlite"))
+    with pytest.raises(ValueError, match="retry, coalesce_requests"):
+        HubeauClient(injected, retry=None, coalesce_requests=False)
+    with pytest.raises(ValueError, match="rate_limiter"):
+        AsyncHubeauClient(httpx.AsyncClient(), rate_limiter=AdaptiveRateLimiter())
+
+
+def test_simple_client_uses_injected_client() -> None:
+    calls: List[httpx.Request] = []
+    http = httpx.Client(transport=_recording_transport(calls))
+    simple = SimpleHydrometrieClient(http)
+    assert simple.get_observations_by_station("Y120201001", size=1) == []
+    assert calls[0].url.params["code_station"] == "Y120201001"
+    simple.close()
+    assert not http.is_closed
+
+
+def test_simple_clients_own_a_default_client() -> None:
+    with SimpleQualiteRivieresClient() as simple:
+        owned = simple.hubeau.http
+        assert simple.api._client is owned
+        assert isinstance(owned._transport, CoalescingTransport)
+    assert owned.is_closed
+
+
+def test_async_client_bounds_concurrency() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        code = request.url.params["code_station"]
+        return httpx.Response(200, json={"count": 1, "data": [{"code_station": code}]})
+
+    async def run() -> List[List[ObsElab]]:
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncHubeauClient(http, max_concurrency=3) as client:
+            return await asyncio.gather(
+                *(
+                    client.hydrometrie.get_obs_elab(code_station=f"S{i}")
+                    for i in range(12)
+                )
+            )
+
+    results = asyncio.run(run())
+    assert peak == 3
+    assert [r[0].code_station for r in results] == [f"S{i}" for i in range(12)]
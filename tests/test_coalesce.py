@@ -0,0 +1,111 @@
+"""
+Offline tests for single-flight request coalescing.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import httpx
+import pytest
+
+from hubeau_py.api.hydrometrie import AsyncHydrometrieAPI, HydrometrieAPI
+from hubeau_py.coalesce import AsyncCoalescingTransport, CoalescingTransport
+
+
+def test_identical_concurrent_requests_share_one_call() -> None:
+    calls: List[str] = []
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        release.wait(timeout=5)
+        return httpx.Response(200, json={"count": 1, "data": [{"code_site": "A"}]})
+
+    transport = CoalescingTransport(httpx.MockTransport(handler))
+    api = HydrometrieAPI(httpx.Client(transport=transport))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [
+            pool.submit(api.get_obs_elab, code_station="S", grandeur_hydro_elab="QmJ")
+            for _ in range(8)
+        ]
+        while transport.coalesced < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r[0].code_site == "A" for r in results)
+
+    # Parameter order does not matter, and finished calls are not reused.
+    api.get_obs_elab(grandeur_hydro_elab="QmJ", code_station="S")
+    assert len(calls) == 2
+
+
+def test_followers_receive_the_leader_error() -> None:
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        release.wait(timeout=5)
+        raise httpx.ConnectError("down", request=request)
+
+    transport = CoalescingTransport(httpx.MockTransport(handler))
+    client = httpx.Client(transport=transport)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(client.get, "https://x.org/a") for _ in range(3)]
+        while transport.coalesced < 2:
+            time.sleep(0.001)
+        release.set()
+        for future in futures:
+            with pytest.raises(httpx.ConnectError):
+                future.result()
+
+
+def test_async_coalescing() -> None:
+    calls: List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"count": 0, "data": []})
+
+    async def run() -> int:
+        transport = AsyncCoalescingTransport(httpx.MockTransport(handler))
+        api = AsyncHydrometrieAPI(httpx.AsyncClient(transport=transport))
+        await asyncio.gather(
+            *(api.get_stations(code_station="S") for _ in range(5)),
+            api.get_stations(code_station="T"),
+        )
+        return transport.coalesced
+
+    assert asyncio.run(run()) == 4
+    assert len(calls) == 2
+
+
+def test_cancelled_leader_hands_over_to_a_follower() -> None:
+    calls: List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"count": 0, "data": []})
+
+    async def run() -> httpx.Response:
+        transport = AsyncCoalescingTransport(httpx.MockTransport(handler))
+        client = httpx.AsyncClient(transport=transport)
+        leader = asyncio.create_task(client.get("https://x.org/a"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(client.get("https://x.org/a"))
+        while transport.coalesced < 1:
+            await asyncio.sleep(0.001)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    # The follower is not cancelled with the leader: it sends the request again.
+    assert asyncio.run(run()).json() == {"count": 0, "data": []}
+    assert len(calls) == 2
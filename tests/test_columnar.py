@@ -0,0 +1,198 @@
+"""
+Offline tests for columnar results parsed from CSV pages.
+"""
+
+import asyncio
+import io
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+from hubeau_py.client import AsyncHubeauClient, HubeauClient
+from hubeau_py.columnar import ResultSet, code_array, read_csv
+from hubeau_py.models.hydrometrie import ObservationTr, Station
+from hubeau_py.streaming import ChunkReader
+
+HEADER = "code_station;date_obs;resultat_obs;code_qualification_obs;extra\n"
+PAGES = [
+    HEADER + "K01;2024-01-01T00:05:00Z;1.5;16;a\nK01;2024-01-01T00:00:00Z;;;\n",
+    HEADER + "K01;2024-01-01T00:10:00Z;2.5;20;b\n",
+]
+
+
+def _handler(requests: List[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        page = int(request.url.params.get("page", "1"))
+        headers = {"content-type": "text/csv"}
+        if page < len(PAGES):
+            next_url = request.url.copy_set_param("page", str(page + 1))
+            headers["link"] = f'<{next_url}>; rel="next"'
+        return httpx.Response(206, text=PAGES[page - 1], headers=headers)
+
+    return httpx.MockTransport(handler)
+
+
+def test_read_csv_types_columns_after_the_model() -> None:
+    table = read_csv(io.BytesIO(PAGES[0].encode()), ObservationTr)
+    assert len(table) == 2
+    assert table["code_station"].tolist() == ["K01", "K01"]
+    assert table["resultat_obs"].dtype == np.float64
+    assert np.isnan(table["resultat_obs"][1])
+    assert table["code_qualification_obs"][0] == 16.0
+    assert table["extra"].tolist() == ["a", None]
+
+    csv = b"code_station;en_service\n01;true\n02;\n"
+    stations = read_csv(ChunkReader([csv[:7], csv[7:]]), Station)
+    assert stations["code_station"].tolist() == ["01", "02"]
+    assert stations["en_service"].tolist() == [True, None]
+
+
+def test_code_array() -> None:
+    column = np.array(["16", 20.0, None, "x"], dtype=object)
+    codes = code_array(column, -1)
+    assert codes.dtype == np.int16
+    assert codes.tolist() == [16, 20, -1, -1]
+    assert code_array(pd.Categorical(["1", None]), -1).tolist() == [1, -1]
+
+
+def test_result_set_sorted_and_concat() -> None:
+    table = read_csv(io.BytesIO(PAGES[0].encode()), ObservationTr)
+    ordered = table.sorted_by("date_obs")
+    assert ordered["date_obs"].tolist() == sorted(table["date_obs"].tolist())
+    both = ResultSet.concat([table, ResultSet({"date_obs": np.array(["x"], object)})])
+    assert len(both) == 3
+    assert both["code_station"].tolist() == ["K01", "K01", None]
+    assert list(both.to_pandas().columns) == both.names
+
+
+def test_sorted_by_orders_numbers_and_dates_by_value() -> None:
+    table = ResultSet(
+        {
+            "value": np.array([10.0, 9.0, np.nan, -1.0, 9.0]),
+            "date": np.array(
+                ["2024-01-02", "NaT", "2024-01-01", "2023-12-31", "2024-01-01"],
+                dtype="datetime64[ns]",
+            ),
+            "code": np.array(["b", None, "a", "c", "a"], dtype=object),
+        }
+    )
+    by_value = table.sorted_by("value", "date")
+    assert by_value["value"].tolist()[1:] == [-1.0, 9.0, 9.0, 10.0]
+    assert np.isnan(by_value["value"][0])
+    assert by_value["code"].tolist() == ["a", "c", None, "a", "b"]
+    by_date = table.sorted_by("date", "value")
+    assert by_date["code"].tolist() == [None, "c", "a", "a", "b"]
+    assert table.sorted_by("code", "value")["value"].tolist()[2:] == [9.0, 10.0, -1.0]
+
+
+def test_table_follows_link_header() -> None:
+    requests: List[httpx.Request] = []
+    client = HubeauClient(httpx.Client(transport=_handler(requests)))
+    table = client.hydrometrie.get_observations_tr_table(
+        code_entite="K01", fields=["date_obs", "resultat_obs"]
+    )
+    assert len(table) == 3
+    assert table["resultat_obs"][2] == 2.5
+    assert requests[0].url.path.endswith("/observations_tr.csv")
+    assert requests[0].url.params["fields"] == "date_obs,resultat_obs"
+    assert len(requests) == 2
+
+
+def test_async_table() -> None:
+    async def run() -> ResultSet:
+        http = httpx.AsyncClient(transport=_handler([]))
+        async with AsyncHubeauClient(http) as client:
+            return await client.hydrometrie.get_obs_elab_table()
+
+    assert len(asyncio.run(run())) == 3
+
+
+def test_geojson_stations_table() -> None:
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [1.9, 47.9]},
+            "properties": {"code_station": "01", "durete": 12},
+        },
+        {"type": "Feature", "geometry": None, "properties": {"code_station": "02"}},
+    ]
+    area = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["format"] == "geojson"
+        if request.url.params.get("page") == "2":
+            page = [{"type": "Feature", "geometry": area, "properties": {}}]
+            return httpx.Response(
+                200, json={"type": "FeatureCollection", "features": page}
+            )
+        next_url = str(request.url.copy_set_param("page", "2"))
+        body = {"type": "FeatureCollection", "features": features, "next": next_url}
+        return httpx.Response(200, json=body)
+
+    client = HubeauClient(httpx.Client(transport=httpx.MockTransport(handler)))
+    table = client.qualite_rivieres.get_stations_table(format="geojson")
+    assert table["code_station"].tolist() == ["01", "02", None]
+    assert table["durete"].dtype == np.float64
+    geometry = table["geometry"]
+    assert (geometry[0].x, geometry[0].y) == (1.9, 47.9)
+    assert geometry[1] is None
+    assert geometry[2].geom_type == "Polygon"
+
+
+def test_json_table_rows_and_dictionary_encoding() -> None:
+    pages = [
+        [
+            {
+                "code_station": "K01",
+                "date_obs": "2024-01-01T00:05:00Z",
+                "resultat_obs": 1.5,
+            },
+            {"code_station": "K01", "date_obs": "2024-01-01T00:00:00Z"},
+        ],
+        [{"code_station": "K02", "resultat_obs": "2.5"}],
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("page", "1"))
+        body: Dict[str, Any] = {"count": 3, "data": pages[page - 1]}
+        if page < len(pages):
+            body["next"] = str(request.url.copy_set_param("page", str(page + 1)))
+        return httpx.Response(200, json=body)
+
+    client = HubeauClient(httpx.Client(transport=httpx.MockTransport(handler)))
+    table = client.hydrometrie.get_observations_tr_table(format="json")
+    assert table["resultat_obs"].dtype == np.float64
+    assert table["resultat_obs"][2] == 2.5
+    assert table.row(1) == {
+        "code_station": "K01",
+        "date_obs": "2024-01-01T00:00:00Z",
+        "resultat_obs": None,
+    }
+    assert [row["code_station"] for row in table.rows()] == ["K01", "K01", "K02"]
+
+    encoded = table.dictionary_encode()
+    codes = encoded["code_station"]
+    assert isinstance(codes, pd.Categorical)
+    assert list(codes.categories) == ["K01", "K02"]
+    assert isinstance(encoded["resultat_obs"], np.ndarray)
+    assert list(encoded.rows()) == list(table.rows())
+    assert encoded.to_pandas()["code_station"].dtype == "category"
+
+    both = ResultSet.concat([encoded, table.take(np.array([2, 1]))])
+    assert isinstance(both["code_station"], pd.Categorical)
+    assert [row["code_station"] for row in both.rows()][3:] == ["K02", "K01"]
+    assert both.row(4)["date_obs"] == "2024-01-01T00:00:00Z"
+    assert both.row(3)["date_obs"] is None
+
+
+def test_to_arrow() -> None:
+    pyarrow = pytest.importorskip("pyarrow")
+    table = read_csv(io.BytesIO(PAGES[0].encode()), ObservationTr)
+    arrow = table.dictionary_encode("code_station").to_arrow()
+    assert arrow.num_rows == 2
+    assert pyarrow.types.is_dictionary(arrow.schema.field("code_station").type)
+    assert arrow.column("resultat_obs").null_count == 1
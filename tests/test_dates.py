@@ -0,0 +1,73 @@
+"""
+Offline tests for date parsing, per record and per column.
+"""
+
+import io
+from datetime import datetime, timezone
+
+import numpy as np
+
+from hubeau_py.columnar import ResultSet, read_csv
+from hubeau_py.dates import _parse, parse_datetime, parse_datetimes
+from hubeau_py.models.hydrometrie import ObservationTr
+from hubeau_py.models.qualite_rivieres import AnalysePc, StationPc
+
+UTC = timezone.utc
+
+
+def test_parse_datetime_is_utc_and_memoized() -> None:
+    assert parse_datetime(None) is None
+    assert parse_datetime("2024-01-31") == datetime(2024, 1, 31, tzinfo=UTC)
+    assert parse_datetime("2024-01-31T01:00:00+01:00") == datetime(
+        2024, 1, 31, tzinfo=UTC
+    )
+    hits = _parse.cache_info().hits
+    assert parse_datetime("2024-01-31", "10:30:00") == datetime(
+        2024, 1, 31, 10, 30, tzinfo=UTC
+    )
+    parse_datetime("2024-01-31", "10:30:00")
+    assert _parse.cache_info().hits == hits + 1
+
+
+def test_model_accessors() -> None:
+    analysis = AnalysePc(date_prelevement="2024-01-31", heure_prelevement="10:30:00")
+    assert analysis.datetime_prelevement == datetime(2024, 1, 31, 10, 30, tzinfo=UTC)
+    assert ObservationTr().datetime_obs is None
+    observation = ObservationTr(date_obs="2024-01-01T00:05:00Z")
+    assert observation.datetime_obs == datetime(2024, 1, 1, 0, 5, tzinfo=UTC)
+    analysis = AnalysePc(date_maj_analyse="2024-03-01 12:00:00")
+    assert analysis.datetime_maj_analyse == datetime(2024, 3, 1, 12, tzinfo=UTC)
+    assert StationPc().datetime_maj_information is None
+
+
+def test_parse_datetimes_vectorized() -> None:
+    values = np.array(["2024-01-01T00:05:00Z", None, "bad", "2024-02-01"], object)
+    parsed = parse_datetimes(values)
+    assert parsed.dtype == np.dtype("datetime64[ns]")
+    assert parsed[0] == np.datetime64("2024-01-01T00:05:00")
+    assert np.isnat(parsed[1]) and np.isnat(parsed[2])
+    assert parsed[3] == np.datetime64("2024-02-01T00:00:00")
+
+
+def test_result_set_parse_dates() -> None:
+    csv = (
+        b"code_station;date_prelevement;heure_prelevement;date_maj_analyse\n"
+        b"01;2024-01-02;10:30:00;2024-03-01 12:00:00\n"
+        b"01;2024-01-01;;\n"
+    )
+    table = read_csv(io.BytesIO(csv), AnalysePc).parse_dates()
+    assert table["date_prelevement"][0] == np.datetime64("2024-01-02T10:30")
+    assert np.isnat(table["date_maj_analyse"][1])
+    assert table["heure_prelevement"][0] == "10:30:00"
+    assert str(table.to_pandas()["date_prelevement"].dtype) == "datetime64[ns, UTC]"
+    ordered = table.sorted_by("date_prelevement")
+    assert ordered["heure_prelevement"].tolist() == [None, "10:30:00"]
+    both = ResultSet.concat(
+        [table, ResultSet({"code_station": np.array(["02"], object)})]
+    )
+    assert both["date_prelevement"].dtype.kind == "M"
+    assert both.row(2)["date_prelevement"] is None
+    assert list(both.rows()) == [both.row(i) for i in range(len(both))]
+    first = next(both.rows())["date_prelevement"]
+    assert isinstance(first, np.datetime64)
+    assert isinstance(both.row(0)["date_prelevement"], np.datetime64)
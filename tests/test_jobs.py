@@ -0,0 +1,124 @@
+"""
+Offline tests for resumable bulk extraction jobs.
+"""
+
+import json
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from hubeau_py.api.qualite_rivieres import QualiteRivieresAPI
+from hubeau_py.jobs import Job, JsonlSink, Manifest, Shard, station_window_shards
+from hubeau_py.sharding import ANALYSE_PC_WINDOWS, calendar_years
+
+
+def test_station_window_shards() -> None:
+    shards = station_window_shards(
+        "analyse_pc", ["S1", "S2"], ANALYSE_PC_WINDOWS, calendar_years(2020, 2021)
+    )
+    assert [s.id for s in shards] == [
+        "S1_2020-01-01_2020-12-31",
+        "S1_2021-01-01_2021-12-31",
+        "S2_2020-01-01_2020-12-31",
+        "S2_2021-01-01_2021-12-31",
+    ]
+    assert shards[1].params == {
+        "code_station": "S1",
+        "date_debut_prelevement": "2021-01-01",
+        "date_fin_prelevement": "2021-12-31",
+    }
+
+
+def test_job_resumes_where_it_failed(tmp_path: Path) -> None:
+    requests: List[str] = []
+    fail = {"S2": True}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        code = request.url.params["code_station"]
+        page = int(request.url.params.get("page", 1))
+        requests.append(f"{code}:{page}")
+        if code == "S2" and page == 2 and fail.pop("S2", False):
+            return httpx.Response(503)
+        data = [{"code_station": code, "resultat": 10 * page + i} for i in range(2)]
+        body: Dict[str, Any] = {"count": 6, "data": data, "next": None}
+        if page < 3:
+            body["next"] = str(request.url.copy_merge_params({"page": page + 1}))
+        return httpx.Response(200, json=body)
+
+    api = QualiteRivieresAPI(httpx.Client(transport=httpx.MockTransport(handler)))
+    shards = station_window_shards(
+        "analyse_pc", ["S1", "S2"], ANALYSE_PC_WINDOWS, [(date(2020, 1, 1),) * 2]
+    )
+    sink = JsonlSink(tmp_path / "out")
+    job = Job(api, shards, tmp_path / "manifest.json", sink)
+
+    report = job.run(workers=2)
+    assert (report.completed, report.records) == (1, 8)
+    assert list(report.failed) == ["S2_2020-01-01_2020-01-01"]
+
+    # A fresh job over the same manifest skips S1 and resumes S2 at page 2.
+    requests.clear()
+    job = Job(api, shards, tmp_path / "manifest.json", sink)
+    report = job.run()
+    assert (report.completed, report.skipped, report.records) == (1, 1, 4)
+    assert requests == ["S2:2", "S2:3"]
+
+    lines = sink.path(shards[1]).read_text().splitlines()
+    resultats = [json.loads(line)["resultat"] for line in lines]
+    assert resultats == [10, 11, 20, 21, 30, 31]
+    assert Job(api, shards, tmp_path / "manifest.json", sink).run().skipped == 2
+
+
+def _paged_handler(request: httpx.Request) -> httpx.Response:
+    code = request.url.params["code_station"]
+    page = int(request.url.params.get("page", 1))
+    data = [{"code_station": code, "resultat": page}]
+    body: Dict[str, Any] = {"count": 2, "data": data, "next": None}
+    if page < 2:
+        body["next"] = str(request.url.copy_merge_params({"page": page + 1}))
+    return httpx.Response(200, json=body)
+
+
+def test_sink_errors_fail_the_shard_only(tmp_path: Path) -> None:
+    api = QualiteRivieresAPI(
+        httpx.Client(transport=httpx.MockTransport(_paged_handler))
+    )
+    shards = station_window_shards(
+        "analyse_pc", ["S1", "S2"], ANALYSE_PC_WINDOWS, [(date(2020, 1, 1),) * 2]
+    )
+    delivered: List[Any] = []
+    fail = {"S1": True}
+
+    def sink(shard: Shard, records: List[Dict[str, Any]]) -> None:
+        if shard is shards[0] and records[0]["resultat"] == 2 and fail.pop("S1", 0):
+            raise OSError("disk full")
+        delivered.extend((r["code_station"], r["resultat"]) for r in records)
+
+    report = Job(api, shards, tmp_path / "manifest.json", sink).run(workers=2)
+    assert report.failed == {shards[0].id: "OSError: disk full"}
+    assert report.completed == 1
+
+    # The page the sink failed on is delivered on resume, the first one is not.
+    report = Job(api, shards, tmp_path / "manifest.json", sink).run()
+    assert (report.completed, report.skipped) == (1, 1)
+    assert [d for d in delivered if d[0] == "S1"] == [("S1", 1), ("S1", 2)]
+
+
+def test_manifest_replays_its_log(tmp_path: Path) -> None:
+    manifest = Manifest(tmp_path / "manifest.json")
+    manifest.state("a")["records"] = 3
+    manifest.record("a")
+    manifest.state("b")["status"] = "done"
+    manifest.record("b")
+    # A crash before `save` leaves the log, maybe with a partial last line.
+    with open(manifest.log_path, "a") as f:
+        f.write('{"id": "a", "sta')
+
+    reloaded = Manifest(tmp_path / "manifest.json")
+    assert reloaded.state("a")["records"] == 3
+    assert reloaded.state("b")["status"] == "done"
+    reloaded.save()
+    assert not reloaded.log_path.exists()
+    assert Manifest(tmp_path / "manifest.json").shards == reloaded.shards
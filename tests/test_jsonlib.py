@@ -0,0 +1,41 @@
+"""
+Offline tests for the pluggable JSON backends.
+"""
+
+import json
+from typing import Any, Dict
+
+import httpx
+import pytest
+
+from hubeau_py.client import HubeauClient
+from hubeau_py.jsonlib import STDLIB, get_backend
+
+
+def test_get_backend() -> None:
+    assert get_backend("json") is STDLIB
+    assert get_backend(STDLIB) is STDLIB
+    assert get_backend("auto").name in ("json", "orjson", "msgspec")
+    with pytest.raises(ValueError):
+        get_backend("yaml")
+
+
+@pytest.mark.parametrize("name", ["json", "auto"])
+def test_backends_round_trip(name: str) -> None:
+    backend = get_backend(name)
+    record: Dict[str, Any] = {"libelle": "Température", "resultat": 1.5, "n": None}
+    assert backend.loads(backend.dumps(record)) == record
+    assert json.loads(backend.dumps([record], indent=True)) == [record]
+
+
+def test_client_decodes_with_the_chosen_backend() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        data = [{"code_station": "S1", "libelle_station": "Orléans"}]
+        return httpx.Response(200, json={"count": 1, "data": data, "next": None})
+
+    http = httpx.Client(transport=httpx.MockTransport(handler))
+    client = HubeauClient(http, json_backend="auto")
+    stations = client.qualite_rivieres.get_stations()
+    assert [s.libelle_station for s in stations] == ["Orléans"]
+    stations = list(client.qualite_rivieres.iter_stations())
+    assert [s.code_station for s in stations] == ["S1"]
@@ -0,0 +1,65 @@
+"""
+Offline tests for label interning and dictionary encoding.
+"""
+
+import io
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from hubeau_py.columnar import read_csv, read_records
+from hubeau_py.labels import interner, label_fields
+from hubeau_py.models.qualite_rivieres import AnalysePc
+from hubeau_py.validation import Validation
+
+
+def _items() -> List[Dict[str, Any]]:
+    # Built at runtime so that equal strings are distinct objects, as decoded.
+    return [
+        {
+            "libelle_parametre": "".join(["Nitr", "ates"]),
+            "nom_reseau": ["".join(["RC", "S"])],
+            "code_parametre": "".join(["13", "40"]),
+        }
+        for _ in range(2)
+    ]
+
+
+def test_interner_shares_label_strings() -> None:
+    names = label_fields(AnalysePc)
+    assert "libelle_parametre" in names and "code_parametre" not in names
+    intern = interner(names)
+    first, second = (intern(item) for item in _items())
+    assert first["libelle_parametre"] is second["libelle_parametre"]
+    assert first["nom_reseau"][0] is second["nom_reseau"][0]
+    assert first["code_parametre"] is not second["code_parametre"]
+
+
+def test_validation_interns_when_asked() -> None:
+    for mode in ("full", "trusted", "lazy"):
+        make = Validation(mode, intern=True).factory(AnalysePc)
+        first, second = (make(item) for item in _items())
+        assert first.libelle_parametre is second.libelle_parametre
+    make = Validation().factory(AnalysePc)
+    first, second = (make(item) for item in _items())
+    assert first.libelle_parametre is not second.libelle_parametre
+    assert first.libelle_parametre == second.libelle_parametre
+
+
+def test_label_columns_are_dictionary_encoded() -> None:
+    table = read_records(_items() + [{"code_parametre": "1301"}], AnalysePc)
+    labels = table["libelle_parametre"]
+    assert isinstance(labels, pd.Categorical)
+    assert list(labels.categories) == ["Nitrates"]
+    assert table.row(2)["libelle_parametre"] is None
+    assert table["code_parametre"].dtype == object
+    assert table["nom_reseau"].dtype == object
+
+    csv = b"libelle_station;code_station\nLOIRE;01\nLOIRE;01\n;02\n"
+    stations = read_csv(io.BytesIO(csv), AnalysePc)
+    assert isinstance(stations["libelle_station"], pd.Categorical)
+    assert [row["libelle_station"] for row in stations.rows()] == [
+        "LOIRE",
+        "LOIRE",
+        None,
+    ]
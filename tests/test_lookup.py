@@ -0,0 +1,61 @@
+"""
+Offline tests for the in-memory referentiel lookups.
+"""
+
+from typing import Any, Dict, List
+
+import httpx
+
+from hubeau_py.client import SimpleQualiteRivieresClient
+from hubeau_py.lookup import CodeLookup, LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used_and_expires() -> None:
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.find("a") == (True, 1)
+    cache.set("c", 3)
+    assert cache.find("b") == (False, None)
+    assert cache.find("a") == (True, 1)
+
+    expired: LRUCache[str, int] = LRUCache(ttl=-1)
+    expired.set("a", 1)
+    assert expired.find("a") == (False, None)
+
+
+def test_code_lookup_only_fetches_missing_codes() -> None:
+    batches: List[List[str]] = []
+
+    def fetch(codes: List[str]) -> List[Dict[str, str]]:
+        batches.append(codes)
+        return [{"code": c} for c in codes if c != "unknown"]
+
+    lookup: CodeLookup[Dict[str, str]] = CodeLookup(
+        fetch, lambda r: r["code"], batch_size=2
+    )
+    assert set(lookup.get_many(["a", "b", "c"])) == {"a", "b", "c"}
+    assert batches == [["a", "b"], ["c"]]
+
+    assert set(lookup.get_many(["a", "d", "unknown"])) == {"a", "d"}
+    assert lookup.get("unknown") is None
+    assert batches[2:] == [["d", "unknown"]]
+
+
+def test_simple_client_bulk_station_lookup() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        codes = request.url.params["code_station"].split(",")
+        data: List[Any] = [{"code_station": c, "libelle_station": c} for c in codes]
+        return httpx.Response(200, json={"count": len(data), "data": data})
+
+    simple = SimpleQualiteRivieresClient(
+        httpx.Client(transport=httpx.MockTransport(handler))
+    )
+    stations = simple.get_stations_by_codes(["A", "B"])
+    assert stations["A"].libelle_station == "A"
+    assert simple.get_station("B") is stations["B"]
+    simple.get_stations_by_codes(["B", "C"])
+    assert [r.url.params["code_station"] for r in requests] == ["A,B", "C"]
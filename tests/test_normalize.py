@@ -0,0 +1,84 @@
+"""
+Offline tests for the fact/dimension split of analyses.
+"""
+
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+
+from hubeau_py.client import HubeauClient
+from hubeau_py.columnar import read_records
+from hubeau_py.models.qualite_rivieres import AnalysePc
+from hubeau_py.normalize import MISSING_ID, normalize_analyses
+
+ANALYSES: List[Dict[str, Any]] = [
+    {
+        "code_station": "01",
+        "libelle_station": "LOIRE",
+        "code_parametre": "1340",
+        "libelle_parametre": "Nitrates",
+        "code_unite": "162",
+        "date_prelevement": "2024-01-02",
+        "heure_prelevement": "10:30:00",
+        "resultat": "12.5",
+        "code_remarque": "1",
+        "code_reseau": ["R1", "R2"],
+        "nom_reseau": ["Réseau 1", "Réseau 2"],
+    },
+    {
+        "code_station": "01",
+        "libelle_station": "LOIRE",
+        "code_parametre": "1301",
+        "code_unite": "27",
+        "date_prelevement": "2024-01-03",
+        "resultat": "<LQ",
+        "code_remarque": "10",
+        "code_reseau": ["R2"],
+        "nom_reseau": ["Réseau 2"],
+    },
+    {"code_station": "02", "code_parametre": "1340", "resultat": 3},
+]
+
+
+def test_normalize_analyses() -> None:
+    split = normalize_analyses(read_records(ANALYSES, AnalysePc))
+    facts = split.facts
+    assert facts["station"].tolist() == [0, 0, 1]
+    assert facts["parameter"].tolist() == [0, 1, 0]
+    assert facts["unit"].tolist() == [0, 1, MISSING_ID]
+    assert facts["datetime"][0] == np.datetime64("2024-01-02T10:30")
+    assert np.isnat(facts["datetime"][2])
+    assert np.isnan(facts["resultat"][1]) and facts["resultat"][2] == 3.0
+    assert facts["below_quantification"].tolist() == [False, True, False]
+    assert facts["code_remarque"].tolist() == [1, 10, MISSING_ID]
+
+    stations = split.dimensions["stations"]
+    assert [row["code_station"] for row in stations.rows()] == ["01", "02"]
+    assert stations.row(0)["libelle_station"] == "LOIRE"
+    assert split.dimensions["parameters"].row(0)["libelle_parametre"] == "Nitrates"
+    assert "methods" not in split.dimensions
+
+    networks = split.dimensions["networks"]
+    assert list(networks.rows()) == [
+        {"code_reseau": "R1", "nom_reseau": "Réseau 1"},
+        {"code_reseau": "R2", "nom_reseau": "Réseau 2"},
+    ]
+    link = split.links["networks"]
+    assert link["fact"].tolist() == [0, 0, 1]
+    assert link["network"].tolist() == [0, 1, 1]
+
+
+def test_client_requests_only_normalized_fields() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"count": 3, "data": ANALYSES})
+
+    client = HubeauClient(httpx.Client(transport=httpx.MockTransport(handler)))
+    split = client.qualite_rivieres.get_analyses_normalized("01", format="json")
+    assert len(split.facts) == 3
+    fields = requests[0].url.params["fields"].split(",")
+    assert "code_reseau" in fields and "resultat" in fields
+    assert "commentaires_analyse" not in fields
@@ -0,0 +1,127 @@
+"""
+Offline tests for paginated iteration, using httpx.MockTransport.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+from hubeau_py.api.hydrometrie import AsyncHydrometrieAPI, HydrometrieAPI
+from hubeau_py.api.qualite_rivieres import AsyncQualiteRivieresAPI, QualiteRivieresAPI
+
+
+def _paged_handler(total: int, requests: List[httpx.Request]) -> Any:
+    """Serve `total` records, `size` per page, linking pages through `next`."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        size = int(request.url.params.get("size", 10))
+        page = int(request.url.params.get("page", 1))
+        first = (page - 1) * size
+        data = [
+            {"code_station": f"S{i}", "resultat": i}
+            for i in range(first, min(first + size, total))
+        ]
+        body: Dict[str, Any] = {"count": total, "data": data, "next": None}
+        if first + size < total:
+            body["next"] = str(request.url.copy_merge_params({"page": page + 1}))
+        return httpx.Response(200, json=body)
+
+    return handler
+
+
+def test_iter_analyses_follows_next_link() -> None:
+    requests: List[httpx.Request] = []
+    http = httpx.Client(transport=httpx.MockTransport(_paged_handler(25, requests)))
+    api = QualiteRivieresAPI(http)
+
+    analyses = api.iter_analyses("S", size=10)
+    first = next(analyses)
+    assert first.code_station == "S0"
+    assert len(requests) == 1  # pages are fetched lazily
+
+    rest = list(analyses)
+    assert [a.resultat for a in rest] == list(range(1, 25))
+    assert [r.url.params["page"] for r in requests[1:]] == ["2", "3"]
+
+
+def test_get_analyses_stops_at_max_records() -> None:
+    requests: List[httpx.Request] = []
+    http = httpx.Client(transport=httpx.MockTransport(_paged_handler(100, requests)))
+    analyses = QualiteRivieresAPI(http).get_analyses("S", size=10, max_records=15)
+    assert len(analyses) == 15
+    assert len(requests) == 2
+
+
+def test_async_iter_stations_follows_next_link() -> None:
+    requests: List[httpx.Request] = []
+    sync_handler = _paged_handler(7, requests)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        response: httpx.Response = sync_handler(request)
+        return response
+
+    async def run() -> List[str]:
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        api = AsyncHydrometrieAPI(http)
+        return [
+            o.code_station or ""
+            async for o in api.iter_obs_elab(code_station="S", size=3)
+        ]
+
+    assert asyncio.run(run()) == [f"S{i}" for i in range(7)]
+    assert len(requests) == 3
+
+
+def test_sync_hydrometrie_iterators_share_pagination() -> None:
+    requests: List[httpx.Request] = []
+    http = httpx.Client(transport=httpx.MockTransport(_paged_handler(5, requests)))
+    obs = list(HydrometrieAPI(http).iter_observations_tr(size=2))
+    assert len(obs) == 5
+    assert len(requests) == 3
+
+
+def test_prefetch_fetches_pages_concurrently_in_order() -> None:
+    requests: List[httpx.Request] = []
+    serve = _paged_handler(95, requests)
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        response: httpx.Response = serve(request)
+        return response
+
+    http = httpx.Client(transport=httpx.MockTransport(handler))
+    analyses = QualiteRivieresAPI(http).iter_analyses("S", size=10, prefetch=4)
+    assert [a.resultat for a in analyses] == list(range(95))
+    assert len(requests) == 10
+    assert 1 < peak <= 4
+
+
+def test_async_prefetch_yields_in_order() -> None:
+    requests: List[httpx.Request] = []
+    sync_handler = _paged_handler(42, requests)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.001 * (10 - int(request.url.params.get("page", 1))))
+        response: httpx.Response = sync_handler(request)
+        return response
+
+    async def run() -> List[Any]:
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        api = AsyncQualiteRivieresAPI(http)
+        return [a.resultat async for a in api.iter_analyses("S", size=5, prefetch=3)]
+
+    assert asyncio.run(run()) == list(range(42))
+    assert len(requests) == 9
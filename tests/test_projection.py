@@ -0,0 +1,82 @@
+"""
+Offline tests for field projection (`fields=`).
+"""
+
+import pickle
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from hubeau_py.client import HubeauClient
+from hubeau_py.models.hydrometrie import Site
+from hubeau_py.models.qualite_rivieres import AnalysePc
+from hubeau_py.projection import fields_param, project
+
+
+def _client(requests: List[httpx.Request], data: List[Dict[str, Any]]) -> HubeauClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"count": len(data), "data": data})
+
+    return HubeauClient(httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def test_project() -> None:
+    assert project(Site, None) is Site
+    partial = project(Site, ["code_site", "libelle_site"])
+    assert project(Site, ["libelle_site", "code_site"]) is partial
+
+    site = partial.model_validate({"code_site": "K4373110", "libelle_site": "Loire"})
+    assert isinstance(site, Site)
+    assert site.libelle_site == "Loire"
+    assert site.code_cours_eau is None
+    with pytest.raises(ValueError):
+        partial.model_validate({"libelle_site": "Loire"})
+    with pytest.raises(ValueError):
+        project(Site, ["code_site", "not_a_field"])
+
+
+def test_fields_param() -> None:
+    assert fields_param({"size": 10}, None) == {"size": 10}
+    params = fields_param({"size": 10}, ["libelle_site", "code_site"], "code_site")
+    assert params == {"size": 10, "fields": "libelle_site,code_site"}
+
+
+def test_api_requests_and_validates_selected_fields() -> None:
+    requests: List[httpx.Request] = []
+    data = [{"code_site": "K4373110", "libelle_site": "Loire"}]
+    client = _client(requests, data)
+
+    sites = list(
+        client.hydrometrie.iter_all_sites(shards=["45"], fields=["libelle_site"])
+    )
+    assert [s.libelle_site for s in sites] == ["Loire"]
+    assert requests[-1].url.params["fields"] == "libelle_site,code_site"
+
+    with pytest.raises(ValueError):
+        client.hydrometrie.get_sites(fields=["libelle"])
+
+
+def test_analyses_with_fields() -> None:
+    requests: List[httpx.Request] = []
+    data = [{"code_parametre": "1340", "resultat": 12.5}]
+    client = _client(requests, data)
+
+    analyses = client.qualite_rivieres.get_analyses(
+        "04143000", fields=["code_parametre", "resultat"]
+    )
+    assert isinstance(analyses[0], AnalysePc)
+    assert (analyses[0].code_parametre, analyses[0].resultat) == ("1340", 12.5)
+    assert analyses[0].libelle_station is None
+    assert requests[0].url.params["fields"] == "code_parametre,resultat"
+
+
+def test_projected_records_pickle() -> None:
+    partial = project(Site, ["code_site", "libelle_site"])
+    assert partial.__name__ == "SiteProjection"
+    site = partial.model_validate({"code_site": "K4373110", "libelle_site": "Loire"})
+    assert repr(site).startswith("SiteProjection(")
+    copy = pickle.loads(pickle.dumps(site))
+    assert type(copy) is partial
+    assert copy == site
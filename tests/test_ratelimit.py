@@ -0,0 +1,78 @@
+"""
+Offline tests for the adaptive rate limiter.
+"""
+
+import asyncio
+from typing import List
+
+import httpx
+
+from hubeau_py.api.hydrometrie import AsyncHydrometrieAPI, HydrometrieAPI
+from hubeau_py.ratelimit import (
+    AdaptiveRateLimiter,
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+)
+
+
+def test_aimd_decreases_on_throttling_and_recovers() -> None:
+    limiter = AdaptiveRateLimiter(rate=8.0, concurrency=8, cooldown=60.0)
+    limiter.record(429, 0.1)
+    assert limiter.rate == 4.0
+    assert limiter.concurrency == 4
+
+    # A burst of failures within the cooldown counts as a single congestion event.
+    limiter.record(503, 0.1)
+    assert limiter.rate == 4.0
+
+    for _ in range(4):
+        limiter.record(200, 0.1)
+    assert limiter.rate > 4.0
+    assert limiter.concurrency == 5
+
+
+def test_slow_responses_do_not_increase_rate() -> None:
+    limiter = AdaptiveRateLimiter(rate=2.0, latency_target=1.0)
+    limiter.record(200, 5.0)
+    assert limiter.rate == 2.0
+
+
+def test_transport_feeds_limiter_and_releases_slots() -> None:
+    statuses = iter([429, 200, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), json={"count": 0, "data": []})
+
+    limiter = AdaptiveRateLimiter(rate=100.0, concurrency=2)
+    transport = RateLimitedTransport(httpx.MockTransport(handler), limiter)
+    api = HydrometrieAPI(httpx.Client(transport=transport))
+
+    try:
+        api.get_sites()
+    except httpx.HTTPStatusError as exc:
+        assert exc.response.status_code == 429
+    assert limiter.rate == 50.0
+    assert limiter.concurrency == 1
+
+    api.get_sites()
+    api.get_sites()
+    assert limiter.in_flight == 0
+
+
+def test_limiter_is_shared_with_async_clients() -> None:
+    limiter = AdaptiveRateLimiter(rate=1000.0, concurrency=2, max_concurrency=2)
+    peak: List[int] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        peak.append(limiter.in_flight)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"count": 0, "data": []})
+
+    async def run() -> None:
+        transport = AsyncRateLimitedTransport(httpx.MockTransport(handler), limiter)
+        api = AsyncHydrometrieAPI(httpx.AsyncClient(transport=transport))
+        await asyncio.gather(*(api.get_sites() for _ in range(6)))
+
+    asyncio.run(run())
+    assert max(peak) == 2
+    assert limiter.in_flight == 0
@@ -0,0 +1,108 @@
+"""
+Offline tests for the retry policy and resumable pagination.
+"""
+
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from hubeau_py.api.qualite_rivieres import QualiteRivieresAPI
+from hubeau_py.exceptions import PaginationError
+from hubeau_py.retry import RetryPolicy, RetryTransport, _parse_retry_after
+
+NO_WAIT = RetryPolicy(backoff_factor=0.0, jitter=False)
+
+
+def _client(handler: Any, policy: RetryPolicy = NO_WAIT) -> httpx.Client:
+    return httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), policy))
+
+
+def test_retries_throttled_responses_until_success() -> None:
+    statuses = iter([429, 503, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), headers={"Retry-After": "0"})
+
+    assert _client(handler).get("https://example.org").status_code == 200
+
+
+def test_gives_up_after_status_budget() -> None:
+    calls: List[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        return httpx.Response(500)
+
+    policy = RetryPolicy(statuses={500: 2}, backoff_factor=0.0)
+    assert _client(handler, policy).get("https://example.org").status_code == 500
+    assert len(calls) == 2
+
+
+def test_transport_errors_follow_per_class_rules() -> None:
+    calls: List[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        if len(calls) < 3:
+            raise httpx.ConnectError("boom", request=request)
+        return httpx.Response(200)
+
+    assert _client(handler).get("https://example.org").status_code == 200
+
+    calls.clear()
+    policy = RetryPolicy(exceptions={httpx.ConnectError: 1}, backoff_factor=0.0)
+    with pytest.raises(httpx.ConnectError):
+        _client(handler, policy).get("https://example.org")
+    assert len(calls) == 1
+
+
+def test_non_idempotent_requests_are_not_retried() -> None:
+    calls: List[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        return httpx.Response(503)
+
+    _client(handler).post("https://example.org")
+    assert len(calls) == 1
+
+
+def test_parse_retry_after() -> None:
+    assert _parse_retry_after("12") == 12.0
+    assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert _parse_retry_after("soon") is None
+
+
+def test_iterator_resumes_at_failed_page() -> None:
+    failing = {"page": "3"}
+    pages_served: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = request.url.params.get("page", "1")
+        if failing and page == failing["page"]:
+            return httpx.Response(500)
+        pages_served.append(page)
+        body: Dict[str, Any] = {
+            "count": 40,
+            "data": [{"resultat": (int(page) - 1) * 10 + i} for i in range(10)],
+            "next": None,
+        }
+        if int(page) < 4:
+            body["next"] = str(request.url.copy_set_param("page", int(page) + 1))
+        return httpx.Response(200, json=body)
+
+    api = QualiteRivieresAPI(_client(handler, RetryPolicy(statuses={})))
+    seen: List[Any] = []
+    with pytest.raises(PaginationError) as info:
+        for analysis in api.iter_analyses("S", size=10):
+            seen.append(analysis.resultat)
+    assert seen == list(range(20))
+    assert httpx.URL(info.value.resume_from).params["page"] == "3"
+
+    failing.clear()
+    seen.extend(
+        a.resultat for a in api.iter_analyses(resume_from=info.value.resume_from)
+    )
+    assert seen == list(range(40))
+    assert pages_served == ["1", "2", "3", "4"]
@@ -0,0 +1,72 @@
+"""
+Offline tests for compact per-station observation series.
+"""
+
+import io
+
+import httpx
+import numpy as np
+
+from hubeau_py.client import HubeauClient
+from hubeau_py.columnar import read_csv
+from hubeau_py.models.hydrometrie import ObservationTr
+from hubeau_py.series import OBSERVATIONS_TR_SERIES, station_series
+
+CSV = (
+    "code_site;code_station;grandeur_hydro;date_obs;resultat_obs;"
+    "code_qualification_obs;libelle_qualification_obs;code_statut;libelle_statut;"
+    "code_methode_obs;latitude\n"
+    "K0;K01;H;2024-01-01T00:05:00Z;1.5;16;Non qualifiée;4;Brute;0;47.1\n"
+    "K0;K01;H;2024-01-01T00:00:00Z;;;;4;Brute;12;47.1\n"
+    "K0;K01;Q;2024-01-01T00:00:00Z;3;20;Bonne;4;Brute;0;47.1\n"
+    "K0;K02;H;2024-01-01T00:00:00Z;9;20;Bonne;4;Brute;0;48\n"
+)
+
+
+def test_station_series_packs_observations() -> None:
+    table = read_csv(io.BytesIO(CSV.encode()), ObservationTr)
+    series = station_series(table, OBSERVATIONS_TR_SERIES)
+    assert [(s.header["code_station"], s.header["grandeur_hydro"]) for s in series] == [
+        ("K01", "H"),
+        ("K01", "Q"),
+        ("K02", "H"),
+    ]
+    first = series[0]
+    assert first.header == {
+        "code_site": "K0",
+        "code_station": "K01",
+        "grandeur_hydro": "H",
+        "latitude": 47.1,
+    }
+    assert first.dates.dtype == np.dtype("datetime64[s]")
+    assert first.dates.tolist()[0].minute == 0
+    assert np.isnan(first.values[0]) and first.values[1] == 1.5
+    assert first.codes["qualification"].tolist() == [-1, 16]
+    assert first.codes["status"].dtype == np.int16
+    assert first.labels["code_qualification_obs"] == {16: "Non qualifiée"}
+    assert first.extra["code_methode_obs"].tolist() == [12, 0]
+    assert series[1].header["code_methode_obs"] == 0
+    assert first.nbytes == 2 * (8 + 8 + 2 + 2 + 2)
+    frame = first.to_pandas()
+    assert str(frame.index.tz) == "UTC"
+    assert list(frame.columns) == [
+        "value",
+        "qualification",
+        "status",
+        "code_methode_obs",
+    ]
+
+
+def test_client_observations_tr_series() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path.endswith("/observations_tr.csv")
+        return httpx.Response(200, text=CSV, headers={"content-type": "text/csv"})
+
+    client = HubeauClient(httpx.Client(transport=httpx.MockTransport(handler)))
+    series = client.hydrometrie.get_observations_tr_series(code_entite="K01")
+    assert len(series) == 3
+    assert len(series[0]) == 2
+    assert (
+        station_series(read_csv(io.BytesIO(b""), ObservationTr), OBSERVATIONS_TR_SERIES)
+        == []
+    )
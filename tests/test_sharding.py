@@ -0,0 +1,326 @@
+"""
+Offline tests for time-window sharding past the API depth limit.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from hubeau_py.api import base
+from hubeau_py.api.hydrometrie import AsyncHydrometrieAPI
+from hubeau_py.api.qualite_rivieres import (
+    AsyncQualiteRivieresAPI,
+    QualiteRivieresAPI,
+)
+from hubeau_py.exceptions import DepthLimitWarning
+from hubeau_py.sharding import (
+    ANALYSE_PC_WINDOWS,
+    OBSERVATIONS_TR_WINDOWS,
+    bbox_tiles,
+    plan_windows,
+)
+
+START = date(2020, 1, 1)
+
+
+def _dated_handler(
+    field: str, start_param: str, end_param: str, requests: List[httpx.Request]
+) -> Any:
+    """Serve 3 records a day over 60 days, filtered by date, newest first.
+
+    Like the API, pages past the depth limit are refused.
+    """
+    days = [(START + timedelta(days=d)).isoformat() for d in range(60)]
+    records = [{field: day, "resultat": i} for day in days for i in range(3)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        params = request.url.params
+        lo, hi = params[start_param][:10], params[end_param][:10]
+        matching = [r for r in reversed(records) if lo <= r[field] <= hi]
+        size = int(params.get("size", 10))
+        page = int(params.get("page", 1))
+        if page * size > base.MAX_RESULT_DEPTH:
+            return httpx.Response(400, json={"message": "too deep"})
+        data = matching[(page - 1) * size : page * size]
+        body: Dict[str, Any] = {"count": len(matching), "data": data, "next": None}
+        if page * size < len(matching):
+            body["next"] = str(request.url.copy_merge_params({"page": page + 1}))
+        return httpx.Response(200, json=body)
+
+    return handler
+
+
+def test_plan_windows_bisects_until_under_limit() -> None:
+    def count(window: Any) -> int:
+        start, end = window
+        return 10 * ((end - start).days + 1)
+
+    planned = plan_windows(count, ANALYSE_PC_WINDOWS, (START, date(2020, 1, 8)), 25)
+    assert [(s.day, e.day) for s, e in planned] == [(1, 2), (3, 4), (5, 6), (7, 8)]
+
+
+def test_datetime_windows_do_not_overlap() -> None:
+    window = OBSERVATIONS_TR_WINDOWS.bounds((START, START))
+    assert window == (datetime(2020, 1, 1), datetime(2020, 1, 1, 23, 59, 59))
+    halves = OBSERVATIONS_TR_WINDOWS.split(window)
+    assert halves is not None
+    (_, left_end), (right_start, _) = halves
+    assert right_start - left_end == timedelta(seconds=1)
+
+
+def test_iter_analyses_with_date_range(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(base, "MAX_RESULT_DEPTH", 50)
+    requests: List[httpx.Request] = []
+    handler = _dated_handler(
+        "date_prelevement",
+        "date_debut_prelevement",
+        "date_fin_prelevement",
+        requests,
+    )
+    api = QualiteRivieresAPI(httpx.Client(transport=httpx.MockTransport(handler)))
+
+    date_range = (START, START + timedelta(days=59))
+    analyses = api.get_analyses(
+        "S", size=20, max_records=None, prefetch=4, date_range=date_range
+    )
+    dates = [a.date_prelevement for a in analyses]
+    assert len(dates) == 180
+    assert dates == sorted(dates)
+    # Every window stayed under the depth limit.
+    assert max(int(r.url.params.get("page", 1)) for r in requests) <= 3
+
+
+def test_async_obs_elab_with_date_range(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(base, "MAX_RESULT_DEPTH", 40)
+    requests: List[httpx.Request] = []
+    handler = _dated_handler(
+        "date_obs_elab", "date_debut_obs_elab", "date_fin_obs_elab", requests
+    )
+
+    async def run() -> List[str]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            api = AsyncHydrometrieAPI(http)
+            date_range = (START + timedelta(days=10), START + timedelta(days=29))
+            obs = await api.get_obs_elab(date_range=date_range, prefetch=3, size=15)
+            return [o.date_obs_elab or "" for o in obs]
+
+    dates = asyncio.run(run())
+    assert len(dates) == 60
+    assert dates == sorted(dates)
+    assert dates[0] == "2020-01-11" and dates[-1] == "2020-01-30"
+
+
+def test_iter_all_stations_shards_and_dedupes() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        dept = request.url.params["code_departement"]
+        # Station "shared" lies on a border and is returned by both shards.
+        codes = [f"{dept}-{i}" for i in range(3)] + ["shared"]
+        data = [{"code_station": code, "code_departement": dept} for code in codes]
+        return httpx.Response(200, json={"count": 4, "data": data, "next": None})
+
+    api = QualiteRivieresAPI(httpx.Client(transport=httpx.MockTransport(handler)))
+    stations = list(api.iter_all_stations(shards=["01", "02"], prefetch=2))
+    codes = [s.code_station for s in stations]
+    assert codes == ["01-0", "01-1", "01-2", "shared", "02-0", "02-1", "02-2"]
+    assert len(requests) == 2
+
+
+def test_bbox_tiles_cover_the_box() -> None:
+    tiles = bbox_tiles((0.0, 40.0, 2.0, 44.0), nx=2, ny=2)
+    assert tiles[0] == "0.000000,40.000000,1.000000,42.000000"
+    assert tiles[-1] == "1.000000,42.000000,2.000000,44.000000"
+    assert len(tiles) == 4
+
+
+def test_plan_windows_counts_each_round_concurrently() -> None:
+    running: List[int] = []
+    lock = threading.Lock()
+    peak = 0
+
+    def count(window: Any) -> int:
+        nonlocal peak
+        with lock:
+            running.append(1)
+            peak = max(peak, len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+        start, end = window
+        return 10 * ((end - start).days + 1)
+
+    date_range = (START, date(2020, 1, 8))
+    planned = plan_windows(count, ANALYSE_PC_WINDOWS, date_range, 25, max_workers=4)
+    assert [(s.day, e.day) for s, e in planned] == [(1, 2), (3, 4), (5, 6), (7, 8)]
+    assert peak == 4
+
+
+def test_plan_windows_warns_of_windows_over_the_limit() -> None:
+    with pytest.warns(DepthLimitWarning, match="30 records"):
+        planned = plan_windows(lambda w: 30, ANALYSE_PC_WINDOWS, (START, START), 25)
+    assert len(planned) == 1
+
+
+def test_prefetch_warns_past_the_depth_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(base, "MAX_RESULT_DEPTH", 40)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        data = [{"code_station": "S", "resultat": i} for i in range(20)]
+        following = str(request.url.copy_merge_params({"page": page + 1}))
+        return httpx.Response(200, json={"count": 180, "data": data, "next": following})
+
+    api = QualiteRivieresAPI(httpx.Client(transport=httpx.MockTransport(handler)))
+    with pytest.warns(DepthLimitWarning, match="180 records"):
+        analyses = api.get_analyses("S", size=20, max_records=None, prefetch=2)
+    assert len(analyses) == 40
+
+
+@pytest.mark.parametrize("json_backend", ["json", "orjson"])
+def test_sequential_pages_stop_at_the_depth_limit(
+    monkeypatch: pytest.MonkeyPatch, json_backend: str
+) -> None:
+    pytest.importorskip(json_backend)
+    monkeypatch.setattr(base, "MAX_RESULT_DEPTH", 40)
+    pages: List[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("page", 1))
+        pages.append(page)
+        data = [{"code_station": "S", "resultat": i} for i in range(20)]
+        following = str(request.url.copy_merge_params({"page": page + 1}))
+        return httpx.Response(206, json={"count": 180, "data": data, "next": following})
+
+    http = httpx.Client(transport=httpx.MockTransport(handler))
+    api = QualiteRivieresAPI(http, json_backend=json_backend)
+    with pytest.warns(DepthLimitWarning, match="180 records"):
+        analyses = api.get_analyses("S", size=20, max_records=None)
+    assert len(analyses) == 40
+    assert pages == [1, 2]
+
+    with pytest.warns(DepthLimitWarning, match="only 40"):
+        payloads = list(api.iter_pages("analyse_pc", {"size": 20}))
+    assert len(payloads) == 2
+
+
+def _deep_handler(count: int) -> Any:
+    """Serve `count` records, refusing pages past the depth limit."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("page", 1))
+        size = int(request.url.params["size"])
+        if page * size > base.MAX_RESULT_DEPTH:
+            return httpx.Response(400, json={"message": "too deep"})
+        data = [{"code_station": "S", "resultat": i} for i in range(size)]
+        following = str(request.url.copy_merge_params({"page": page + 1}))
+        return httpx.Response(
+            206, json={"count": count, "data": data, "next": following}
+        )
+
+    return handler
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+@pytest.mark.parametrize("json_backend", ["json", "orjson"])
+def test_page_size_not_dividing_the_depth_limit(
+    monkeypatch: pytest.MonkeyPatch, json_backend: str, prefetch: int
+) -> None:
+    pytest.importorskip(json_backend)
+    http = httpx.Client(transport=httpx.MockTransport(_deep_handler(30000)))
+    api = QualiteRivieresAPI(http, json_backend=json_backend)
+    # Page 7 of 3000 records would end at 21000, past the limit.
+    with pytest.warns(DepthLimitWarning, match="only 18000"):
+        payloads = list(api.iter_pages("analyse_pc", {"size": 3000}, prefetch))
+    assert len(payloads) == 6
+
+    monkeypatch.setattr(base, "MAX_RESULT_DEPTH", 40)
+    with pytest.warns(DepthLimitWarning, match="only 30"):
+        analyses = api.get_analyses("S", size=15, max_records=None, prefetch=prefetch)
+    assert len(analyses) == 30
+
+
+def test_date_windows_hold_whole_pages(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(base, "MAX_RESULT_DEPTH", 40)
+    requests: List[httpx.Request] = []
+    handler = _dated_handler(
+        "date_prelevement",
+        "date_debut_prelevement",
+        "date_fin_prelevement",
+        requests,
+    )
+    api = QualiteRivieresAPI(httpx.Client(transport=httpx.MockTransport(handler)))
+    # 13 days hold 39 records, under the limit but over the 2 pages of 15 that
+    # can be fetched: such a window must be split.
+    date_range = (START, START + timedelta(days=12))
+    analyses = api.get_analyses("S", size=15, max_records=None, date_range=date_range)
+    assert len(analyses) == 39
+    assert max(int(r.url.params.get("page", 1)) for r in requests) <= 2
+
+
+def _deep_csv_handler(count: int) -> Any:
+    """Serve `count` analyses as CSV pages (and JSON counts), refusing pages
+    past the depth limit."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        size = int(params["size"])
+        if not request.url.path.endswith(".csv"):
+            return httpx.Response(200, json={"count": count, "data": []})
+        page = int(params.get("page", 1))
+        if page * size > base.MAX_RESULT_DEPTH:
+            return httpx.Response(400, json={"message": "too deep"})
+        rows = "".join(f"S;{i}\n" for i in range(size))
+        following = request.url.copy_set_param("page", str(page + 1))
+        headers = {"content-type": "text/csv", "link": f'<{following}>; rel="next"'}
+        return httpx.Response(
+            206, text="code_station;resultat\n" + rows, headers=headers
+        )
+
+    return handler
+
+
+def test_csv_table_stops_at_the_depth_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(base, "MAX_RESULT_DEPTH", 40)
+    http = httpx.Client(transport=httpx.MockTransport(_deep_csv_handler(180)))
+    api = QualiteRivieresAPI(http)
+    with pytest.warns(DepthLimitWarning, match="only 30"):
+        table = api.get_analyses_table("S", size=15)
+    assert len(table) == 30
+
+    # A single day cannot be split: its window stops at the limit too.
+    with pytest.warns(DepthLimitWarning, match="only 30"):
+        table = api.get_analyses_table("S", size=15, date_range=(START, START))
+    assert len(table) == 30
+
+
+def test_async_csv_table_stops_at_the_depth_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(base, "MAX_RESULT_DEPTH", 40)
+
+    async def run() -> int:
+        transport = httpx.MockTransport(_deep_csv_handler(180))
+        async with httpx.AsyncClient(transport=transport) as http:
+            api = AsyncQualiteRivieresAPI(http)
+            table = await api.get_analyses_table("S", size=15)
+            return len(table)
+
+    with pytest.warns(DepthLimitWarning, match="only 30"):
+        assert asyncio.run(run()) == 30
+
+
+def test_date_range_cannot_be_resumed() -> None:
+    api = QualiteRivieresAPI(httpx.Client(transport=httpx.MockTransport(print)))
+    analyses = api.iter_analyses(
+        "S", date_range=(START, START), resume_from="https://example.org"
+    )
+    with pytest.raises(ValueError, match="resume_from"):
+        next(analyses)
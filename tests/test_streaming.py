@@ -0,0 +1,121 @@
+"""
+Offline tests for incremental decoding of response pages.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Iterator, List
+
+import httpx
+import pytest
+
+from hubeau_py.api.qualite_rivieres import (
+    AsyncQualiteRivieresAPI,
+    QualiteRivieresAPI,
+)
+from hubeau_py.ratelimit import (
+    AdaptiveRateLimiter,
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+)
+from hubeau_py.streaming import EnvelopeDecoder
+
+
+def _decode(body: bytes, chunk_size: int) -> List[Any]:
+    decoder = EnvelopeDecoder()
+    items: List[Any] = []
+    for start in range(0, len(body), chunk_size):
+        items += decoder.feed(body[start : start + chunk_size])
+    return items + decoder.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_decoder_handles_any_chunking(chunk_size: int) -> None:
+    doc: Dict[str, Any] = {
+        "count": 1234,
+        "next": None,
+        "data": [
+            {"code": f"S{i}", "libelle": "é" * i, "v": [i, 1.5]} for i in range(20)
+        ],
+        "api_version": "1.4.0",
+    }
+    body = json.dumps(doc, ensure_ascii=False, indent=1).encode()
+    assert _decode(body, chunk_size) == doc["data"]
+
+    decoder = EnvelopeDecoder()
+    decoder.feed(body)
+    decoder.close()
+    assert decoder.envelope == {"count": 1234, "next": None, "api_version": "1.4.0"}
+
+
+def test_decoder_rejects_truncated_documents() -> None:
+    with pytest.raises(ValueError):
+        _decode(b'{"count": 2, "data": [{"a": 1}, {"a"', 4096)
+
+
+def test_items_are_yielded_before_the_page_is_read() -> None:
+    sent: List[int] = []
+
+    def body() -> Iterator[bytes]:
+        yield b'{"count": 3, "next": null, "data": ['
+        for i in range(3):
+            sent.append(i)
+            yield (b"," if i else b"") + json.dumps({"code_station": f"S{i}"}).encode()
+        yield b"]}"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body())
+
+    api = QualiteRivieresAPI(httpx.Client(transport=httpx.MockTransport(handler)))
+    analyses = api.iter_analyses("S")
+    assert next(analyses).code_station == "S0"
+    assert sent == [0, 1]  # "S0" is only known to be complete once "," arrives
+    assert [a.code_station for a in analyses] == ["S1", "S2"]
+
+
+def _analyses_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/station_pc"):
+        return httpx.Response(200, json={"count": 1, "data": [{"code_station": "S"}]})
+    page = {"count": 2, "next": None, "data": [{"code_station": "A"}] * 2}
+    return httpx.Response(200, json=page)
+
+
+def test_nested_requests_do_not_wait_on_the_streamed_page() -> None:
+    limiter = AdaptiveRateLimiter(rate=1000.0, concurrency=1, max_concurrency=1)
+    transport = RateLimitedTransport(httpx.MockTransport(_analyses_handler), limiter)
+    api = QualiteRivieresAPI(httpx.Client(transport=transport))
+    stations: List[Any] = []
+
+    def run() -> None:
+        for _ in api.iter_analyses("S"):
+            stations.extend(api.get_stations(code_station="S"))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert len(stations) == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.parametrize("limited", [False, True])
+def test_async_nested_requests_do_not_wait_on_the_streamed_page(
+    limited: bool,
+) -> None:
+    limiter = AdaptiveRateLimiter(rate=1000.0, concurrency=1, max_concurrency=1)
+    transport: httpx.AsyncBaseTransport = httpx.MockTransport(_analyses_handler)
+    if limited:
+        transport = AsyncRateLimitedTransport(transport, limiter)
+
+    async def run() -> int:
+        api = AsyncQualiteRivieresAPI(
+            httpx.AsyncClient(transport=transport), asyncio.Semaphore(1)
+        )
+        stations = 0
+        async for _ in api.iter_analyses("S"):
+            stations += len(await api.get_stations(code_station="S"))
+        return stations
+
+    assert asyncio.run(asyncio.wait_for(run(), 5)) == 2
+    assert limiter.in_flight == 0
@@ -0,0 +1,85 @@
+"""
+Offline tests for the record validation policies.
+"""
+
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from hubeau_py.client import HubeauClient
+from hubeau_py.models.geojson import GeometryCollection, Point
+from hubeau_py.models.qualite_rivieres import AnalysePc, StationPc
+from hubeau_py.validation import Validation, get_validation
+
+GEOMETRY = {"type": "Point", "coordinates": [1.9, 47.9]}
+
+
+def _client(data: List[Dict[str, Any]], **kwargs: Any) -> HubeauClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"count": len(data), "data": data})
+
+    return HubeauClient(httpx.Client(transport=httpx.MockTransport(handler)), **kwargs)
+
+
+def test_modes() -> None:
+    item = {"code_station": "01", "durete": "12.5", "geometry": GEOMETRY}
+    full = get_validation("full").factory(StationPc)(item)
+    assert full.durete == 12.5
+    assert isinstance(full.geometry, Point)
+
+    trusted = get_validation("trusted").factory(StationPc)(item)
+    assert isinstance(trusted, StationPc)
+    assert trusted.durete == "12.5"
+    # Nested models are still built, so every mode yields the same type.
+    assert trusted.geometry == full.geometry
+    assert trusted.libelle_station is None
+    assert trusted.model_fields_set == {"code_station", "durete", "geometry"}
+
+    construct = get_validation("trusted").factory(StationPc)
+    records = [construct({**item, "unknown": 1}), construct({"code_station": "02"})]
+    assert "unknown" not in records[0].__dict__
+    assert records[1].model_fields_set == {"code_station"}
+    assert records[1].durete is None
+
+    with pytest.raises(ValueError):
+        get_validation("lenient")
+    with pytest.raises(ValueError):
+        Validation("sampled", every=0)
+
+
+def test_sampled_validates_every_nth_record() -> None:
+    make = Validation("sampled", every=2).factory(AnalysePc)
+    bad = {"code_parametre": ["not", "a", "str"]}
+    good = {"code_parametre": "1340"}
+    assert make(good).code_parametre == "1340"
+    assert make(bad).code_parametre == ["not", "a", "str"]
+    with pytest.raises(ValidationError):
+        make(bad)
+
+
+def test_trusted_geometries_are_not_validated() -> None:
+    construct = get_validation("trusted").factory(StationPc)
+    point = construct({"geometry": {"type": "Point", "coordinates": ["1.9", "4"]}})
+    assert isinstance(point.geometry, Point)
+    assert point.geometry.coordinates == ["1.9", "4"]
+
+    collection = {"type": "GeometryCollection", "geometries": [GEOMETRY]}
+    record = construct({"geometry": collection})
+    assert isinstance(record.geometry, GeometryCollection)
+    assert record.geometry.geometries == [Point(**GEOMETRY)]
+
+
+def test_sampled_records_share_field_types() -> None:
+    make = Validation("sampled", every=2).factory(StationPc)
+    records = [make({"code_station": c, "geometry": GEOMETRY}) for c in "ABC"]
+    assert all(isinstance(record.geometry, Point) for record in records)
+    assert make({"code_station": "D", "geometry": None}).geometry is None
+
+
+def test_client_policy_and_per_call_override() -> None:
+    client = _client([{"code_station": "01", "durete": "7"}], validation="trusted")
+    assert client.qualite_rivieres.get_stations()[0].durete == "7"
+    stations = client.qualite_rivieres.iter_stations(validation="full")
+    assert next(stations).durete == 7.0
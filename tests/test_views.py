@@ -0,0 +1,86 @@
+"""
+Offline tests for lazy records validating fields on first access.
+"""
+
+import copy
+import pickle
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from hubeau_py.client import HubeauClient
+from hubeau_py.models.geojson import Point
+from hubeau_py.models.qualite_rivieres import StationPc
+from hubeau_py.projection import project
+from hubeau_py.validation import Validation
+from hubeau_py.views import lazy_model
+
+GEOMETRY = {"type": "Point", "coordinates": [1.9, 47.9]}
+
+
+def test_fields_are_validated_on_first_read() -> None:
+    item = {"code_station": "01", "durete": "12.5", "geometry": GEOMETRY}
+    record = Validation("lazy").factory(StationPc)(item)
+    assert isinstance(record, StationPc)
+    assert type(record) is lazy_model(StationPc)
+    assert record.__dict__ == {}
+    assert record.durete == 12.5
+    assert record.__dict__ == {"durete": 12.5}
+    assert isinstance(record.geometry, Point)
+    assert record.libelle_station is None
+    assert record.model_fields_set == {"code_station", "durete", "geometry"}
+    with pytest.raises(AttributeError):
+        record.unknown
+
+
+def test_whole_record_operations_validate_remaining_fields() -> None:
+    item = {"code_station": "01", "durete": "7"}
+    record = Validation("lazy").factory(StationPc)(item)
+    assert record.model_dump() == StationPc.model_validate(item).model_dump()
+    assert len(record.__dict__) == len(StationPc.model_fields)
+    assert record.to_model() == StationPc.model_validate(item)
+    # Lazy and eager records of the same item compare equal, in either order.
+    assert record == StationPc.model_validate(item)
+    assert StationPc.model_validate(item) == record
+    assert record != StationPc.model_validate({**item, "code_station": "02"})
+    assert copy.deepcopy(record) == record
+    assert "durete=7.0" in repr(Validation("lazy").factory(StationPc)(item))
+
+
+def test_invalid_field_raises_when_read() -> None:
+    record = Validation("lazy").factory(StationPc)({"durete": "high"})
+    assert record.code_station is None
+    with pytest.raises(ValidationError) as info:
+        record.durete
+    assert info.value.title == "StationPc"
+    assert info.value.errors()[0]["loc"] == ("durete",)
+
+
+def test_client_lazy_policy() -> None:
+    data: List[Dict[str, Any]] = [{"code_station": "01", "durete": "7"}]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"count": len(data), "data": data})
+
+    http = httpx.Client(transport=httpx.MockTransport(handler))
+    client = HubeauClient(http, validation="lazy")
+    station = client.qualite_rivieres.get_stations()[0]
+    assert isinstance(station, StationPc)
+    assert station.durete == 7.0
+
+
+def test_lazy_records_pickle() -> None:
+    item = {"code_station": "01", "durete": "7", "geometry": GEOMETRY}
+    record = Validation("lazy").factory(StationPc)(item)
+    assert record.durete == 7.0
+    restored = pickle.loads(pickle.dumps(record))
+    assert type(restored) is lazy_model(StationPc)
+    assert restored.__dict__ == {}
+    assert restored == record
+
+    partial = Validation("lazy").factory(project(StationPc, ["code_station"]))
+    projected = pickle.loads(pickle.dumps(partial({"code_station": "02"})))
+    assert type(projected) is lazy_model(project(StationPc, ["code_station"]))
+    assert projected.code_station == "02"